@@ -1,18 +1,127 @@
 import { NextRequest } from 'next/server'
-import { execSync } from 'child_process'
+import { execFileSync } from 'child_process'
+import http from 'http'
 import path from 'path'
 import { requireAdmin } from '@/lib/auth'
 import { ok, fail } from '@/lib/api/respond'
 
-export async function GET(_request: NextRequest) {
+// When hermes-bridge.py runs as a daemon (`--serve`), read its cached
+// snapshot instead of spawning an interpreter per request. Set one of:
+//   HERMES_BRIDGE_URL=http://127.0.0.1:8787/
+//   HERMES_BRIDGE_SOCKET=/tmp/hermes-bridge.sock
+const BRIDGE_URL = process.env.HERMES_BRIDGE_URL
+const BRIDGE_SOCKET = process.env.HERMES_BRIDGE_SOCKET
+
+type DaemonReply = { status: number; body: string }
+
+// Resolves with whatever the daemon answered, errors included; rejects only
+// when there was no answer (refused, no socket, timed out).
+function readFromDaemon(requestPath: string): Promise<DaemonReply> {
+  return new Promise((resolve, reject) => {
+    let options: http.RequestOptions
+    if (BRIDGE_SOCKET) {
+      options = { socketPath: BRIDGE_SOCKET, path: requestPath }
+    } else {
+      const url = new URL(requestPath, BRIDGE_URL)
+      options = { hostname: url.hostname, port: url.port, path: url.pathname + url.search }
+    }
+    const req = http.get({ ...options, timeout: 5_000 }, (res) => {
+      let body = ''
+      res.setEncoding('utf-8')
+      res.on('data', (chunk) => (body += chunk))
+      res.on('end', () => resolve({ status: res.statusCode ?? 0, body }))
+    })
+    req.on('timeout', () => req.destroy(new Error('hermes-bridge daemon timed out')))
+    req.on('error', reject)
+  })
+}
+
+// The daemon's JSON error body ({"error": ...}), or its raw text
+function daemonError({ status, body }: DaemonReply): string {
+  try {
+    const message = JSON.parse(body)?.error
+    if (typeof message === 'string') return message
+  } catch {
+    // not JSON: pass the text through
+  }
+  return body.trim() || `hermes-bridge daemon returned ${status}`
+}
+
+function runOneShot(args: string[] = []): string {
+  const scriptPath = path.join(process.cwd(), 'scripts', 'hermes-bridge.py')
+  // execFile, not a shell: search text and filters are passed through untouched
+  return execFileSync('python3', [scriptPath, ...args], {
+    encoding: 'utf-8',
+    timeout: 10_000,
+  })
+}
+
+// Paging and filter parameters passed through to the bridge's queries
+const QUERY_PARAMS = [
+  'cursor', 'limit', 'source', 'model', 'since', 'until',
+  'min_cost', 'max_cost', 'enabled', 'after',
+]
+
+// Maps this route's query string to a daemon path and the equivalent
+// one-shot flags.
+function bridgeRequest(searchParams: URLSearchParams): { requestPath: string; args: string[] } {
+  const q = searchParams.get('q')?.trim()
+  if (q) {
+    return { requestPath: `/search?${new URLSearchParams({ q })}`, args: [`--search=${q}`] }
+  }
+
+  const forwarded = new URLSearchParams()
+  for (const name of QUERY_PARAMS) {
+    const value = searchParams.get(name)
+    if (value) forwarded.set(name, value)
+  }
+  const flags = Array.from(forwarded, ([name, value]) => `--${name}=${value}`)
+
+  const session = searchParams.get('session')
+  if (session) {
+    return {
+      requestPath: `/sessions/${encodeURIComponent(session)}?${forwarded}`,
+      args: [`--session=${session}`, ...flags],
+    }
+  }
+  const view = searchParams.get('view')
+  if (view === 'sessions' || view === 'cron') {
+    return { requestPath: `/${view}?${forwarded}`, args: [`--${view}`, ...flags] }
+  }
+  return { requestPath: '/snapshot', args: [] }
+}
+
+// GET /api/admin/hermes                          dashboard snapshot
+// GET /api/admin/hermes?q=...                    full-text search over all messages
+// GET /api/admin/hermes?view=sessions|cron&...   one page (cursor, filters)
+// GET /api/admin/hermes?session=ID&after=...     one session's messages
+export async function GET(request: NextRequest) {
   try {
     await requireAdmin()
 
-    const scriptPath = path.join(process.cwd(), 'scripts', 'hermes-bridge.py')
-    const output = execSync(`python3 "${scriptPath}"`, {
-      encoding: 'utf-8',
-      timeout: 10_000,
-    })
+    const { requestPath, args } = bridgeRequest(request.nextUrl.searchParams)
+
+    let output: string
+    if (BRIDGE_URL || BRIDGE_SOCKET) {
+      let reply: DaemonReply | null = null
+      try {
+        reply = await readFromDaemon(requestPath)
+      } catch {
+        // Daemon down — fall back to the one-shot script
+      }
+      if (!reply) {
+        output = runOneShot(args)
+      } else if (reply.status >= 400 && reply.status < 500) {
+        // Bad cursor or query, unknown session: the answer, not an outage
+        return fail(daemonError(reply), reply.status)
+      } else if (reply.status !== 200) {
+        throw new Error(daemonError(reply))
+      } else {
+        output = reply.body
+      }
+    } else {
+      output = runOneShot(args)
+    }
 
     const data = JSON.parse(output)
     return ok(data)
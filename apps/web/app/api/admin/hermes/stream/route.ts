@@ -0,0 +1,76 @@
+import { NextRequest } from 'next/server'
+import { spawn } from 'child_process'
+import path from 'path'
+import { ApiAuthError, requireAdmin } from '@/lib/auth'
+import { fail } from '@/lib/api/respond'
+
+export const dynamic = 'force-dynamic'
+
+// Relays `hermes-bridge.py --watch` as server-sent events: the first event
+// is the full snapshot, then one event per delta (log lines, sessions,
+// cron changes). The watcher process lives as long as the connection.
+export async function GET(request: NextRequest) {
+  try {
+    await requireAdmin()
+  } catch (e) {
+    if (e instanceof ApiAuthError) return fail(e.message, e.status)
+    throw e
+  }
+
+  const scriptPath = path.join(process.cwd(), 'scripts', 'hermes-bridge.py')
+  const child = spawn('python3', [scriptPath, '--watch'], { stdio: ['ignore', 'pipe', 'ignore'] })
+  const encoder = new TextEncoder()
+  let controller!: ReadableStreamDefaultController<Uint8Array>
+  // Set once the client goes away (cancel or abort) or the child exits:
+  // enqueue/close on a cancelled stream throws ERR_INVALID_STATE
+  let closed = false
+  let buffered = ''
+
+  const onData = (chunk: string) => {
+    if (closed) return
+    buffered += chunk
+    let newline: number
+    while ((newline = buffered.indexOf('\n')) >= 0) {
+      const line = buffered.slice(0, newline)
+      buffered = buffered.slice(newline + 1)
+      if (line) controller.enqueue(encoder.encode(`data: ${line}\n\n`))
+    }
+  }
+  const onClose = () => {
+    if (closed) return
+    closed = true
+    controller.close()
+  }
+  const onError = (err: Error) => {
+    if (closed) return
+    closed = true
+    controller.error(err)
+  }
+  const stop = () => {
+    if (closed) return
+    closed = true
+    child.stdout.off('data', onData)
+    child.off('close', onClose)
+    child.kill('SIGTERM')
+  }
+
+  const stream = new ReadableStream<Uint8Array>({
+    start(c) {
+      controller = c
+      child.stdout.setEncoding('utf-8')
+      child.stdout.on('data', onData)
+      child.on('close', onClose)
+      child.on('error', onError)
+    },
+    cancel: stop,
+  })
+  request.signal.addEventListener('abort', stop)
+
+  return new Response(stream, {
+    headers: {
+      'Content-Type': 'text/event-stream',
+      'Cache-Control': 'no-cache, no-transform',
+      Connection: 'keep-alive',
+    },
+  })
+}
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Accuracy suite and benchmark for linkedin_parse.py.
+
+Replays recorded Serper responses from fixtures/serper_linkedin_results.json
+through parse_search_results, reports per-field accuracy against the
+expected values, and times parsing. Optionally reparses every entry in a
+local search cache (serper_cache.sqlite3) to measure throughput on the
+real corpus. No network, no Supabase.
+
+  python bench_linkedin_parse.py
+  python bench_linkedin_parse.py --iterations 5000 --min-accuracy 0.95
+  python bench_linkedin_parse.py --cache serper_cache.sqlite3
+"""
+import argparse
+import json
+import re
+import sqlite3
+import sys
+import time
+from pathlib import Path
+
+from linkedin_parse import parse_search_results
+
+FIXTURES = Path(__file__).parent / 'fixtures' / 'serper_linkedin_results.json'
+FIELDS = ('linkedin_url', 'role', 'company', 'location', 'industry')
+
+# "Name" Cornell [sport] site:linkedin.com/in — as built by linkedin_scrape.build_query
+QUERY_RE = re.compile(r'^"(?P<name>[^"]+)"\s+cornell\s+(?P<sport>.*?)\s*site:linkedin\.com/in$')
+
+
+def run_accuracy(cases, verbose=False):
+    """Returns (exact-match rate, {field: accuracy})."""
+    exact = 0
+    correct = {field: 0 for field in FIELDS}
+    for case in cases:
+        got = parse_search_results(case['response'], case['name'], case.get('sport'))
+        expected = case['expected']
+        if got == expected:
+            exact += 1
+        elif verbose:
+            print(f"  MISMATCH {case['id']}:\n    got      {got}\n    expected {expected}")
+        for field in FIELDS:
+            if (got or {}).get(field) == (expected or {}).get(field):
+                correct[field] += 1
+    n = len(cases)
+    return exact / n, {field: correct[field] / n for field in FIELDS}
+
+
+def time_fixtures(cases, iterations):
+    start = time.perf_counter()
+    for _ in range(iterations):
+        for case in cases:
+            parse_search_results(case['response'], case['name'], case.get('sport'))
+    elapsed = time.perf_counter() - start
+    return iterations * len(cases) / elapsed
+
+
+def time_cache(path):
+    conn = sqlite3.connect(path)
+    rows = conn.execute("SELECT query, organic FROM search_results").fetchall()
+    conn.close()
+    parsed = []
+    for query, organic in rows:
+        m = QUERY_RE.match(query)
+        if m:
+            parsed.append((json.loads(organic), m.group('name'), m.group('sport') or None))
+    if not parsed:
+        return 0, 0, 0
+    start = time.perf_counter()
+    hits = sum(1 for organic, name, sport in parsed
+               if parse_search_results({'organic': organic}, name, sport))
+    elapsed = time.perf_counter() - start
+    return len(parsed), hits, len(parsed) / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--fixtures', default=str(FIXTURES))
+    parser.add_argument('--iterations', type=int, default=2000)
+    parser.add_argument('--min-accuracy', type=float, default=None,
+                        help='exit 1 if the exact-match rate is below this')
+    parser.add_argument('--cache', help='also reparse every entry in this search cache')
+    parser.add_argument('-v', '--verbose', action='store_true')
+    args = parser.parse_args()
+
+    cases = json.loads(Path(args.fixtures).read_text())
+    exact, per_field = run_accuracy(cases, args.verbose)
+    print(f"Accuracy over {len(cases)} recorded responses: {exact:.1%} exact")
+    for field, acc in per_field.items():
+        print(f"  {field:<13} {acc:.1%}")
+
+    rate = time_fixtures(cases, args.iterations)
+    print(f"\nFixtures: {rate:,.0f} responses/s ({1e6 / rate:.1f} µs each, {args.iterations} iterations)")
+
+    if args.cache:
+        n, hits, rate = time_cache(args.cache)
+        print(f"Cache: reparsed {n:,} cached queries, {hits:,} profiles, {rate:,.0f} responses/s")
+
+    if args.min_accuracy is not None and exact < args.min_accuracy:
+        print(f"\nFAIL: exact-match accuracy {exact:.1%} < {args.min_accuracy:.1%}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+"""
+Local progress journal for linkedin_scrape.py.
+
+Records every written-back attempt as (alumni id, query variant, outcome,
+timestamp). A run skips ids already attempted with the same variant inside
+the retry window, so an interrupted run resumes where it left off and a
+repeat run never pays again for a search we already know misses (e.g.
+Pass 2 re-selecting everyone marked '' after their loose retry).
+"""
+import sqlite3
+import time
+
+
+class EnrichmentJournal:
+
+    # SQLite's default host-parameter limit is 999
+    CHUNK = 500
+
+    def __init__(self, path, retry_after_days=90):
+        self.path = str(path)
+        self.window = retry_after_days * 86400
+        self.skipped = 0
+        self.conn = sqlite3.connect(self.path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS attempts (
+                alumni_id    TEXT NOT NULL,
+                variant      TEXT NOT NULL,
+                outcome      TEXT NOT NULL,
+                attempted_at REAL NOT NULL,
+                PRIMARY KEY (alumni_id, variant)
+            )
+        """)
+        self.conn.commit()
+
+    def recently_attempted(self, ids, variant):
+        """Subset of `ids` attempted with `variant` within the retry window."""
+        cutoff = time.time() - self.window
+        seen = set()
+        ids = list(ids)
+        for i in range(0, len(ids), self.CHUNK):
+            chunk = ids[i:i + self.CHUNK]
+            marks = ','.join('?' * len(chunk))
+            rows = self.conn.execute(
+                f"SELECT alumni_id FROM attempts WHERE variant = ? AND attempted_at >= ? AND alumni_id IN ({marks})",
+                (variant, cutoff, *chunk),
+            ).fetchall()
+            seen.update(r[0] for r in rows)
+        return seen
+
+    def skip_attempted(self, alumni, variant, chunk_size=CHUNK):
+        """Filters an alumni row stream, dropping recently attempted ids."""
+        chunk = []
+        for person in alumni:
+            chunk.append(person)
+            if len(chunk) >= chunk_size:
+                yield from self._unattempted(chunk, variant)
+                chunk = []
+        if chunk:
+            yield from self._unattempted(chunk, variant)
+
+    def _unattempted(self, chunk, variant):
+        seen = self.recently_attempted((p['id'] for p in chunk), variant)
+        self.skipped += len(seen)
+        return [p for p in chunk if p['id'] not in seen]
+
+    def outcome_rates(self):
+        """{variant: (found, attempted)} over everything journaled."""
+        rows = self.conn.execute(
+            "SELECT variant, SUM(outcome = 'found'), COUNT(*) FROM attempts GROUP BY variant"
+        ).fetchall()
+        return {variant: (found, attempted) for variant, found, attempted in rows}
+
+    def record(self, ids, variant, outcome):
+        now = time.time()
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO attempts (alumni_id, variant, outcome, attempted_at) VALUES (?, ?, ?, ?)",
+            [(str(i), variant, outcome, now) for i in ids],
+        )
+        self.conn.commit()
+
+    def close(self):
+        self.conn.close()
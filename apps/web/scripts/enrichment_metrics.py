@@ -0,0 +1,216 @@
+"""
+Per-run metrics for linkedin_scrape.py.
+
+Collects Serper and DB write latencies, hit rates by pass and sport,
+credits spent, an error breakdown and a throughput timeline. The summary
+can be written as a JSON or CSV report at the end of a run and, while the
+run is going, refreshed as a Prometheus textfile (node_exporter textfile
+collector format) so concurrency and batch sizes can be tuned from data.
+All methods are thread-safe; Serper workers report from their threads.
+"""
+import csv
+import json
+import os
+import threading
+import time
+from collections import Counter, defaultdict
+
+from profiling import percentile
+
+
+def latency_summary(values):
+    values = sorted(values)
+    return {
+        'count': len(values),
+        'p50_ms': _ms(percentile(values, 50)),
+        'p90_ms': _ms(percentile(values, 90)),
+        'p99_ms': _ms(percentile(values, 99)),
+        'max_ms': _ms(values[-1] if values else None),
+    }
+
+
+def _ms(seconds):
+    return round(seconds * 1000, 1) if seconds is not None else None
+
+
+class RunMetrics:
+
+    def __init__(self, prometheus_path=None, export_every=10, sample_every=30):
+        self.started = time.time()
+        self.lock = threading.Lock()
+        self.serper_latency = []
+        self.db_latency = []
+        self.credits = 0
+        self.cache_hits = 0
+        self.errors = Counter()
+        # (pass, sport) -> [found, searched]
+        self.outcomes = defaultdict(lambda: [0, 0])
+        # (pass, query step) -> [found, searched] for cascade steps; kept
+        # apart so each alumnus counts once in the totals above
+        self.step_outcomes = defaultdict(lambda: [0, 0])
+        self.timeline = []
+        self.prometheus_path = prometheus_path
+        self.export_every = export_every
+        self.sample_every = sample_every
+        self._last_export = 0
+        self._last_sample = 0
+
+    # ── recording ──
+
+    def observe_serper(self, seconds, queries=1, error=None):
+        with self.lock:
+            self.serper_latency.append(seconds)
+            if error:
+                self.errors[f'serper_{error}'] += 1
+            else:
+                self.credits += queries
+
+    def observe_cache_hit(self, n=1):
+        with self.lock:
+            self.cache_hits += n
+
+    def observe_db(self, seconds, error=None):
+        with self.lock:
+            self.db_latency.append(seconds)
+            if error:
+                self.errors[f'db_{error}'] += 1
+
+    def record_outcome(self, pass_name, sport, found, n=1):
+        with self.lock:
+            bucket = self.outcomes[(pass_name, sport or 'unknown')]
+            bucket[0] += n if found else 0
+            bucket[1] += n
+
+    def record_step_outcome(self, pass_name, step, found, n=1):
+        with self.lock:
+            bucket = self.step_outcomes[(pass_name, step)]
+            bucket[0] += n if found else 0
+            bucket[1] += n
+
+    def record_error(self, kind, n=1):
+        with self.lock:
+            self.errors[kind] += n
+
+    def tick(self):
+        """Call often from the main loop: samples throughput, refreshes the textfile."""
+        now = time.time()
+        if now - self._last_sample >= self.sample_every:
+            self._last_sample = now
+            found, searched = self._totals()
+            with self.lock:
+                self.timeline.append({
+                    'elapsed_s': round(now - self.started, 1),
+                    'searched': searched,
+                    'found': found,
+                    'credits': self.credits,
+                })
+        if self.prometheus_path and now - self._last_export >= self.export_every:
+            self._last_export = now
+            self.write_prometheus(self.prometheus_path)
+
+    # ── reporting ──
+
+    def _totals(self):
+        with self.lock:
+            found = sum(b[0] for b in self.outcomes.values())
+            searched = sum(b[1] for b in self.outcomes.values())
+        return found, searched
+
+    def summary(self):
+        found, searched = self._totals()
+        elapsed = time.time() - self.started
+        with self.lock:
+            by_pass = defaultdict(lambda: [0, 0])
+            by_sport = defaultdict(lambda: [0, 0])
+            for (pass_name, sport), (f, n) in self.outcomes.items():
+                by_pass[pass_name][0] += f
+                by_pass[pass_name][1] += n
+                by_sport[sport][0] += f
+                by_sport[sport][1] += n
+            return {
+                'elapsed_s': round(elapsed, 1),
+                'searched': searched,
+                'found': found,
+                'hit_rate': round(found / searched, 4) if searched else None,
+                'throughput_per_min': round(searched / elapsed * 60, 1) if elapsed else None,
+                'credits': self.credits,
+                'cache_hits': self.cache_hits,
+                'credits_per_found': round(self.credits / found, 2) if found else None,
+                'serper_latency': latency_summary(self.serper_latency),
+                'db_write_latency': latency_summary(self.db_latency),
+                'hit_rate_by_pass': {k: _rate(*v) for k, v in sorted(by_pass.items())},
+                'hit_rate_by_sport': {k: _rate(*v) for k, v in sorted(by_sport.items())},
+                'hit_rate_by_step': {f"{p}:{step}": _rate(*v)
+                                     for (p, step), v in sorted(self.step_outcomes.items())},
+                'errors': dict(self.errors),
+                'timeline': list(self.timeline),
+            }
+
+    def write_report(self, path):
+        """JSON or CSV depending on the extension."""
+        if str(path).endswith('.csv'):
+            self.write_csv(path)
+        else:
+            with open(path, 'w') as f:
+                json.dump(self.summary(), f, indent=2)
+
+    def write_csv(self, path):
+        """Flat metric,label,value rows (the timeline as its own metric)."""
+        summary = self.summary()
+        with open(path, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(['metric', 'label', 'value'])
+            for key in ('elapsed_s', 'searched', 'found', 'hit_rate', 'throughput_per_min',
+                        'credits', 'cache_hits', 'credits_per_found'):
+                writer.writerow([key, '', summary[key]])
+            for group in ('serper_latency', 'db_write_latency'):
+                for stat, value in summary[group].items():
+                    writer.writerow([group, stat, value])
+            for group in ('hit_rate_by_pass', 'hit_rate_by_sport', 'hit_rate_by_step'):
+                for label, stats in summary[group].items():
+                    writer.writerow([group, label, stats['hit_rate']])
+            for kind, count in summary['errors'].items():
+                writer.writerow(['errors', kind, count])
+            for point in summary['timeline']:
+                writer.writerow(['timeline_searched', point['elapsed_s'], point['searched']])
+
+    def write_prometheus(self, path):
+        summary = self.summary()
+        lines = [
+            '# HELP scout_enrich_searched_total Alumni searched this run',
+            '# TYPE scout_enrich_searched_total counter',
+            f"scout_enrich_searched_total {summary['searched']}",
+            '# TYPE scout_enrich_found_total counter',
+            f"scout_enrich_found_total {summary['found']}",
+            '# TYPE scout_enrich_serper_credits_total counter',
+            f"scout_enrich_serper_credits_total {summary['credits']}",
+            '# TYPE scout_enrich_cache_hits_total counter',
+            f"scout_enrich_cache_hits_total {summary['cache_hits']}",
+            '# TYPE scout_enrich_latency_ms gauge',
+        ]
+        for group in ('serper_latency', 'db_write_latency'):
+            for stat in ('p50_ms', 'p90_ms', 'p99_ms'):
+                value = summary[group][stat]
+                if value is not None:
+                    lines.append(f'scout_enrich_latency_ms{{op="{group}",quantile="{stat[1:-3]}"}} {value}')
+        lines.append('# TYPE scout_enrich_found_by_pass_total counter')
+        for pass_name, stats in summary['hit_rate_by_pass'].items():
+            lines.append(f'scout_enrich_found_by_pass_total{{pass="{pass_name}"}} {stats["found"]}')
+        lines.append('# TYPE scout_enrich_found_by_step_total counter')
+        for label, stats in summary['hit_rate_by_step'].items():
+            pass_name, step = label.split(':', 1)
+            lines.append(f'scout_enrich_found_by_step_total{{pass="{pass_name}",step="{step}"}} {stats["found"]}')
+        lines.append('# TYPE scout_enrich_errors_total counter')
+        for kind, count in summary['errors'].items():
+            lines.append(f'scout_enrich_errors_total{{kind="{kind}"}} {count}')
+
+        # Write-then-rename so the collector never reads a half-written file
+        tmp = f'{path}.tmp'
+        with open(tmp, 'w') as f:
+            f.write('\n'.join(lines) + '\n')
+        os.replace(tmp, path)
+
+
+def _rate(found, searched):
+    return {'found': found, 'searched': searched,
+            'hit_rate': round(found / searched, 4) if searched else None}
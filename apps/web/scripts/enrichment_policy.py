@@ -0,0 +1,81 @@
+"""
+Freshness policy for LinkedIn re-enrichment — the pure decision layer.
+
+Python twin of lib/agent/enrichmentPolicy.ts, applied to Serper results by
+linkedin_scrape.py --refresh. No I/O: given a row (and `now`), decide how
+urgently it should be refreshed and which fields a new result may write.
+
+  - An EMPTY field is always filled.
+  - A populated field is only overwritten once the row is stale
+    (REFRESH_STALE_DAYS since enriched_at), and only when the new result
+    is for the same LinkedIn profile the row already points at.
+"""
+from datetime import datetime, timezone
+
+# A populated field is only eligible for refresh once it's this old.
+REFRESH_STALE_DAYS = 180
+
+# Rows never stamped with enriched_at count as this many days old.
+NEVER_ENRICHED_DAYS = 3650
+
+CAREER_FIELDS = ('role', 'company', 'industry', 'location')
+
+
+def _blank(value):
+    return not value or not str(value).strip()
+
+
+def days_since_enriched(row, now):
+    stamp = row.get('enriched_at')
+    if not stamp:
+        return NEVER_ENRICHED_DAYS
+    enriched = datetime.fromisoformat(stamp.replace('Z', '+00:00'))
+    if enriched.tzinfo is None:
+        enriched = enriched.replace(tzinfo=timezone.utc)
+    return max(0.0, (now - enriched).total_seconds() / 86400)
+
+
+def refresh_priority(row, now, current_year):
+    """
+    Priority score for a bounded refresh run — higher = refresh sooner, 0 =
+    not eligible. Missing career fields dominate; among equally complete
+    rows the stalest wins, weighted toward recent graduates, whose role
+    and company change most often.
+    """
+    missing = sum(1 for f in ('role', 'company') if _blank(row.get(f)))
+    missing_minor = sum(1 for f in ('industry', 'location') if _blank(row.get(f)))
+    age = min(days_since_enriched(row, now), NEVER_ENRICHED_DAYS)
+    if not missing and not missing_minor and age < REFRESH_STALE_DAYS:
+        return 0
+
+    years_out = max(0, current_year - (row.get('graduation_year') or current_year))
+    recency = 1 / (1 + years_out / 5)  # 1.0 for this year's class, 0.5 ten years out
+    return missing * 10_000 + missing_minor * 2_000 + age * (0.5 + recency)
+
+
+def linkedin_slug(url):
+    """Profile identifier from a LinkedIn URL ('linkedin.com/in/<slug>/...')."""
+    if not url or 'linkedin.com/in/' not in url:
+        return None
+    return url.split('linkedin.com/in/', 1)[1].split('/')[0].split('?')[0].lower() or None
+
+
+def decide_refresh(row, result, now):
+    """
+    Fields from a fresh search `result` to write onto `row`, or None when
+    the result is for a different profile and must not be trusted.
+    """
+    if linkedin_slug(result.get('linkedin_url')) != linkedin_slug(row.get('linkedin_url')):
+        return None
+    stale = days_since_enriched(row, now) >= REFRESH_STALE_DAYS
+    update = {}
+    for field in CAREER_FIELDS:
+        new = result.get(field)
+        if _blank(new):
+            continue
+        current = row.get(field)
+        if _blank(current):
+            update[field] = new
+        elif stale and str(current).strip().lower() != str(new).strip().lower():
+            update[field] = new
+    return update
@@ -3,125 +3,752 @@
 Hermes dashboard data bridge.
 Reads state.db, agent logs, sessions, and cron data.
 Outputs JSON for the Next.js API route.
+
+  python3 hermes-bridge.py                 one-shot: print the payload and exit
+  python3 hermes-bridge.py --serve         daemon on 127.0.0.1:8787 (--port=N)
+  python3 hermes-bridge.py --serve --socket=/tmp/hermes-bridge.sock
+  python3 hermes-bridge.py --watch         snapshot, then JSON-lines deltas
+  python3 hermes-bridge.py --search="deploy budget" [--limit=N]
+  python3 hermes-bridge.py --sessions [--source=cli --model=m1,m2 --since=2026-01-01
+                           --until=... --min_cost=0.5 --max_cost=... --cursor=... --limit=N]
+  python3 hermes-bridge.py --session=ID [--after=MESSAGE_ID --limit=N]
+  python3 hermes-bridge.py --cron [--enabled=1 --since=... --cursor=...]
+
+In daemon mode the state.db connection stays open and every section is
+cached, rebuilt only when its source changes (PRAGMA data_version for the
+database, file mtime/size for the log and session directories), so a
+dashboard refresh is usually a memory read.
+
+Watch mode prints one JSON object per line: a full {"type": "snapshot"}
+first, then deltas as they happen — log_append (new complete lines),
+log_new/log_reset/log_removed, dump_new/dump_updated/dump_removed,
+session_started/session_ended, cron_added/cron_changed/cron_removed —
+and a heartbeat when idle. It follows bg-jobs/, sessions/ and the state.db
+WAL with inotify, falling back to polling (--poll) where that's missing.
+
+The same queries are served by the daemon as GET /sessions, /sessions/<id>
+and /cron with the flags as query parameters. Pages are keyset-paginated:
+pass a response's next_cursor (or next_after for a session's messages) back
+to get the following page.
+
+Search (--search=, or GET /search?q=&limit= on the daemon) queries a
+side-car FTS5 index of every message, brought up to date incrementally
+before each search; state.db itself is never written. The payload's
+`rollups` section (tokens and cost per day, model and source) likewise comes
+from a side-car store, folded forward from the sessions changed since the
+last read rather than re-aggregated over all history.
 """
 import json
 import os
+import signal
+import socketserver
 import sqlite3
-import glob
+import heapq
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
+from urllib.parse import parse_qs, unquote, urlsplit
 from datetime import datetime
 
+import profiling
+from hermes_db import LATEST_PROMPT_INDEX, HermesDB
+from hermes_dumps import dump_prompt
+from hermes_queries import query_cron, query_sessions, session_detail
+from hermes_rollups import RollupStore
+from hermes_search import SearchIndex
+from hermes_watch import open_watcher
+
 HOME = Path.home()
 HERMES = HOME / ".hermes"
 DB_PATH = HERMES / "state.db"
 BG_JOBS = HERMES / "bg-jobs"
 SESSIONS_DIR = HERMES / "sessions"
 
+# Side-car full-text index of messages (never inside state.db itself)
+SEARCH_INDEX = Path(os.environ.get("HERMES_SEARCH_INDEX", HERMES / "bridge-search.db"))
+SEARCH_LIMIT = 20
+
+# Query parameters accepted by /sessions, /sessions/<id> and /cron (and the
+# matching command-line flags)
+QUERY_PARAMS = ("cursor", "limit", "source", "model", "since", "until",
+                "min_cost", "max_cost", "enabled", "after")
+
+# Side-car store of per-day/model/source token and cost aggregates
+ROLLUP_DB = Path(os.environ.get("HERMES_ROLLUP_DB", HERMES / "bridge-rollups.db"))
+
+# Daemon mode listen address; HERMES_BRIDGE_SOCKET (or --socket=) selects a
+# Unix socket instead of localhost TCP.
+BRIDGE_PORT = int(os.environ.get("HERMES_BRIDGE_PORT", 8787))
+BRIDGE_SOCKET = os.environ.get("HERMES_BRIDGE_SOCKET", "")
+
+# Agent logs: how many lines to show from each end, and the block size used
+# when reading them (the tail is read backwards from EOF).
+LOG_HEADER_LINES = 5
+LOG_TAIL_LINES = 30
+LOG_BLOCK = 64 * 1024
+
+# Only the most recently modified files are listed: HERMES_LOG_LIMIT logs per
+# page (older pages via GET /logs?offset=N&limit=N or --logs --offset=N) and
+# the latest DUMP_LIMIT session dumps.
+LOG_LIMIT = int(os.environ.get("HERMES_LOG_LIMIT", 50))
+DUMP_LIMIT = 15
+
+# Watch mode: idle heartbeat interval, polling interval for the fallback
+# watcher, and caps on how much appended log output one delta carries.
+WATCH_HEARTBEAT = 15
+WATCH_POLL_SECONDS = 1.0
+WATCH_MAX_LINES = 200
+WATCH_MAX_BYTES = 1024 * 1024
+
+# path -> (inode, bytes indexed, content seen, breaks within content, breaks
+# after it, last byte); lets a growing log be line-counted by reading only
+# what was appended since last time.
+_line_index = {}
+
+# What str.strip() removes, in the ASCII range (count_lines, read_head,
+# read_tail)
+_BLANK = b" \t\n\r\x0b\x0c\x1c\x1d\x1e\x1f"
+
+# path -> ((mtime_ns, size), entry) for session dumps already parsed
+_dump_cache = {}
+
+db = HermesDB(DB_PATH)
+search_index = SearchIndex(SEARCH_INDEX, db)
+rollups = RollupStore(ROLLUP_DB, db)
+
 def read_sessions():
-    """Read recent user prompt sessions from state.db."""
+    """Read recent user prompt sessions from state.db (first page)."""
     if not DB_PATH.exists():
-        return []
+        return {"sessions": [], "next_cursor": None}
     try:
-        conn = sqlite3.connect(str(DB_PATH))
-        conn.row_factory = sqlite3.Row
-        # Get recent sessions with user messages
-        rows = conn.execute("""
-            SELECT s.id as session_id, s.source, s.title, s.started_at, s.ended_at,
-                   s.message_count, s.input_tokens, s.output_tokens,
-                   s.estimated_cost_usd, s.model,
-                   m.content as last_user_prompt
-            FROM sessions s
-            LEFT JOIN messages m ON m.session_id = s.id 
-                AND m.role = 'user'
-                AND m.id = (
-                    SELECT MAX(m2.id) FROM messages m2 
-                    WHERE m2.session_id = s.id AND m2.role = 'user'
-                )
-            ORDER BY s.started_at DESC
-            LIMIT 20
-        """).fetchall()
-        conn.close()
-        return [dict(r) for r in rows]
+        # Picks the 20 sessions first, then finds each one's latest user
+        # message with a grouped MAX — one seek per session with an index
+        # on messages(session_id, role, id), one pass over their messages
+        # without it — and truncates it in SQL.
+        return query_sessions(db, {})
     except Exception as e:
-        return [{"error": str(e)}]
+        return {"sessions": [{"error": str(e)}], "next_cursor": None}
 
-def read_agent_logs():
-    """Read recent agent log entries from bg-jobs."""
+def count_lines(path, st, f):
+    """
+    Line count as len(text.strip().split("\n")) of the decoded file, which
+    the dashboard has always shown: universal newlines (\r\n and a lone \r
+    are breaks too), blank runs at either end not counted, 1 for an empty
+    file. Kept in an index extended by reading only appended bytes.
+    """
+    cached = _line_index.get(path)
+    if cached and cached[0] == st.st_ino and cached[1] <= st.st_size:
+        _, offset, started, lines, pending, last = cached
+    else:
+        # new, replaced or truncated: recount
+        offset, started, lines, pending, last = 0, False, 0, 0, b""
+    f.seek(offset)
+    while True:
+        block = f.read(1024 * 1024)
+        if not block:
+            break
+        offset += len(block)
+        text = block[1:] if last == b"\r" and block[:1] == b"\n" else block  # \r\n split across reads
+        last = block[-1:]
+        text = text.replace(b"\r\n", b"\n").replace(b"\r", b"\n")
+        if not started:
+            text = text.lstrip(_BLANK)
+            if not text:
+                continue
+            started = True
+        content = text.rstrip(_BLANK)
+        if content:
+            # breaks after the previous content, then within this block's
+            lines += pending + content.count(b"\n")
+            pending = text.count(b"\n", len(content))
+        else:
+            pending += text.count(b"\n")
+    _line_index[path] = (st.st_ino, offset, started, lines, pending, last)
+    return lines + 1
+
+def universal_newlines(data):
+    """\r\n and lone \r as \n, as read_text() decodes them."""
+    return data.replace(b"\r\n", b"\n").replace(b"\r", b"\n")
+
+def read_head(f, n):
+    """First n lines, skipping leading (and, near EOF, trailing) blank space."""
+    f.seek(0)
+    data = b""
+    while True:
+        block = f.read(LOG_BLOCK)
+        data += block
+        text = universal_newlines(data)
+        lines = text.lstrip(_BLANK).split(b"\n")
+        if not block:
+            lines = text.strip(_BLANK).split(b"\n")
+            break
+        # Enough lines, and real content after them (so they aren't part of
+        # the trailing whitespace that the whole-file strip would drop)
+        if len(lines) > n and b"".join(lines[n:]).strip(_BLANK):
+            break
+    return [line.decode("utf-8", errors="replace") for line in lines[:n]]
+
+def read_tail(f, size, n):
+    """Last n lines, reading backwards from EOF one block at a time."""
+    end = size
+    data = b""
+    while True:
+        start = max(0, end - LOG_BLOCK)
+        f.seek(start)
+        data = f.read(end - start) + data
+        end = start
+        text = universal_newlines(data)
+        lines = text.rstrip(_BLANK).split(b"\n")
+        if end == 0:
+            lines = text.strip(_BLANK).split(b"\n")
+            break
+        # The first line may be partial (even a \r\n cut in two), so stop
+        # once there are n complete lines after real content (not the
+        # file's leading whitespace)
+        if len(lines) > n and b"".join(lines[:-n]).strip(_BLANK):
+            break
+    return [line.decode("utf-8", errors="replace") for line in lines[-n:]]
+
+def scan_recent(path, suffix, limit, offset=0):
+    """
+    One os.scandir pass over `path`. Returns (entries, total): the
+    (name, stat) of the offset..offset+limit most recently modified
+    `suffix` files, newest first, and how many there are in all. Each file
+    is stat-ed once and only the top offset+limit are kept (heap).
+    """
+    total = 0
+
+    def candidates():
+        nonlocal total
+        with os.scandir(path) as entries:
+            for e in entries:
+                if not e.name.endswith(suffix) or not e.is_file():
+                    continue
+                try:
+                    st = e.stat()
+                except OSError:
+                    continue  # deleted mid-scan
+                total += 1
+                yield e.name, st
+
+    top = heapq.nlargest(offset + limit, candidates(), key=lambda e: (e[1].st_mtime_ns, e[0]))
+    return top[offset:], total
+
+def read_agent_log_page(offset=0, limit=LOG_LIMIT):
+    """One page of agent logs from bg-jobs, most recently modified first."""
     results = {}
     if not BG_JOBS.exists():
-        return {}
-    for f in sorted(BG_JOBS.glob("*.log"), key=lambda p: p.stat().st_mtime, reverse=True):
+        return {"logs": {}, "offset": offset, "limit": limit, "total": 0}
+    logs, total = scan_recent(BG_JOBS, ".log", limit, offset)
+    for filename, st in logs:
+        f = BG_JOBS / filename
         name = f.stem  # filename without .log
         try:
-            content = f.read_text(errors="replace")
-            lines = content.strip().split("\n")
-            # Get first 3 lines (header) and last 20 lines (summary)
-            header = lines[:5] if len(lines) > 5 else lines
-            tail = lines[-30:] if len(lines) > 30 else lines
-            total_lines = len(lines)
-            results[name] = {
-                "name": name,
-                "total_lines": total_lines,
-                "header": header,
-                "tail": tail,
-                "size_bytes": f.stat().st_size,
-                "modified": datetime.fromtimestamp(f.stat().st_mtime).isoformat(),
-            }
+            with open(f, "rb") as fh:
+                results[name] = {
+                    "name": name,
+                    "total_lines": count_lines(str(f), st, fh),
+                    "header": read_head(fh, LOG_HEADER_LINES),
+                    "tail": read_tail(fh, st.st_size, LOG_TAIL_LINES),
+                    "size_bytes": st.st_size,
+                    "modified": datetime.fromtimestamp(st.st_mtime).isoformat(),
+                }
         except Exception as e:
             results[name] = {"name": name, "error": str(e)}
-    return results
+    if offset == 0:
+        # Keep newline indexes only for the first page's logs
+        for path in set(_line_index) - {str(BG_JOBS / filename) for filename, _ in logs}:
+            del _line_index[path]
+    return {"logs": results, "offset": offset, "limit": limit, "total": total}
+
+def read_agent_logs():
+    """Read recent agent log entries from bg-jobs."""
+    return read_agent_log_page()["logs"]
+
+def dump_entry(f, st):
+    """Listing entry for one session dump, cached by (path, mtime, size)."""
+    key = (st.st_mtime_ns, st.st_size)
+    cached = _dump_cache.get(str(f))
+    if cached and cached[0] == key:
+        return cached[1]
+    modified = datetime.fromtimestamp(st.st_mtime).isoformat()
+    try:
+        # Streams only as far as the prompt — dumps can be many MB
+        entry = {
+            "name": f.stem,
+            "prompt": dump_prompt(f),
+            "modified": modified,
+            "size_bytes": st.st_size,
+        }
+    except:
+        entry = {
+            "name": f.stem,
+            "error": "parse error",
+            "modified": modified,
+        }
+    _dump_cache[str(f)] = (key, entry)
+    return entry
 
 def read_sessions_dir():
     """Read session request dump files."""
     results = []
     if not SESSIONS_DIR.exists():
         return []
-    for f in sorted(SESSIONS_DIR.glob("*.json"), key=lambda p: p.stat().st_mtime, reverse=True)[:15]:
-        try:
-            data = json.loads(f.read_text(errors="replace"))
-            # Extract key fields if it's a request dump
-            prompt = data.get("prompt", data.get("messages", [{}])[0].get("content", "")) if isinstance(data, dict) else ""
-            if isinstance(prompt, str):
-                prompt = prompt[:200]
-            results.append({
-                "name": f.stem,
-                "prompt": prompt,
-                "modified": datetime.fromtimestamp(f.stat().st_mtime).isoformat(),
-                "size_bytes": f.stat().st_size,
-            })
-        except:
-            results.append({
-                "name": f.stem,
-                "error": "parse error",
-                "modified": datetime.fromtimestamp(f.stat().st_mtime).isoformat(),
-            })
+    dumps, _ = scan_recent(SESSIONS_DIR, ".json", DUMP_LIMIT)
+    for filename, st in dumps:
+        results.append(dump_entry(SESSIONS_DIR / filename, st))
+    # Forget dumps that were deleted or fell out of the list
+    for path in set(_dump_cache) - {str(SESSIONS_DIR / filename) for filename, _ in dumps}:
+        del _dump_cache[path]
     return results
 
 def read_cron_data():
-    """Read cron job data from state.db."""
+    """Read cron job data from state.db (first page)."""
     if not DB_PATH.exists():
-        return []
+        return {"cron_jobs": [], "next_cursor": None}
     try:
-        conn = sqlite3.connect(str(DB_PATH))
-        conn.row_factory = sqlite3.Row
-        rows = conn.execute("""
-            SELECT * FROM cron_jobs 
-            ORDER BY created_at DESC 
-            LIMIT 20
-        """).fetchall() if "cron_jobs" in [r[0] for r in conn.execute("SELECT name FROM sqlite_master WHERE type='table'").fetchall()] else []
-        conn.close()
-        return [dict(r) for r in rows]
+        if not db.has_table("cron_jobs"):
+            return {"cron_jobs": [], "next_cursor": None}
+        return query_cron(db, {})
     except:
-        return []
+        return {"cron_jobs": [], "next_cursor": None}
+
+def read_rollups():
+    """Token/cost aggregates, after folding in sessions changed since last time."""
+    if not DB_PATH.exists():
+        return {}
+    try:
+        rollups.update()
+        return rollups.summary()
+    except Exception as e:
+        return {"error": str(e)}
+
+def search_sessions(query, limit=SEARCH_LIMIT):
+    """Ranked sessions matching `query`, after indexing any new messages."""
+    if not DB_PATH.exists():
+        return {"query": query, "results": [], "indexed_through": 0}
+    with profiling.span("index"):
+        indexed = search_index.update()
+    with profiling.span("search"):
+        result = search_index.search(query, limit)
+    result["newly_indexed"] = indexed
+    return result
+
+def query_state(path, params):
+    """
+    /sessions, /sessions/<id> or /cron with their query parameters; None
+    when there's nothing there (no state.db, no cron table, unknown session).
+    """
+    if not DB_PATH.exists():
+        return None
+    if path == "/sessions":
+        return query_sessions(db, params)
+    if path == "/cron":
+        return query_cron(db, params) if db.has_table("cron_jobs") else None
+    return session_detail(db, unquote(path[len("/sessions/"):]), params)
+
+def db_version():
+    """Changes whenever another connection (the agent) commits to state.db."""
+    if not DB_PATH.exists():
+        return None
+    try:
+        return db.data_version()
+    except (OSError, sqlite3.Error):
+        return object()  # unknown: always rebuild
+
+def dir_version(path, suffix, limit):
+    """
+    File count plus (name, mtime, size) of the `limit` newest matching files
+    — exactly what a listed section depends on, so any write to a listed
+    file (or a new one overtaking it) changes it.
+    """
+    if not path.exists():
+        return None
+    entries, total = scan_recent(path, suffix, limit)
+    return total, tuple((name, st.st_mtime_ns, st.st_size) for name, st in entries)
+
+class SectionCache:
+    """One payload section, rebuilt only when its version key changes."""
+
+    def __init__(self, build, version):
+        self.build = build
+        self.version = version
+        self.key = object()
+        self.value = None
+
+    def get(self):
+        key = self.version()
+        if key != self.key:
+            self.value = self.build()
+            self.key = key
+        return self.value
+
+SECTIONS = {
+    "sessions": SectionCache(read_sessions, db_version),
+    "agent_logs": SectionCache(read_agent_log_page, lambda: dir_version(BG_JOBS, ".log", LOG_LIMIT)),
+    "session_dumps": SectionCache(read_sessions_dir, lambda: dir_version(SESSIONS_DIR, ".json", DUMP_LIMIT)),
+    "cron_data": SectionCache(read_cron_data, db_version),
+    "rollups": SectionCache(read_rollups, db_version),
+    # Query timings from the builds above; listed last so they're current
+    "_db": SectionCache(lambda: db.stats() if DB_PATH.exists() else {}, db_version),
+}
+
+_lock = threading.Lock()
+_snapshot = (None, None)
+
+def snapshot_json():
+    """Serialized payload; re-encoded only when some section was rebuilt."""
+    global _snapshot
+    with _lock:
+        data = {}
+        for name, section in SECTIONS.items():
+            with profiling.span(f"section:{name}"):
+                data[name] = section.get()
+        page = data["agent_logs"]
+        data["agent_logs"] = page["logs"]
+        data["agent_logs_page"] = {k: page[k] for k in ("offset", "limit", "total")}
+        # Paged sections keep their old list shape; the cursor sits beside it
+        data["sessions_next_cursor"] = data["sessions"]["next_cursor"]
+        data["sessions"] = data["sessions"]["sessions"]
+        data["cron_next_cursor"] = data["cron_data"]["next_cursor"]
+        data["cron_data"] = data["cron_data"]["cron_jobs"]
+        keys = tuple(section.key for section in SECTIONS.values())
+        if keys != _snapshot[0]:
+            with profiling.span("encode"):
+                _snapshot = (keys, json.dumps(data, default=str))
+        return _snapshot[1]
+
+def emit(event):
+    print(json.dumps(event, default=str), flush=True)
+
+class LogFollower:
+    """Per-log read offsets; turns appends into log_* deltas."""
+
+    def __init__(self):
+        self.files = {}  # name -> [inode, offset, partial line]
+
+    def prime(self):
+        if BG_JOBS.exists():
+            entries, _ = scan_recent(BG_JOBS, ".log", sys.maxsize)
+            for filename, st in entries:
+                self.files[Path(filename).stem] = [st.st_ino, st.st_size, b""]
+
+    def rescan(self):
+        names = {Path(e.name).stem for e in os.scandir(BG_JOBS) if e.name.endswith(".log")} if BG_JOBS.exists() else set()
+        for name in names | set(self.files):
+            self.update(BG_JOBS / f"{name}.log")
+
+    def update(self, path):
+        name = path.stem
+        try:
+            st = path.stat()
+        except FileNotFoundError:
+            if self.files.pop(name, None) is not None:
+                emit({"type": "log_removed", "name": name})
+            return
+        state = self.files.get(name)
+        if state is None:
+            state = self.files[name] = [st.st_ino, 0, b""]
+            emit({"type": "log_new", "name": name})
+        elif state[0] != st.st_ino or st.st_size < state[1]:
+            state[:] = [st.st_ino, 0, b""]
+            emit({"type": "log_reset", "name": name})
+        if st.st_size <= state[1]:
+            return
+
+        skipped = 0
+        if st.st_size - state[1] > WATCH_MAX_BYTES:
+            # Burst too big to relay: jump ahead, dropping the cut-off line
+            skipped = st.st_size - WATCH_MAX_BYTES - state[1]
+            state[1] = st.st_size - WATCH_MAX_BYTES
+            state[2] = b""
+        with open(path, "rb") as f:
+            f.seek(state[1])
+            data = f.read(st.st_size - state[1])
+        state[1] += len(data)
+        lines = (state[2] + data).split(b"\n")
+        state[2] = lines.pop()  # incomplete last line waits for its newline
+        if skipped and lines:
+            lines = lines[1:]
+        if not lines:
+            return
+        event = {
+            "type": "log_append",
+            "name": name,
+            "lines": [line.decode("utf-8", errors="replace") for line in lines[-WATCH_MAX_LINES:]],
+            "size_bytes": st.st_size,
+        }
+        if skipped or len(lines) > WATCH_MAX_LINES:
+            event["skipped_lines"] = max(0, len(lines) - WATCH_MAX_LINES)
+            event["skipped_bytes"] = skipped
+        emit(event)
+
+class DumpFollower:
+    """Known session dumps; turns changes into dump_* deltas."""
+
+    def __init__(self):
+        self.files = {}  # name -> (mtime_ns, size)
+
+    def prime(self):
+        if SESSIONS_DIR.exists():
+            entries, _ = scan_recent(SESSIONS_DIR, ".json", sys.maxsize)
+            self.files = {filename: (st.st_mtime_ns, st.st_size) for filename, st in entries}
+
+    def rescan(self):
+        names = {e.name for e in os.scandir(SESSIONS_DIR) if e.name.endswith(".json")} if SESSIONS_DIR.exists() else set()
+        for name in names | set(self.files):
+            self.update(SESSIONS_DIR / name)
+
+    def update(self, path):
+        try:
+            st = path.stat()
+        except FileNotFoundError:
+            if self.files.pop(path.name, None) is not None:
+                emit({"type": "dump_removed", "name": path.stem})
+            return
+        key = (st.st_mtime_ns, st.st_size)
+        previous = self.files.get(path.name)
+        if previous == key:
+            return
+        self.files[path.name] = key
+        emit({"type": "dump_new" if previous is None else "dump_updated", "dump": dump_entry(path, st)})
+
+class DBFollower:
+    """Sessions started/ended and cron rows changed since the last check."""
+
+    def __init__(self):
+        self.version = None
+        self.last_started = None
+        self.open_sessions = set()
+        self.cron = {}
+
+    def prime(self):
+        if not DB_PATH.exists():
+            return
+        self.version = db_version()
+        row = db.query("watch_watermark", "SELECT MAX(started_at) FROM sessions")[0]
+        self.last_started = row[0]
+        self.open_sessions = {r[0] for r in db.query("watch_open", """
+            SELECT id FROM sessions WHERE ended_at IS NULL ORDER BY started_at DESC LIMIT 1000
+        """)}
+        self.cron = self._cron_rows()
+
+    def _cron_rows(self):
+        if not db.has_table("cron_jobs"):
+            return {}
+        return {r["id"]: dict(r) for r in db.query("watch_cron", "SELECT * FROM cron_jobs")}
+
+    def update(self):
+        if not DB_PATH.exists():
+            return
+        version = db_version()
+        if version == self.version:
+            return  # WAL touched but nothing committed
+        self.version = version
+
+        started = db.query("watch_started", """
+            SELECT id AS session_id, source, title, model, started_at, ended_at
+            FROM sessions WHERE started_at > ? OR ? IS NULL
+            ORDER BY started_at
+        """, (self.last_started, self.last_started))
+        for r in started:
+            emit({"type": "session_started", "session": dict(r)})
+            self.last_started = r["started_at"]
+            if r["ended_at"] is None:
+                self.open_sessions.add(r["session_id"])
+
+        if self.open_sessions:
+            ids = list(self.open_sessions)
+            ended = db.query("watch_ended", f"""
+                SELECT id AS session_id, ended_at, message_count, input_tokens,
+                       output_tokens, estimated_cost_usd
+                FROM sessions
+                WHERE ended_at IS NOT NULL AND id IN ({",".join("?" * len(ids))})
+            """, ids)
+            for r in ended:
+                emit({"type": "session_ended", "session": dict(r)})
+                self.open_sessions.discard(r["session_id"])
+
+        cron = self._cron_rows()
+        for job_id in cron.keys() - self.cron.keys():
+            emit({"type": "cron_added", "job": cron[job_id]})
+        for job_id in self.cron.keys() - cron.keys():
+            emit({"type": "cron_removed", "id": job_id})
+        for job_id in cron.keys() & self.cron.keys():
+            if cron[job_id] != self.cron[job_id]:
+                emit({"type": "cron_changed", "job": cron[job_id]})
+        self.cron = cron
+
+def watch():
+    logs, dumps, database = LogFollower(), DumpFollower(), DBFollower()
+    logs.prime()
+    dumps.prime()
+    database.prime()
+    watcher = open_watcher([BG_JOBS, SESSIONS_DIR, HERMES], poll_interval=WATCH_POLL_SECONDS,
+                           use_inotify="--poll" not in sys.argv)
+    print(f'{{"type": "snapshot", "watcher": "{type(watcher).__name__.lower()}", "data": {snapshot_json()}}}',
+          flush=True)
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    try:
+        while True:
+            changed = watcher.read(WATCH_HEARTBEAT)
+            if not changed:
+                emit({"type": "heartbeat", "at": datetime.now().isoformat()})
+                continue
+            db_touched = False
+            for path in sorted(changed):
+                if path == BG_JOBS:
+                    logs.rescan()
+                elif path == SESSIONS_DIR:
+                    dumps.rescan()
+                elif path == HERMES:
+                    db_touched = True
+                elif path.parent == BG_JOBS and path.suffix == ".log":
+                    logs.update(path)
+                elif path.parent == SESSIONS_DIR and path.suffix == ".json":
+                    dumps.update(path)
+                elif path.parent == HERMES and path.name.startswith(DB_PATH.name):
+                    db_touched = True  # state.db or its -wal
+            if db_touched:
+                database.update()
+    except (KeyboardInterrupt, BrokenPipeError):
+        pass
+    finally:
+        watcher.close()
+
+class BridgeHandler(BaseHTTPRequestHandler):
+
+    # Span names for --timings; session ids are folded into one route
+    ROUTES = ("/", "/snapshot", "/logs", "/sessions", "/sessions/<id>", "/cron", "/search")
+
+    # send_error() bodies as JSON, which the API route hands to the client
+    error_content_type = "application/json"
+    error_message_format = '{"error": "%(message)s", "status": %(code)d}'
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        route = "/sessions/<id>" if url.path.startswith("/sessions/") else url.path
+        with profiling.span(f"GET {route if route in self.ROUTES else 'other'}"):
+            self._get(url)
+
+    def _get(self, url):
+        if url.path in ("/", "/snapshot"):
+            body = snapshot_json()
+        elif url.path == "/logs":
+            params = parse_qs(url.query)
+            try:
+                offset = max(0, int(params.get("offset", ["0"])[0]))
+                limit = min(500, max(1, int(params.get("limit", [str(LOG_LIMIT)])[0])))
+            except ValueError:
+                self.send_error(400)
+                return
+            with _lock:
+                body = json.dumps(read_agent_log_page(offset, limit), default=str)
+        elif url.path in ("/sessions", "/cron") or url.path.startswith("/sessions/"):
+            params = {k: v[0] for k, v in parse_qs(url.query).items() if k in QUERY_PARAMS}
+            try:
+                result = query_state(url.path, params)
+            except ValueError:
+                self.send_error(400)
+                return
+            if result is None:
+                self.send_error(404)
+                return
+            body = json.dumps(result, default=str)
+        elif url.path == "/search":
+            params = parse_qs(url.query)
+            try:
+                limit = min(100, max(1, int(params.get("limit", [str(SEARCH_LIMIT)])[0])))
+                body = json.dumps(search_sessions(params.get("q", [""])[0], limit), default=str)
+            except ValueError:
+                self.send_error(400)
+                return
+        else:
+            self.send_error(404)
+            return
+        self._send_json(body)
+
+    def _send_json(self, body):
+        body = body.encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+class UnixBridgeServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+def arg_value(name, default=None):
+    """Value of a `--name=value` command-line flag, or `default`."""
+    prefix = f"--{name}="
+    for arg in sys.argv[1:]:
+        if arg.startswith(prefix):
+            return arg[len(prefix):]
+    return default
+
+def serve():
+    socket_path = arg_value("socket", BRIDGE_SOCKET)
+    if socket_path:
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+        server = UnixBridgeServer(socket_path, BridgeHandler)
+        os.chmod(socket_path, 0o600)
+        where = socket_path
+    else:
+        # Loopback only — the payload is admin data
+        server = ThreadingHTTPServer(("127.0.0.1", int(arg_value("port", BRIDGE_PORT))), BridgeHandler)
+        server.daemon_threads = True
+        where = f"http://127.0.0.1:{server.server_address[1]}/"
+    snapshot_json()  # warm the caches before the first request
+    if DB_PATH.exists():
+        # First build over a long history can take a while; don't hold up serving
+        threading.Thread(target=search_index.update, daemon=True).start()
+    if DB_PATH.exists() and not db.has_index(*LATEST_PROMPT_INDEX):
+        table, columns = LATEST_PROMPT_INDEX
+        print(f"note: no index on {table}({', '.join(columns)}); latest-prompt lookups "
+              f"scan each recent session's messages", file=sys.stderr)
+    print(f"hermes-bridge serving on {where}", file=sys.stderr)
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if socket_path and os.path.exists(socket_path):
+            os.unlink(socket_path)
 
 def main():
-    data = {
-        "sessions": read_sessions(),
-        "agent_logs": read_agent_logs(),
-        "session_dumps": read_sessions_dir(),
-        "cron_data": read_cron_data(),
-    }
-    print(json.dumps(data, default=str))
+    if "--serve" in sys.argv:
+        serve()
+        return
+    if "--watch" in sys.argv:
+        watch()
+        return
+    query = arg_value("search")
+    if query is not None:
+        print(json.dumps(search_sessions(query, int(arg_value("limit", SEARCH_LIMIT))), default=str))
+        return
+    params = {name: arg_value(name) for name in QUERY_PARAMS if arg_value(name) is not None}
+    for flag, path in (("--sessions", "/sessions"), ("--cron", "/cron")):
+        if flag in sys.argv:
+            print(json.dumps(query_state(path, params), default=str))
+            return
+    session_id = arg_value("session")
+    if session_id is not None:
+        print(json.dumps(query_state(f"/sessions/{session_id}", params), default=str))
+        return
+    if "--logs" in sys.argv:
+        page = read_agent_log_page(int(arg_value("offset", 0)), int(arg_value("limit", LOG_LIMIT)))
+        print(json.dumps(page, default=str))
+        return
+    print(snapshot_json())
 
 if __name__ == "__main__":
-    main()
+    with profiling.session("hermes-bridge"):
+        main()
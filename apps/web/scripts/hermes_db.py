@@ -0,0 +1,108 @@
+"""
+Read-only access to the Hermes agent's state.db for hermes-bridge.py.
+
+state.db is the live agent's database, so the bridge must never write to it
+or hold locks that slow the agent down. HermesDB keeps ONE connection,
+opened through a `mode=ro` URI with PRAGMA query_only and a busy timeout,
+reopens it if the file is replaced, and times every named query so the
+dashboard can show where bridge latency goes. Schema lookups (tables,
+indexes) are cached until PRAGMA schema_version changes.
+"""
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from urllib.parse import quote
+
+# How long a read waits on the agent's write lock before giving up
+BUSY_TIMEOUT_MS = 2000
+
+# Index that turns the latest-user-prompt lookup into one seek per session.
+# The bridge can't create it (read-only); the agent's schema should.
+LATEST_PROMPT_INDEX = ("messages", ("session_id", "role", "id"))
+
+
+class HermesDB:
+    """Thread-safe: the connection is shared and guarded by a lock."""
+
+    def __init__(self, path, busy_timeout_ms=BUSY_TIMEOUT_MS):
+        self.path = Path(path)
+        self.busy_timeout_ms = busy_timeout_ms
+        self.lock = threading.RLock()
+        self.conn = None
+        self.inode = None
+        self.schema_version = None
+        self._tables = None
+        self._indexes = {}
+        self.timings = {}
+
+    def exists(self):
+        return self.path.exists()
+
+    def connection(self):
+        """The shared read-only connection, reopened if state.db was replaced."""
+        inode = self.path.stat().st_ino
+        if self.conn is None or inode != self.inode:
+            if self.conn is not None:
+                self.conn.close()
+            uri = f"file:{quote(str(self.path.resolve()))}?mode=ro"
+            self.conn = sqlite3.connect(uri, uri=True, check_same_thread=False)
+            self.conn.row_factory = sqlite3.Row
+            self.conn.execute("PRAGMA query_only = ON")
+            self.conn.execute(f"PRAGMA busy_timeout = {int(self.busy_timeout_ms)}")
+            self.inode = inode
+            self.schema_version = None
+        return self.conn
+
+    def query(self, name, sql, params=()):
+        """Runs one SELECT, recording its wall time under `name`."""
+        with self.lock:
+            start = time.perf_counter()
+            rows = self.connection().execute(sql, params).fetchall()
+            self.timings[name] = round((time.perf_counter() - start) * 1000, 2)
+            return rows
+
+    def data_version(self):
+        """Changes whenever another connection (the agent) commits."""
+        with self.lock:
+            return (self.inode, self.connection().execute("PRAGMA data_version").fetchone()[0])
+
+    def _check_schema(self):
+        version = self.connection().execute("PRAGMA schema_version").fetchone()[0]
+        if version != self.schema_version:
+            self.schema_version = version
+            self._tables = None
+            self._indexes = {}
+
+    def has_table(self, table):
+        with self.lock:
+            self._check_schema()
+            if self._tables is None:
+                self._tables = {r[0] for r in self.connection().execute(
+                    "SELECT name FROM sqlite_master WHERE type = 'table'")}
+            return table in self._tables
+
+    def has_index(self, table, columns):
+        """True if some index on `table` starts with `columns`, in order."""
+        with self.lock:
+            self._check_schema()
+            key = (table, tuple(columns))
+            if key not in self._indexes:
+                found = False
+                if self.has_table(table):
+                    conn = self.connection()
+                    for index in conn.execute(f'PRAGMA index_list("{table}")').fetchall():
+                        cols = [r["name"] for r in conn.execute(f'PRAGMA index_info("{index["name"]}")')]
+                        if tuple(cols[:len(columns)]) == tuple(columns):
+                            found = True
+                            break
+                self._indexes[key] = found
+            return self._indexes[key]
+
+    def stats(self):
+        """Query timings and index status for the payload's _db section."""
+        table, columns = LATEST_PROMPT_INDEX
+        return {
+            "query_ms": dict(self.timings),
+            "latest_prompt_indexed": self.exists() and self.has_index(table, columns),
+        }
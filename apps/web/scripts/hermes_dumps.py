@@ -0,0 +1,264 @@
+"""
+Prefix-only reader for Hermes session dump files (~/.hermes/sessions/*.json).
+
+The dashboard shows only the first PROMPT_CHARS characters of a dump's
+`prompt` (or, without one, of `messages[0].content`), but dumps can be many
+MB. dump_prompt() streams the file in blocks and walks the JSON just far
+enough to pull that prefix out: a `prompt` string ends the read at once,
+and other values are skipped structurally without being decoded. Shapes it
+doesn't handle cheaply (a non-string prompt or content, an empty or odd
+`messages`, a top level that isn't an object) fall back to a full
+json.loads, so for well-formed dumps the result matches the full parse.
+"""
+import codecs
+import json
+import re
+
+PROMPT_CHARS = 200
+BLOCK = 64 * 1024
+
+_WS = re.compile(r"[ \t\r\n]*")
+_STRING_SPECIAL = re.compile(r'["\\]')
+_STRUCTURAL = re.compile(r'[\[\]{}"]')
+_SCALAR = re.compile(r'[^,}\]\s]+')
+
+
+class _FullParse(Exception):
+    """Raised when only a full json.loads can give the exact answer."""
+
+
+_ODD = object()
+
+
+class _Reader:
+    """Block-buffered cursor over a UTF-8 file, trimming consumed text."""
+
+    def __init__(self, f):
+        self.f = f
+        self.decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+
+    def fill(self):
+        if self.eof:
+            return False
+        data = self.f.read(BLOCK)
+        self.buf = self.buf[self.pos:] + self.decoder.decode(data, final=not data)
+        self.pos = 0
+        self.eof = not data
+        return True
+
+    def peek(self):
+        """Next non-whitespace character ('' at EOF), without consuming it."""
+        while True:
+            self.pos = _WS.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self.fill():
+                return ""
+
+    def expect(self, char):
+        if self.peek() != char:
+            raise ValueError(f"expected {char!r}")
+        self.pos += 1
+
+    def string(self, limit=None):
+        """
+        Consumes the string at the cursor. Returns it decoded — only its
+        first `limit` characters when a limit is given (0 = skip it).
+        """
+        self.expect('"')
+        if limit == 0:
+            self._skip_string_body()
+            return ""
+        keep = None if limit is None else limit * 6 + 12  # raw chars always enough
+        raw = []
+        kept = 0
+
+        def take(text):
+            nonlocal kept
+            if keep is None or kept < keep:
+                raw.append(text)
+                kept += len(text)
+
+        while True:
+            m = _STRING_SPECIAL.search(self.buf, self.pos)
+            if m is None:
+                take(self.buf[self.pos:])
+                self.pos = len(self.buf)
+                if not self.fill():
+                    raise ValueError("unterminated string")
+                continue
+            i = m.start()
+            if self.buf[i] == '"':
+                take(self.buf[self.pos:i])
+                self.pos = i + 1
+                break
+            if i + 1 >= len(self.buf):  # escape split across blocks
+                take(self.buf[self.pos:i])
+                self.pos = i
+                if not self.fill():
+                    raise ValueError("unterminated string")
+                continue
+            take(self.buf[self.pos:i + 2])
+            self.pos = i + 2
+
+        text = "".join(raw)
+        if limit is None:
+            return json.loads(f'"{text}"')
+        text = text[:keep]
+        # A cut can split an escape sequence; back off until it decodes
+        for cut in range(len(text), max(-1, len(text) - 13), -1):
+            try:
+                value = json.loads(f'"{text[:cut]}"')
+                break
+            except ValueError:
+                continue
+        else:
+            raise ValueError("bad string")
+        return value[:limit]
+
+    def _skip_string_body(self):
+        """Hot path for skipped strings: jump quote to quote with str.find."""
+        while True:
+            i = self.buf.find('"', self.pos)
+            if i == -1:
+                # Keep a trailing run of backslashes: it may escape the next quote
+                end = len(self.buf)
+                while end > self.pos and self.buf[end - 1] == "\\":
+                    end -= 1
+                self.pos = end
+                if not self.fill():
+                    raise ValueError("unterminated string")
+                continue
+            j = i
+            while j > 0 and self.buf[j - 1] == "\\":
+                j -= 1
+            self.pos = i + 1
+            if (i - j) % 2 == 0:  # not escaped
+                return
+
+    def skip(self):
+        """Consumes one value of any type without building it."""
+        c = self.peek()
+        if c == '"':
+            self.string(0)
+        elif c in "[{":
+            depth = 0
+            while True:
+                m = _STRUCTURAL.search(self.buf, self.pos)
+                if m is None:
+                    self.pos = len(self.buf)
+                    if not self.fill():
+                        raise ValueError("unterminated container")
+                    continue
+                self.pos = m.start()
+                ch = self.buf[self.pos]
+                if ch == '"':
+                    self.string(0)
+                    continue
+                self.pos += 1
+                depth += 1 if ch in "[{" else -1
+                if depth == 0:
+                    return
+        else:
+            while True:
+                m = _SCALAR.match(self.buf, self.pos)
+                if m is None:
+                    raise ValueError("unexpected character")
+                if m.end() < len(self.buf) or not self.fill():
+                    self.pos = m.end()
+                    return
+
+    def members(self):
+        """Yields each key of the object at the cursor; the caller consumes its value."""
+        self.expect("{")
+        if self.peek() == "}":
+            self.pos += 1
+            return
+        while True:
+            key = self.string()
+            self.expect(":")
+            yield key
+            c = self.peek()
+            self.pos += 1
+            if c == "}":
+                return
+            if c != ",":
+                raise ValueError("expected ',' or '}'")
+
+
+def _first_content(reader, limit):
+    """
+    messages[0].content (prefix) from the value at the cursor, or _ODD when
+    the value isn't a list whose first item has string content — the full
+    parse decides those, unless a `prompt` turns up later.
+    """
+    if reader.peek() != "[":
+        reader.skip()
+        return _ODD
+    reader.expect("[")
+    if reader.peek() == "]":
+        reader.pos += 1
+        return _ODD
+    content = ""
+    if reader.peek() == "{":
+        for key in reader.members():
+            if key == "content" and reader.peek() == '"':
+                content = reader.string(limit)
+            elif key == "content":
+                reader.skip()
+                content = _ODD
+            else:
+                reader.skip()
+    else:
+        reader.skip()
+        content = _ODD
+    while reader.peek() == ",":
+        reader.pos += 1
+        reader.skip()
+    reader.expect("]")
+    return content
+
+
+def _full_prompt(path, limit):
+    """Whole-file parse; decides every shape the streaming path defers."""
+    with open(path, encoding="utf-8", errors="replace") as f:
+        data = json.loads(f.read())
+    if not isinstance(data, dict):
+        prompt = ""
+    elif "prompt" in data:
+        prompt = data["prompt"]
+    else:
+        prompt = data.get("messages", [{}])[0].get("content", "")
+    if isinstance(prompt, str):
+        prompt = prompt[:limit]
+    return prompt
+
+
+def dump_prompt(path, limit=PROMPT_CHARS):
+    """
+    First `limit` characters of a dump's prompt (or messages[0].content).
+    Raises ValueError on malformed JSON, like json.loads.
+    """
+    try:
+        with open(path, "rb") as f:
+            reader = _Reader(f)
+            if reader.peek() != "{":
+                raise _FullParse
+            content = None
+            for key in reader.members():
+                if key == "prompt":
+                    if reader.peek() != '"':
+                        raise _FullParse
+                    return reader.string(limit)  # prompt wins: stop reading here
+                if key == "messages" and content is None:
+                    content = _first_content(reader, limit)
+                else:
+                    reader.skip()
+            if content is _ODD:
+                raise _FullParse
+            return content if content is not None else ""
+    except _FullParse:
+        return _full_prompt(path, limit)
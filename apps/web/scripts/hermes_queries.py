@@ -0,0 +1,178 @@
+"""
+Paged, filterable reads of Hermes sessions and cron jobs for hermes-bridge.py.
+
+Pages use keyset cursors rather than OFFSET: a cursor is the (sort key, id)
+of the last row returned, and the next page starts strictly after it, so
+every page costs the same however deep the admin scrolls, and rows inserted
+meanwhile don't shift later pages. Cursors are opaque base64 strings.
+
+Previews are cut with SQL substr(), so long prompts never leave SQLite in
+full; session_detail() is the lazy call that returns one session's messages
+(each capped at DETAIL_CHARS, paged by message id).
+
+Every function takes `params`, a dict of strings (query-string or
+command-line values), and raises ValueError for anything malformed.
+"""
+import base64
+import json
+from datetime import datetime
+
+PAGE_LIMIT = 20
+MAX_PAGE_LIMIT = 100
+PROMPT_PREVIEW_CHARS = 200
+
+# Session detail: messages per page and characters kept per message
+DETAIL_LIMIT = 50
+DETAIL_CHARS = 20000
+
+
+def encode_cursor(*values):
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor, size):
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except ValueError:
+        raise ValueError("bad cursor")
+    if not isinstance(values, list) or len(values) != size:
+        raise ValueError("bad cursor")
+    # Bound straight into SQL, so only values SQLite can bind
+    if not all(isinstance(value, (str, int, float)) for value in values):
+        raise ValueError("bad cursor")
+    return values
+
+
+def page_limit(params, default=PAGE_LIMIT):
+    limit = int(params.get("limit") or default)
+    return min(MAX_PAGE_LIMIT, max(1, limit))
+
+
+def timestamp(value):
+    """Epoch seconds, or an ISO date/datetime (naive = local time), as epoch seconds."""
+    try:
+        return float(value)
+    except ValueError:
+        return datetime.fromisoformat(value).timestamp()
+
+
+class Filters:
+    """Accumulates WHERE clauses and their parameters."""
+
+    def __init__(self):
+        self.clauses = []
+        self.params = []
+
+    def add(self, clause, *params):
+        self.clauses.append(clause)
+        self.params.extend(params)
+
+    def where(self):
+        return "WHERE " + " AND ".join(self.clauses) if self.clauses else ""
+
+
+def query_sessions(db, params):
+    """
+    One page of sessions, newest first, each with a preview of its latest
+    user prompt. Filters: source, model (comma-separated for several),
+    since/until (on started_at), min_cost/max_cost (estimated_cost_usd).
+    """
+    limit = page_limit(params)
+    filters = Filters()
+    for column in ("source", "model"):
+        if params.get(column):
+            values = params[column].split(",")
+            filters.add(f"{column} IN ({','.join('?' * len(values))})", *values)
+    if params.get("since"):
+        filters.add("started_at >= ?", timestamp(params["since"]))
+    if params.get("until"):
+        filters.add("started_at < ?", timestamp(params["until"]))
+    if params.get("min_cost"):
+        filters.add("estimated_cost_usd >= ?", float(params["min_cost"]))
+    if params.get("max_cost"):
+        filters.add("estimated_cost_usd <= ?", float(params["max_cost"]))
+    if params.get("cursor"):
+        filters.add("(started_at, id) < (?, ?)", *decode_cursor(params["cursor"], 2))
+
+    # Same shape as the snapshot's query: choose the page, then one grouped
+    # MAX finds each session's latest user message.
+    rows = db.query("sessions_page", f"""
+        WITH page AS (
+            SELECT id AS session_id, source, title, started_at, ended_at,
+                   message_count, input_tokens, output_tokens,
+                   estimated_cost_usd, model
+            FROM sessions
+            {filters.where()}
+            ORDER BY started_at DESC, id DESC
+            LIMIT ?
+        ),
+        latest AS (
+            SELECT session_id, MAX(id) AS message_id
+            FROM messages
+            WHERE role = 'user' AND session_id IN (SELECT session_id FROM page)
+            GROUP BY session_id
+        )
+        SELECT p.*, substr(m.content, 1, ?) AS last_user_prompt,
+               length(m.content) AS last_user_prompt_chars
+        FROM page p
+        LEFT JOIN latest l ON l.session_id = p.session_id
+        LEFT JOIN messages m ON m.id = l.message_id
+        ORDER BY p.started_at DESC, p.session_id DESC
+    """, filters.params + [limit + 1, PROMPT_PREVIEW_CHARS])
+    sessions = [dict(r) for r in rows[:limit]]
+    last = sessions[-1] if sessions else None
+    return {
+        "sessions": sessions,
+        "next_cursor": encode_cursor(last["started_at"], last["session_id"]) if len(rows) > limit else None,
+    }
+
+
+def session_detail(db, session_id, params):
+    """One session's row and a page of its messages, oldest first (cursor: after=<message id>)."""
+    limit = page_limit({"limit": params.get("limit")}, DETAIL_LIMIT)
+    after = int(params.get("after") or 0)
+    session = db.query("session_detail", "SELECT * FROM sessions WHERE id = ?", (session_id,))
+    if not session:
+        return None
+    rows = db.query("session_messages", """
+        SELECT id, role, substr(content, 1, ?) AS content, length(content) AS content_chars, timestamp
+        FROM messages
+        WHERE session_id = ? AND id > ?
+        ORDER BY id
+        LIMIT ?
+    """, (DETAIL_CHARS, session_id, after, limit + 1))
+    messages = [dict(r) for r in rows[:limit]]
+    return {
+        "session": dict(session[0]),
+        "messages": messages,
+        "next_after": messages[-1]["id"] if len(rows) > limit else None,
+    }
+
+
+def query_cron(db, params):
+    """
+    One page of cron jobs, newest first. Filters: enabled (0/1),
+    since/until (on created_at).
+    """
+    limit = page_limit(params)
+    filters = Filters()
+    if params.get("enabled"):
+        filters.add("enabled = ?", int(params["enabled"]))
+    if params.get("since"):
+        filters.add("created_at >= ?", timestamp(params["since"]))
+    if params.get("until"):
+        filters.add("created_at < ?", timestamp(params["until"]))
+    if params.get("cursor"):
+        filters.add("(created_at, id) < (?, ?)", *decode_cursor(params["cursor"], 2))
+    rows = db.query("cron_page", f"""
+        SELECT * FROM cron_jobs
+        {filters.where()}
+        ORDER BY created_at DESC, id DESC
+        LIMIT ?
+    """, filters.params + [limit + 1])
+    jobs = [dict(r) for r in rows[:limit]]
+    last = jobs[-1] if jobs else None
+    return {
+        "cron_jobs": jobs,
+        "next_cursor": encode_cursor(last["created_at"], last["id"]) if len(rows) > limit else None,
+    }
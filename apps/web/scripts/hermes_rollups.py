@@ -0,0 +1,201 @@
+"""
+Token and cost rollups of Hermes sessions for hermes-bridge.py.
+
+Aggregates per (day, model, source) live in a side-car SQLite file, like
+the search index, so state.db is never written. RollupStore.update() reads
+only sessions inserted since the stored watermark (the sessions table's
+rowid, which grows with every insert — a seek, not a scan, and immune to
+clock skew in started_at) plus the sessions it last saw still open, re-read
+by primary key, which is how endings and running token counts are picked
+up. Each session's last contribution is kept, so re-reading one replaces
+its numbers instead of adding them twice.
+
+If state.db is replaced, or its highest rowid falls below the watermark
+(rows deleted or renumbered by VACUUM), the rollups are rebuilt.
+
+Days are UTC dates of started_at, which may be epoch seconds or an ISO
+timestamp string.
+"""
+import sqlite3
+import threading
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+# Daily rows included in the payload; model/source totals cover all history
+ROLLUP_DAYS = 90
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS rollup (
+    day TEXT NOT NULL,
+    model TEXT NOT NULL,
+    source TEXT NOT NULL,
+    sessions INTEGER NOT NULL DEFAULT 0,
+    ended_sessions INTEGER NOT NULL DEFAULT 0,
+    messages INTEGER NOT NULL DEFAULT 0,
+    input_tokens INTEGER NOT NULL DEFAULT 0,
+    output_tokens INTEGER NOT NULL DEFAULT 0,
+    cost_usd REAL NOT NULL DEFAULT 0,
+    PRIMARY KEY (day, model, source)
+);
+CREATE TABLE IF NOT EXISTS contribution (
+    session_id TEXT PRIMARY KEY,
+    day TEXT NOT NULL,
+    model TEXT NOT NULL,
+    source TEXT NOT NULL,
+    ended INTEGER NOT NULL,
+    messages INTEGER NOT NULL,
+    input_tokens INTEGER NOT NULL,
+    output_tokens INTEGER NOT NULL,
+    cost_usd REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS rollup_state (key TEXT PRIMARY KEY, value);
+"""
+
+# Open sessions re-read per query (bound by SQLite's parameter limit)
+OPEN_BATCH = 500
+
+SESSION_COLUMNS = """
+    id, source, model, started_at, ended_at, message_count,
+    input_tokens, output_tokens, estimated_cost_usd
+"""
+
+MEASURES = ("ended", "messages", "input_tokens", "output_tokens", "cost_usd")
+
+
+def day_of(started_at):
+    if started_at is None:
+        return "unknown"
+    if isinstance(started_at, (int, float)):
+        return datetime.fromtimestamp(started_at, timezone.utc).date().isoformat()
+    return str(started_at)[:10]
+
+
+def contribution_of(row):
+    """A sessions row as (day, model, source, ended, messages, in, out, cost)."""
+    return (
+        day_of(row["started_at"]),
+        row["model"] or "unknown",
+        row["source"] or "unknown",
+        int(row["ended_at"] is not None),
+        row["message_count"] or 0,
+        row["input_tokens"] or 0,
+        row["output_tokens"] or 0,
+        row["estimated_cost_usd"] or 0.0,
+    )
+
+
+class RollupStore:
+    """Thread-safe: the side-car connection is guarded by its own lock."""
+
+    def __init__(self, path, source):
+        self.path = Path(path)
+        self.source = source  # HermesDB over state.db
+        self.lock = threading.Lock()
+        self.conn = None
+
+    def connection(self):
+        if self.conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self.conn = sqlite3.connect(str(self.path), check_same_thread=False)
+            self.conn.row_factory = sqlite3.Row
+            self.conn.execute("PRAGMA journal_mode = WAL")
+            self.conn.execute("PRAGMA synchronous = NORMAL")
+            self.conn.executescript(SCHEMA)
+        return self.conn
+
+    def _state(self):
+        return {r["key"]: r["value"] for r in self.connection().execute("SELECT * FROM rollup_state")}
+
+    def _apply(self, conn, key, values, sign):
+        day, model, source = key
+        ended, messages, input_tokens, output_tokens, cost = values
+        conn.execute("""
+            INSERT INTO rollup VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT (day, model, source) DO UPDATE SET
+                sessions = sessions + excluded.sessions,
+                ended_sessions = ended_sessions + excluded.ended_sessions,
+                messages = messages + excluded.messages,
+                input_tokens = input_tokens + excluded.input_tokens,
+                output_tokens = output_tokens + excluded.output_tokens,
+                cost_usd = cost_usd + excluded.cost_usd
+        """, (day, model, source, sign, sign * ended, sign * messages,
+              sign * input_tokens, sign * output_tokens, sign * cost))
+
+    def update(self):
+        """Folds in new sessions and those last seen open. Returns how many changed."""
+        with self.lock:
+            conn = self.connection()
+            state = self._state()
+            inode = self.source.data_version()[0]
+            newest = self.source.query("rollup_newest", "SELECT MAX(rowid) FROM sessions")[0][0] or 0
+            if state.get("inode") != inode or newest < state.get("last_rowid", 0):
+                with conn:  # first run, or state.db replaced: rebuild
+                    conn.execute("DELETE FROM rollup")
+                    conn.execute("DELETE FROM contribution")
+                    conn.execute("DELETE FROM rollup_state")
+                state = {}
+
+            last_rowid = state.get("last_rowid", 0)
+            rows = {r["id"]: r for r in self.source.query("rollup_new", f"""
+                SELECT {SESSION_COLUMNS} FROM sessions WHERE rowid > ? AND rowid <= ?
+            """, (last_rowid, newest))}
+            open_ids = [r[0] for r in conn.execute("SELECT session_id FROM contribution WHERE ended = 0")]
+            for i in range(0, len(open_ids), OPEN_BATCH):
+                batch = open_ids[i:i + OPEN_BATCH]
+                for r in self.source.query("rollup_open", f"""
+                    SELECT {SESSION_COLUMNS} FROM sessions WHERE id IN ({",".join("?" * len(batch))})
+                """, batch):
+                    rows.setdefault(r["id"], r)
+            gone = set(open_ids) - rows.keys()  # deleted while open
+            rows = list(rows.values())
+            if not rows and not gone and state.get("last_rowid") == newest:
+                return 0
+
+            with conn:
+                changed = len(gone)
+                for session_id in gone:
+                    old = conn.execute("SELECT * FROM contribution WHERE session_id = ?", (session_id,)).fetchone()
+                    self._apply(conn, tuple(old)[1:4], tuple(old[m] for m in MEASURES), -1)
+                    conn.execute("DELETE FROM contribution WHERE session_id = ?", (session_id,))
+                for row in rows:
+                    new = contribution_of(row)
+                    old = conn.execute("SELECT * FROM contribution WHERE session_id = ?", (row["id"],)).fetchone()
+                    if old is not None:
+                        if tuple(old)[1:] == new:
+                            continue
+                        self._apply(conn, tuple(old)[1:4], tuple(old[m] for m in MEASURES), -1)
+                    self._apply(conn, new[:3], new[3:], 1)
+                    conn.execute("INSERT OR REPLACE INTO contribution VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                                 (row["id"],) + new)
+                    changed += 1
+                conn.execute("DELETE FROM rollup WHERE sessions <= 0")
+                conn.executemany("INSERT OR REPLACE INTO rollup_state VALUES (?, ?)",
+                                 [("inode", inode), ("last_rowid", newest)])
+            return changed
+
+    def summary(self, days=ROLLUP_DAYS):
+        """Daily rows for the last `days` days plus all-time totals by model and by source."""
+        cutoff = (datetime.now(timezone.utc).date() - timedelta(days=days)).isoformat()
+        with self.lock:
+            conn = self.connection()
+            totals = """
+                SELECT {key}, SUM(sessions) AS sessions, SUM(ended_sessions) AS ended_sessions,
+                       SUM(messages) AS messages, SUM(input_tokens) AS input_tokens,
+                       SUM(output_tokens) AS output_tokens, ROUND(SUM(cost_usd), 4) AS cost_usd
+                FROM rollup {where}
+            """
+            return {
+                "daily": [dict(r) for r in conn.execute("""
+                    SELECT day, model, source, sessions, ended_sessions, messages,
+                           input_tokens, output_tokens, ROUND(cost_usd, 4) AS cost_usd
+                    FROM rollup
+                    WHERE day >= ? AND day != 'unknown'
+                    ORDER BY day DESC, model, source
+                """, (cutoff,))],
+                "by_model": [dict(r) for r in conn.execute(
+                    totals.format(key="model", where="GROUP BY model ORDER BY cost_usd DESC"))],
+                "by_source": [dict(r) for r in conn.execute(
+                    totals.format(key="source", where="GROUP BY source ORDER BY cost_usd DESC"))],
+                "total": dict(conn.execute(totals.format(key="'all' AS scope", where=""))
+                              .fetchone()),
+            }
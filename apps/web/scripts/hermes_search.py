@@ -0,0 +1,169 @@
+"""
+Full-text search over Hermes messages for hermes-bridge.py.
+
+state.db is read-only to the bridge, so the FTS5 index lives in a side-car
+SQLite file. SearchIndex.update() copies only messages with an id above the
+last one indexed (messages.id is AUTOINCREMENT, so ids are never reused),
+in batches that each take the state.db read lock briefly. search() ranks
+matching messages with bm25, groups them by session and returns the best
+sessions with highlighted snippets — an index lookup, never a scan of
+`messages`.
+
+Messages are assumed append-only; if state.db's highest id falls below the
+watermark (the database was replaced or reset) the index is rebuilt.
+"""
+import re
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+# Messages copied per state.db read while catching up
+INDEX_BATCH = 5000
+
+# Matching messages ranked per search before grouping them by session, and
+# how many snippets each session result carries.
+CANDIDATES_PER_RESULT = 10
+MAX_CANDIDATES = 2000
+SNIPPETS_PER_SESSION = 3
+
+# Snippet markup around matched terms, and words of context per snippet
+SNIPPET_OPEN = "[["
+SNIPPET_CLOSE = "]]"
+SNIPPET_TOKENS = 16
+
+SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS message_fts USING fts5(
+    content,
+    session_id UNINDEXED,
+    role UNINDEXED,
+    tokenize = 'porter unicode61 remove_diacritics 2'
+);
+CREATE TABLE IF NOT EXISTS index_state (key TEXT PRIMARY KEY, value);
+"""
+
+_TERM = re.compile(r'[^\s"]+')
+
+
+def match_expression(query):
+    """
+    Free text -> FTS5 MATCH expression: every word must appear (AND), each
+    quoted so punctuation can't become FTS syntax; a trailing * on a word
+    keeps prefix matching ("deplo*").
+    """
+    terms = []
+    for word in _TERM.findall(query):
+        prefix = word.endswith("*")
+        word = word.rstrip("*")
+        if word:
+            terms.append(f'"{word}"' + ("*" if prefix else ""))
+    return " ".join(terms)
+
+
+class SearchIndex:
+    """Thread-safe: the side-car connection is guarded by its own lock."""
+
+    def __init__(self, path, source):
+        self.path = Path(path)
+        self.source = source  # HermesDB over state.db
+        self.lock = threading.Lock()
+        self.conn = None
+
+    def connection(self):
+        if self.conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self.conn = sqlite3.connect(str(self.path), check_same_thread=False)
+            self.conn.row_factory = sqlite3.Row
+            self.conn.execute("PRAGMA journal_mode = WAL")
+            self.conn.execute("PRAGMA synchronous = NORMAL")
+            self.conn.executescript(SCHEMA)
+        return self.conn
+
+    def watermark(self):
+        row = self.connection().execute(
+            "SELECT value FROM index_state WHERE key = 'last_message_id'").fetchone()
+        return row[0] if row else 0
+
+    def _reset(self):
+        conn = self.connection()
+        with conn:
+            conn.execute("DELETE FROM message_fts")
+            conn.execute("DELETE FROM index_state")
+
+    def update(self):
+        """Indexes messages added since the last call. Returns how many."""
+        with self.lock:
+            last = self.watermark()
+            newest = self.source.query("search_newest", "SELECT MAX(id) FROM messages")[0][0] or 0
+            if newest < last:
+                self._reset()  # state.db was replaced: start over
+                last = 0
+            added = 0
+            conn = self.connection()
+            while last < newest:
+                rows = self.source.query("search_index", """
+                    SELECT id, session_id, role, content FROM messages
+                    WHERE id > ? ORDER BY id LIMIT ?
+                """, (last, INDEX_BATCH))
+                if not rows:
+                    break
+                with conn:
+                    conn.executemany(
+                        "INSERT INTO message_fts (rowid, content, session_id, role) VALUES (?, ?, ?, ?)",
+                        [(r["id"], str(r["content"]), r["session_id"], r["role"])
+                         for r in rows if r["content"]])
+                    last = rows[-1]["id"]
+                    conn.execute("INSERT OR REPLACE INTO index_state VALUES ('last_message_id', ?)", (last,))
+                added += len(rows)
+            return added
+
+    def search(self, query, limit=20):
+        """
+        Sessions whose messages match `query`, best first. Raises ValueError
+        on an empty query.
+        """
+        expression = match_expression(query)
+        if not expression:
+            raise ValueError("empty search query")
+        start = time.perf_counter()
+        with self.lock:
+            hits = self.connection().execute(f"""
+                SELECT rowid AS message_id, session_id, role, bm25(message_fts) AS score,
+                       snippet(message_fts, 0, ?, ?, '…', {int(SNIPPET_TOKENS)}) AS snippet
+                FROM message_fts
+                WHERE message_fts MATCH ?
+                ORDER BY rank
+                LIMIT ?
+            """, (SNIPPET_OPEN, SNIPPET_CLOSE, expression,
+                  min(MAX_CANDIDATES, limit * CANDIDATES_PER_RESULT))).fetchall()
+            indexed_through = self.watermark()
+
+        sessions = {}
+        for hit in hits:  # best first, so the first hit sets a session's score
+            entry = sessions.setdefault(hit["session_id"], {
+                "session_id": hit["session_id"],
+                "score": round(-hit["score"], 6),  # bm25: lower is better
+                "hits": 0,
+                "snippets": [],
+            })
+            entry["hits"] += 1
+            if len(entry["snippets"]) < SNIPPETS_PER_SESSION:
+                entry["snippets"].append({"message_id": hit["message_id"], "role": hit["role"],
+                                          "text": hit["snippet"]})
+        results = list(sessions.values())[:limit]
+
+        if results:
+            ids = [r["session_id"] for r in results]
+            meta = {r["session_id"]: dict(r) for r in self.source.query("search_sessions", f"""
+                SELECT id AS session_id, source, title, model, started_at, ended_at
+                FROM sessions WHERE id IN ({",".join("?" * len(ids))})
+            """, ids)}
+            for r in results:
+                r.update(meta.get(r["session_id"], {}))
+
+        return {
+            "query": query,
+            "results": results,
+            "indexed_through": indexed_through,
+            "search_ms": round((time.perf_counter() - start) * 1000, 2),
+        }
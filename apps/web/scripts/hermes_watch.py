@@ -0,0 +1,134 @@
+"""
+File-change watchers for hermes-bridge.py --watch.
+
+open_watcher() returns an inotify watcher on Linux (via ctypes, no extra
+dependencies) and a stat-polling watcher elsewhere or when inotify isn't
+available. Both expose the same interface: add(dir) and read(timeout),
+which blocks until something changes (or the timeout passes) and returns
+the set of changed paths. A watched directory itself appears in the set
+when changes may have been missed (inotify queue overflow) and the caller
+should rescan it.
+"""
+import ctypes
+import os
+import select
+import struct
+import time
+from pathlib import Path
+
+# inotify(7) event masks
+IN_MODIFY = 0x002
+IN_CLOSE_WRITE = 0x008
+IN_MOVED_FROM = 0x040
+IN_MOVED_TO = 0x080
+IN_CREATE = 0x100
+IN_DELETE = 0x200
+IN_Q_OVERFLOW = 0x4000
+WATCH_MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+
+_EVENT = struct.Struct("iIII")
+
+# Events arriving this soon after the first are folded into the same batch
+DEBOUNCE = 0.05
+
+
+class Inotify:
+
+    def __init__(self):
+        self.libc = ctypes.CDLL(None, use_errno=True)
+        self.fd = self.libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.dirs = {}
+
+    def add(self, path):
+        wd = self.libc.inotify_add_watch(self.fd, os.fsencode(str(path)), WATCH_MASK)
+        if wd < 0:
+            raise OSError(ctypes.get_errno(), f"inotify_add_watch failed for {path}")
+        self.dirs[wd] = Path(path)
+
+    def _drain(self, changed):
+        while True:
+            try:
+                buf = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                return
+            i = 0
+            while i < len(buf):
+                wd, mask, _, length = _EVENT.unpack_from(buf, i)
+                name = buf[i + _EVENT.size:i + _EVENT.size + length].rstrip(b"\0")
+                i += _EVENT.size + length
+                if mask & IN_Q_OVERFLOW:
+                    changed.update(self.dirs.values())  # missed events: rescan all
+                elif wd in self.dirs and name:
+                    changed.add(self.dirs[wd] / os.fsdecode(name))
+
+    def read(self, timeout):
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return set()
+        changed = set()
+        self._drain(changed)
+        time.sleep(DEBOUNCE)
+        self._drain(changed)
+        return changed
+
+    def close(self):
+        os.close(self.fd)
+
+
+class Poller:
+    """Fallback: stat every file in the watched directories each interval."""
+
+    def __init__(self, interval=1.0):
+        self.interval = interval
+        self.dirs = []
+        self.seen = {}
+
+    def _scan(self):
+        state = {}
+        for path in self.dirs:
+            try:
+                with os.scandir(path) as entries:
+                    for e in entries:
+                        try:
+                            st = e.stat()
+                        except OSError:
+                            continue
+                        state[Path(e.path)] = (st.st_ino, st.st_mtime_ns, st.st_size)
+            except OSError:
+                continue
+        return state
+
+    def add(self, path):
+        self.dirs.append(Path(path))
+        self.seen = self._scan()
+
+    def read(self, timeout):
+        deadline = time.monotonic() + timeout
+        while True:
+            time.sleep(max(0.0, min(self.interval, deadline - time.monotonic())))
+            state = self._scan()
+            changed = {p for p in state.keys() | self.seen.keys() if state.get(p) != self.seen.get(p)}
+            self.seen = state
+            if changed or time.monotonic() >= deadline:
+                return changed
+
+    def close(self):
+        pass
+
+
+def open_watcher(paths, poll_interval=1.0, use_inotify=True):
+    """Watcher over the existing directories in `paths`."""
+    watcher = None
+    if use_inotify:
+        try:
+            watcher = Inotify()
+        except (OSError, AttributeError):
+            watcher = None  # not Linux, or inotify unavailable
+    if watcher is None:
+        watcher = Poller(poll_interval)
+    for path in paths:
+        if Path(path).is_dir():
+            watcher.add(path)
+    return watcher
@@ -0,0 +1,95 @@
+"""
+Hit-probability model for LinkedIn enrichment queries.
+
+linkedin_scrape.py --budget uses this to spend a fixed number of Serper
+credits on the queries most likely to find a profile. The model is a
+smoothed naive-Bayes style estimate learned from rows we've already
+searched: a base hit rate per query variant (strict / loose, taken from
+the local journal's prior outcomes when available), scaled by how much
+better or worse than average each feature has done:
+
+  - sport
+  - graduation-year bucket (5-year bins)
+  - name rarity (how many searched alumni share the last name)
+"""
+from collections import defaultdict
+
+# Pseudo-counts pulling sparse buckets toward the overall rate
+SMOOTHING = 20
+
+# Probabilities are clipped to this range so one feature can't zero a query
+MIN_P, MAX_P = 0.01, 0.99
+
+
+def year_bucket(year):
+    return (year // 5) * 5 if year else None
+
+
+def last_name(full_name):
+    parts = (full_name or '').lower().split()
+    return parts[-1] if parts else ''
+
+
+def rarity_bucket(count):
+    """Last-name frequency among searched alumni: unique / rare / common."""
+    if count <= 1:
+        return 'unique'
+    if count <= 5:
+        return 'rare'
+    return 'common'
+
+
+class HitRateModel:
+
+    def __init__(self):
+        self.hits = 0
+        self.total = 0
+        # feature name -> value -> [hits, total]
+        self.buckets = defaultdict(lambda: defaultdict(lambda: [0, 0]))
+        self.name_counts = defaultdict(int)
+        # variant -> base hit rate; falls back to the overall DB rate
+        self.variant_rates = {}
+
+    @classmethod
+    def fit(cls, searched, variant_outcomes=None):
+        """
+        searched: iterable of alumni rows with a non-NULL linkedin_url
+        (non-empty = hit, '' = miss). variant_outcomes: optional
+        {variant: (found, attempted)} from the enrichment journal.
+        """
+        model = cls()
+        rows = []
+        for row in searched:
+            model.name_counts[last_name(row.get('full_name'))] += 1
+            rows.append((row.get('sport'), year_bucket(row.get('graduation_year')),
+                         last_name(row.get('full_name')), bool(row.get('linkedin_url'))))
+
+        for sport, year, name, hit in rows:
+            model.hits += hit
+            model.total += 1
+            rarity = rarity_bucket(model.name_counts[name])
+            for feature, value in (('sport', sport), ('year', year), ('rarity', rarity)):
+                bucket = model.buckets[feature][value]
+                bucket[0] += hit
+                bucket[1] += 1
+
+        for variant, (found, attempted) in (variant_outcomes or {}).items():
+            if attempted:
+                model.variant_rates[variant] = (found + SMOOTHING * model.base_rate()) / (attempted + SMOOTHING)
+        return model
+
+    def base_rate(self):
+        return (self.hits + 1) / (self.total + 2)
+
+    def _factor(self, feature, value):
+        hits, total = self.buckets[feature].get(value, (0, 0))
+        base = self.base_rate()
+        return ((hits + SMOOTHING * base) / (total + SMOOTHING)) / base
+
+    def probability(self, person, variant):
+        """Estimated chance that `variant` search for `person` finds a profile."""
+        p = self.variant_rates.get(variant, self.base_rate())
+        p *= self._factor('sport', person.get('sport'))
+        p *= self._factor('year', year_bucket(person.get('graduation_year')))
+        p *= self._factor('rarity', rarity_bucket(self.name_counts.get(last_name(person.get('full_name')), 0)))
+        return min(MAX_P, max(MIN_P, p))
@@ -0,0 +1,112 @@
+"""
+Multi-pattern industry classifier for LinkedIn enrichment.
+
+Builds an Aho-Corasick automaton over a keyword -> industry taxonomy once,
+then classifies any text in a single pass regardless of how many keywords
+there are. Matches must sit on word boundaries ('apple' doesn't fire inside
+'pineapple', 'ey' doesn't fire inside 'key'); a keyword ending in '*' may
+be followed by more letters ('pharma*' matches 'pharmaceuticals'). When
+several keywords match, the longest wins, then the earliest in the text,
+then the one listed first in the taxonomy.
+
+A taxonomy file is JSON mapping industry -> list of keywords:
+
+    {"Finance": ["goldman sachs", "jpmorgan*"], "Law": ["llp", "skadden"]}
+"""
+import json
+from collections import deque
+
+
+def _is_word_char(ch):
+    return ch.isalnum()
+
+
+class IndustryClassifier:
+
+    def __init__(self, taxonomy):
+        """
+        taxonomy: dict of keyword -> industry (insertion order breaks ties).
+        Keywords are lowercased and stripped; surrounding spaces used as
+        crude boundaries in older tables (' llp', 'ey ') are redundant here.
+        """
+        self.patterns = []  # (keyword, industry, allow_suffix)
+        seen = set()
+        for keyword, industry in taxonomy.items():
+            keyword = keyword.strip().lower()
+            allow_suffix = keyword.endswith('*')
+            keyword = keyword.rstrip('*').strip()
+            if not keyword or keyword in seen:
+                continue
+            seen.add(keyword)
+            self.patterns.append((keyword, industry, allow_suffix))
+        self._build()
+
+    @classmethod
+    def from_file(cls, path):
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+        taxonomy = {}
+        for industry, keywords in data.items():
+            for keyword in keywords:
+                taxonomy.setdefault(keyword, industry)
+        return cls(taxonomy)
+
+    def _build(self):
+        # goto[state] maps char -> next state; out[state] lists pattern ids
+        self.goto = [{}]
+        self.fail = [0]
+        self.out = [[]]
+        for idx, (keyword, _, _) in enumerate(self.patterns):
+            state = 0
+            for ch in keyword:
+                nxt = self.goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(self.goto)
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.out.append([])
+                    self.goto[state][ch] = nxt
+                state = nxt
+            self.out[state].append(idx)
+
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self.goto[state].items():
+                queue.append(nxt)
+                f = self.fail[state]
+                while f and ch not in self.goto[f]:
+                    f = self.fail[f]
+                self.fail[nxt] = self.goto[f].get(ch, 0)
+                self.out[nxt] = self.out[nxt] + self.out[self.fail[nxt]]
+
+    def matches(self, text):
+        """Yields (start, end, pattern_id) for every boundary-respecting match."""
+        text = text.lower()
+        n = len(text)
+        state = 0
+        for i, ch in enumerate(text):
+            while state and ch not in self.goto[state]:
+                state = self.fail[state]
+            state = self.goto[state].get(ch, 0)
+            for idx in self.out[state]:
+                keyword, _, allow_suffix = self.patterns[idx]
+                start = i - len(keyword) + 1
+                end = i + 1
+                if _is_word_char(keyword[0]) and start > 0 and _is_word_char(text[start - 1]):
+                    continue
+                if (not allow_suffix and _is_word_char(keyword[-1])
+                        and end < n and _is_word_char(text[end])):
+                    continue
+                yield start, end, idx
+
+    def classify(self, text):
+        """Industry of the best match in `text`, or None."""
+        if not text:
+            return None
+        best = None
+        for start, end, idx in self.matches(text):
+            key = (-(end - start), start, idx)
+            if best is None or key < best:
+                best = key
+        return self.patterns[best[2]][1] if best else None
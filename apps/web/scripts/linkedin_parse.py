@@ -0,0 +1,379 @@
+"""
+Parsers that turn Serper search results into LinkedIn enrichment fields.
+
+Shared by linkedin_scrape.py (live passes, --offline, --refresh) and
+bench_linkedin_parse.py. Pure functions with no env or network
+dependencies. Every regex is compiled once at import. A result title is
+split into name / role / company in a single scan, and every organic
+result is scored against the person instead of taking the first
+LinkedIn link.
+"""
+import os
+import re
+
+from industry_classifier import IndustryClassifier
+
+# ==========================================
+# INDUSTRY MAPPING
+# ==========================================
+
+# Map common companies to industries. Keywords match on word boundaries
+# ('apple' won't fire inside 'pineapple'); a trailing '*' also matches longer
+# words ('pharma*' -> 'pharmaceuticals'), so it is only used on stems whose
+# every continuation stays in the industry — 'hospital*' would also catch
+# 'hospitality', so such words list their forms. The longest match wins.
+# Set INDUSTRY_TAXONOMY_PATH to a JSON {industry: [keywords]} file to
+# classify with an external taxonomy instead.
+COMPANY_TO_INDUSTRY = {
+    # Finance
+    'goldman sachs': 'Finance',
+    'morgan stanley': 'Finance',
+    'jpmorgan*': 'Finance',
+    'jp morgan': 'Finance',
+    'blackstone': 'Finance',
+    'blackrock': 'Finance',
+    'citadel': 'Finance',
+    'jane street': 'Finance',
+    'two sigma': 'Finance',
+    'bank of america': 'Finance',
+    'citi': 'Finance',
+    'citibank': 'Finance',
+    'citigroup': 'Finance',
+    'barclays': 'Finance',
+    'credit suisse': 'Finance',
+    'ubs': 'Finance',
+    'deutsche bank': 'Finance',
+    'hsbc': 'Finance',
+    'wells fargo': 'Finance',
+    'fidelity': 'Finance',
+    'vanguard': 'Finance',
+    'bridgewater': 'Finance',
+    'point72': 'Finance',
+    'capital one': 'Finance',
+    'lazard': 'Finance',
+    'evercore': 'Finance',
+    'centerview': 'Finance',
+    'moelis': 'Finance',
+    'rothschild': 'Finance',
+    'guggenheim': 'Finance',
+    'pimco': 'Finance',
+    'kkr': 'Finance',
+    'carlyle': 'Finance',
+    'apollo': 'Finance',
+    'tpg': 'Finance',
+    'warburg': 'Finance',
+    'general atlantic': 'Finance',
+    'silver lake': 'Finance',
+    'hellman': 'Finance',
+    'bain capital': 'Finance',
+    'advent': 'Finance',
+    'vista equity': 'Finance',
+    'thoma bravo': 'Finance',
+    
+    # Consulting
+    'mckinsey': 'Consulting',
+    'bain & company': 'Consulting',
+    'bain and company': 'Consulting',
+    'bcg': 'Consulting',
+    'boston consulting': 'Consulting',
+    'deloitte': 'Consulting',
+    'pwc': 'Consulting',
+    'kpmg': 'Consulting',
+    'ernst & young': 'Consulting',
+    'ey': 'Consulting',
+    'accenture': 'Consulting',
+    'booz allen': 'Consulting',
+    'oliver wyman': 'Consulting',
+    'strategy&': 'Consulting',
+    'parthenon': 'Consulting',
+    'lek consulting': 'Consulting',
+    'altman solon': 'Consulting',
+    'alvarez': 'Consulting',
+    'huron': 'Consulting',
+    
+    # Technology
+    'google': 'Technology',
+    'meta': 'Technology',
+    'facebook': 'Technology',
+    'amazon': 'Technology',
+    'apple': 'Technology',
+    'microsoft': 'Technology',
+    'netflix': 'Technology',
+    'uber': 'Technology',
+    'lyft': 'Technology',
+    'airbnb': 'Technology',
+    'stripe': 'Technology',
+    'openai': 'Technology',
+    'anthropic': 'Technology',
+    'nvidia': 'Technology',
+    'salesforce': 'Technology',
+    'oracle': 'Technology',
+    'ibm': 'Technology',
+    'intel': 'Technology',
+    'cisco': 'Technology',
+    'adobe': 'Technology',
+    'palantir': 'Technology',
+    'databricks': 'Technology',
+    'snowflake': 'Technology',
+    'doordash': 'Technology',
+    'instacart': 'Technology',
+    'robinhood': 'Technology',
+    'coinbase': 'Technology',
+    'plaid': 'Technology',
+    'figma': 'Technology',
+    'notion': 'Technology',
+    'slack': 'Technology',
+    'zoom': 'Technology',
+    'dropbox': 'Technology',
+    'spotify': 'Technology',
+    'twitter': 'Technology',
+    'linkedin': 'Technology',
+    'snap': 'Technology',
+    'snapchat': 'Technology',
+    'pinterest': 'Technology',
+    'reddit': 'Technology',
+    'tiktok': 'Technology',
+    'bytedance': 'Technology',
+    'samsung': 'Technology',
+    'sony': 'Technology',
+    'software': 'Technology',
+    'engineer': 'Technology',
+    'engineers': 'Technology',
+    'engineering': 'Technology',
+    'developer': 'Technology',
+    
+    # Healthcare
+    'pfizer': 'Healthcare',
+    'johnson & johnson': 'Healthcare',
+    'merck': 'Healthcare',
+    'unitedhealth*': 'Healthcare',
+    'cvs': 'Healthcare',
+    'hospital': 'Healthcare',
+    'hospitals': 'Healthcare',
+    'medical': 'Healthcare',
+    'healthcare': 'Healthcare',
+    'health system': 'Healthcare',
+    'physician': 'Healthcare',
+    'doctor': 'Healthcare',
+    'nurse': 'Healthcare',
+    'pharma*': 'Healthcare',
+    'biotech*': 'Healthcare',
+    'abbvie': 'Healthcare',
+    'amgen': 'Healthcare',
+    'gilead': 'Healthcare',
+    'regeneron': 'Healthcare',
+    'moderna': 'Healthcare',
+    'biogen': 'Healthcare',
+    
+    # Law
+    'law firm': 'Law',
+    'legal': 'Law',
+    'attorney': 'Law',
+    'lawyer': 'Law',
+    'llp': 'Law',
+    'skadden': 'Law',
+    'sullivan & cromwell': 'Law',
+    'cravath': 'Law',
+    'wachtell': 'Law',
+    'kirkland': 'Law',
+    'latham': 'Law',
+    'davis polk': 'Law',
+    'simpson thacher': 'Law',
+    'paul weiss': 'Law',
+    'cleary gottlieb': 'Law',
+    'weil gotshal': 'Law',
+    'gibson dunn': 'Law',
+    'sidley': 'Law',
+    'jones day': 'Law',
+    'white & case': 'Law',
+    'wilmerhale': 'Law',
+    'debevoise': 'Law',
+    'covington': 'Law',
+    
+    # Media & Sports
+    'disney': 'Media',
+    'warner*': 'Media',
+    'nbc': 'Media',
+    'cbs': 'Media',
+    'espn': 'Media',
+    'fox sports': 'Media',
+    'nfl': 'Media',
+    'nba': 'Media',
+    'mlb': 'Media',
+    'nhl': 'Media',
+    'mls': 'Media',
+    'sports': 'Media',
+    'athletic': 'Media',
+    'athletics': 'Media',
+    'coach': 'Media',
+    'coaches': 'Media',
+    'coaching': 'Media',
+    'journalist': 'Media',
+    'reporter': 'Media',
+    'news': 'Media',
+    'media': 'Media',
+    'entertainment': 'Media',
+    'paramount': 'Media',
+    'comcast': 'Media',
+    'viacom': 'Media',
+}
+
+# Compiled once at import; classify() is a single pass over the text
+INDUSTRY_TAXONOMY_PATH = os.environ.get('INDUSTRY_TAXONOMY_PATH')
+industry_classifier = (
+    IndustryClassifier.from_file(INDUSTRY_TAXONOMY_PATH) if INDUSTRY_TAXONOMY_PATH
+    else IndustryClassifier(COMPANY_TO_INDUSTRY)
+)
+
+# ==========================================
+# RESULT PARSING
+# ==========================================
+
+# Trailing " | LinkedIn" (and anything after it) on result titles
+_LINKEDIN_SUFFIX_RE = re.compile(r'\s*\|\s*LinkedIn.*$', re.IGNORECASE)
+
+# Title separators, matched in one alternation: a dash between name / role /
+# company segments, or "at" / "@" between role and company
+_TITLE_SEP_RE = re.compile(r'\s+(?:(?P<dash>[-\u2013\u2014])|(?P<at>at|@))\s+', re.IGNORECASE)
+
+_LOCATION_RES = (
+    re.compile(r'((?:Greater\s+)?[A-Z][a-z]+(?:\s+[A-Z][a-z]+)?\s*,\s*[A-Z]{2})\s+'),  # City, ST
+    re.compile(r'(New York|San Francisco|Los Angeles|Chicago|Boston|Seattle|Austin|Denver|Miami|Atlanta)'),
+)
+
+_WORD_RE = re.compile(r"[^\W\d_]+")
+
+MAX_FIELD_LENGTH = 100
+
+
+def tokenize_title(title):
+    """
+    Splits a LinkedIn result title into (name, role, company) in one scan.
+    Handles "Name - Role at Company | LinkedIn", "Name - Role @ Company"
+    and "Name - Role - Company". Role and company are None when the title
+    has no dash after the name.
+    """
+    return _split_title(_LINKEDIN_SUFFIX_RE.sub('', title))
+
+
+def _split_title(title):
+    """tokenize_title for a title already stripped of its LinkedIn suffix."""
+    name = role = company = None
+    state = 'name'
+    seg_start = 0
+    for m in _TITLE_SEP_RE.finditer(title):
+        segment = title[seg_start:m.start()]
+        if state == 'name':
+            if m.group('dash'):
+                name, state, seg_start = segment, 'role', m.end()
+        elif state == 'role':
+            role = segment
+            state, seg_start = ('company_at' if m.group('at') else 'company_dash'), m.end()
+        elif state == 'company_at' and m.group('dash'):
+            # "Role at Company - Location": the dash ends the company
+            company, state = segment, 'done'
+            break
+        elif state == 'company_dash' and m.group('dash'):
+            company, state = segment, 'done'
+            break
+
+    tail = title[seg_start:]
+    if state == 'name':
+        name = tail
+    elif state == 'role':
+        role = tail
+    elif state in ('company_at', 'company_dash'):
+        company = tail
+
+    role = (role or '').strip()[:MAX_FIELD_LENGTH] or None
+    company = (company or '').strip()[:MAX_FIELD_LENGTH] or None
+    return (name or '').strip(), role, company
+
+
+def extract_role_company(title, name):
+    """
+    Extracts role and company from LinkedIn title.
+    Title format is usually: "Name - Role at Company | LinkedIn"
+    """
+    _, role, company = tokenize_title(title)
+    return role, company
+
+
+def extract_location(snippet):
+    """
+    Tries to extract location from the snippet.
+    """
+    for pattern in _LOCATION_RES:
+        match = pattern.search(snippet)
+        if match:
+            return match.group(1).strip()
+    return None
+
+
+def determine_industry(company, title, snippet):
+    """
+    Determines industry based on company name and context.
+    """
+    if not company:
+        text = f"{title} {snippet}"
+    else:
+        text = company
+
+    return industry_classifier.classify(text)
+
+
+def score_result(result, name, sport=None, rank=0):
+    """
+    How well one organic result fits the person, or None if it can't be
+    theirs (not a profile URL, or no part of their name in the title).
+    Returns (score, parsed fields).
+    """
+    link = result.get('link', '')
+    if 'linkedin.com/in/' not in link:
+        return None
+
+    # Without the " | LinkedIn" suffix, which would otherwise classify
+    # every company-less profile as Technology
+    title = _LINKEDIN_SUFFIX_RE.sub('', result.get('title', ''))
+    snippet = result.get('snippet', '')
+    title_name, role, company = _split_title(title)
+
+    wanted = {t for t in _WORD_RE.findall(name.lower()) if len(t) > 1}
+    found = set(_WORD_RE.findall((title_name or title).lower()))
+    overlap = len(wanted & found) / len(wanted) if wanted else 0
+    if not overlap:
+        return None
+
+    text = f"{title} {snippet}".lower()
+    score = overlap * 10
+    if 'cornell' in text:
+        score += 3
+    if sport:
+        sport_words = {t for t in _WORD_RE.findall(sport.lower()) if len(t) > 3 and t not in ('mens', 'womens')}
+        if sport_words & set(_WORD_RE.findall(text)):
+            score += 1
+    if role or company:
+        score += 1
+    score -= rank * 0.1  # prefer the search engine's order on ties
+
+    return score, {
+        'linkedin_url': link,
+        'role': role,
+        'company': company,
+        'location': extract_location(snippet),
+        'industry': determine_industry(company, title, snippet),
+    }
+
+
+def parse_search_results(data, name, sport=None):
+    """
+    Parses Serper search results to extract LinkedIn info.
+    Scores every organic result and returns the best profile match as a
+    dict with linkedin_url, role, company, location, industry — or None.
+    """
+    best = None
+    for rank, result in enumerate(data.get('organic') or []):
+        scored = score_result(result, name, sport, rank)
+        if scored and (best is None or scored[0] > best[0]):
+            best = scored
+    return best[1] if best else None
@@ -1,9 +1,21 @@
-import requests
+import heapq
+import math
 import time
-import re
 import os
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait
+from datetime import datetime, timezone
+from itertools import chain, islice
 from supabase import create_client
 
+import profiling
+from enrichment_journal import EnrichmentJournal
+from enrichment_metrics import RunMetrics
+from enrichment_policy import decide_refresh, refresh_priority
+from hit_model import HitRateModel
+from linkedin_parse import parse_search_results
+from serper_cache import SearchCache
+from serper_client import SERPER_ENDPOINT, SerperBatchError, SerperClient, SerperError
+
 # ==========================================
 # CONFIGURATION
 # ==========================================
@@ -11,407 +23,809 @@ from supabase import create_client
 # Credentials — read from the environment, never hard-code.
 # Export before running:
 #   export SERPER_API_KEY=... SUPABASE_URL=... SUPABASE_SERVICE_ROLE_KEY=...
-SERPER_API_KEY = os.environ["SERPER_API_KEY"]
+# SERPER_API_KEY is only needed when searching; --offline runs without it.
+SERPER_API_KEY = os.environ.get("SERPER_API_KEY", "")
 
 # Supabase credentials
 SUPABASE_URL = os.environ["SUPABASE_URL"]
 SUPABASE_SERVICE_KEY = os.environ["SUPABASE_SERVICE_ROLE_KEY"]
 
-DELAY_BETWEEN_CALLS = 0.5
+# Serper plan limits — requests per second across all workers, and how many
+# searches may be in flight at once. Override via env for bigger plans.
+SERPER_QPS = float(os.environ.get('SERPER_QPS', 5))
+MAX_WORKERS = int(os.environ.get('SERPER_WORKERS', 8))
 
-# ==========================================
-# INDUSTRY MAPPING
-# ==========================================
+# Queries packed into one Serper POST. 1 disables batching.
+SERPER_BATCH_SIZE = int(os.environ.get('SERPER_BATCH_SIZE', 10))
+
+# Search endpoint — point at serper_mock.py (e.g. http://127.0.0.1:8765/search)
+# to run without a live key.
+SERPER_ENDPOINT = os.environ.get('SERPER_ENDPOINT', SERPER_ENDPOINT)
+
+serper = SerperClient(SERPER_API_KEY, qps=SERPER_QPS, endpoint=SERPER_ENDPOINT)
+
+# Raw search results are cached locally so reruns and --offline reparses
+# don't pay for the same query twice.
+SERPER_CACHE_PATH = os.environ.get('SERPER_CACHE_PATH', 'serper_cache.sqlite3')
+SERPER_CACHE_TTL_DAYS = float(os.environ.get('SERPER_CACHE_TTL_DAYS', 30))
+
+cache = SearchCache(SERPER_CACHE_PATH, ttl_days=SERPER_CACHE_TTL_DAYS)
+
+# Columns the enrichment writes back to `alumni`
+ENRICH_FIELDS = ('linkedin_url', 'role', 'company', 'industry', 'location')
 
-# Map common companies to industries
-COMPANY_TO_INDUSTRY = {
-    # Finance
-    'goldman sachs': 'Finance',
-    'morgan stanley': 'Finance',
-    'jpmorgan': 'Finance',
-    'jp morgan': 'Finance',
-    'blackstone': 'Finance',
-    'blackrock': 'Finance',
-    'citadel': 'Finance',
-    'jane street': 'Finance',
-    'two sigma': 'Finance',
-    'bank of america': 'Finance',
-    'citi': 'Finance',
-    'citibank': 'Finance',
-    'barclays': 'Finance',
-    'credit suisse': 'Finance',
-    'ubs': 'Finance',
-    'deutsche bank': 'Finance',
-    'hsbc': 'Finance',
-    'wells fargo': 'Finance',
-    'fidelity': 'Finance',
-    'vanguard': 'Finance',
-    'bridgewater': 'Finance',
-    'point72': 'Finance',
-    'capital one': 'Finance',
-    'lazard': 'Finance',
-    'evercore': 'Finance',
-    'centerview': 'Finance',
-    'moelis': 'Finance',
-    'rothschild': 'Finance',
-    'guggenheim': 'Finance',
-    'pimco': 'Finance',
-    'kkr': 'Finance',
-    'carlyle': 'Finance',
-    'apollo': 'Finance',
-    'tpg': 'Finance',
-    'warburg': 'Finance',
-    'general atlantic': 'Finance',
-    'silver lake': 'Finance',
-    'hellman': 'Finance',
-    'bain capital': 'Finance',
-    'advent': 'Finance',
-    'vista equity': 'Finance',
-    'thoma bravo': 'Finance',
-    
-    # Consulting
-    'mckinsey': 'Consulting',
-    'bain & company': 'Consulting',
-    'bain and company': 'Consulting',
-    'bcg': 'Consulting',
-    'boston consulting': 'Consulting',
-    'deloitte': 'Consulting',
-    'pwc': 'Consulting',
-    'kpmg': 'Consulting',
-    'ernst & young': 'Consulting',
-    'ey ': 'Consulting',
-    'accenture': 'Consulting',
-    'booz allen': 'Consulting',
-    'oliver wyman': 'Consulting',
-    'strategy&': 'Consulting',
-    'parthenon': 'Consulting',
-    'lek consulting': 'Consulting',
-    'altman solon': 'Consulting',
-    'alvarez': 'Consulting',
-    'huron': 'Consulting',
-    
-    # Technology
-    'google': 'Technology',
-    'meta': 'Technology',
-    'facebook': 'Technology',
-    'amazon': 'Technology',
-    'apple': 'Technology',
-    'microsoft': 'Technology',
-    'netflix': 'Technology',
-    'uber': 'Technology',
-    'lyft': 'Technology',
-    'airbnb': 'Technology',
-    'stripe': 'Technology',
-    'openai': 'Technology',
-    'anthropic': 'Technology',
-    'nvidia': 'Technology',
-    'salesforce': 'Technology',
-    'oracle': 'Technology',
-    'ibm': 'Technology',
-    'intel': 'Technology',
-    'cisco': 'Technology',
-    'adobe': 'Technology',
-    'palantir': 'Technology',
-    'databricks': 'Technology',
-    'snowflake': 'Technology',
-    'doordash': 'Technology',
-    'instacart': 'Technology',
-    'robinhood': 'Technology',
-    'coinbase': 'Technology',
-    'plaid': 'Technology',
-    'figma': 'Technology',
-    'notion': 'Technology',
-    'slack': 'Technology',
-    'zoom': 'Technology',
-    'dropbox': 'Technology',
-    'spotify': 'Technology',
-    'twitter': 'Technology',
-    'linkedin': 'Technology',
-    'snap': 'Technology',
-    'snapchat': 'Technology',
-    'pinterest': 'Technology',
-    'reddit': 'Technology',
-    'tiktok': 'Technology',
-    'bytedance': 'Technology',
-    'samsung': 'Technology',
-    'sony': 'Technology',
-    'software': 'Technology',
-    'engineer': 'Technology',
-    'developer': 'Technology',
-    
-    # Healthcare
-    'pfizer': 'Healthcare',
-    'johnson & johnson': 'Healthcare',
-    'merck': 'Healthcare',
-    'unitedhealth': 'Healthcare',
-    'cvs': 'Healthcare',
-    'hospital': 'Healthcare',
-    'medical': 'Healthcare',
-    'healthcare': 'Healthcare',
-    'health system': 'Healthcare',
-    'physician': 'Healthcare',
-    'doctor': 'Healthcare',
-    'nurse': 'Healthcare',
-    'pharma': 'Healthcare',
-    'biotech': 'Healthcare',
-    'abbvie': 'Healthcare',
-    'amgen': 'Healthcare',
-    'gilead': 'Healthcare',
-    'regeneron': 'Healthcare',
-    'moderna': 'Healthcare',
-    'biogen': 'Healthcare',
-    
-    # Law
-    'law firm': 'Law',
-    'legal': 'Law',
-    'attorney': 'Law',
-    'lawyer': 'Law',
-    ' llp': 'Law',
-    'skadden': 'Law',
-    'sullivan & cromwell': 'Law',
-    'cravath': 'Law',
-    'wachtell': 'Law',
-    'kirkland': 'Law',
-    'latham': 'Law',
-    'davis polk': 'Law',
-    'simpson thacher': 'Law',
-    'paul weiss': 'Law',
-    'cleary gottlieb': 'Law',
-    'weil gotshal': 'Law',
-    'gibson dunn': 'Law',
-    'sidley': 'Law',
-    'jones day': 'Law',
-    'white & case': 'Law',
-    'wilmerhale': 'Law',
-    'debevoise': 'Law',
-    'covington': 'Law',
-    
-    # Media & Sports
-    'disney': 'Media',
-    'warner': 'Media',
-    'nbc': 'Media',
-    'cbs': 'Media',
-    'espn': 'Media',
-    'fox sports': 'Media',
-    'nfl': 'Media',
-    'nba': 'Media',
-    'mlb': 'Media',
-    'nhl': 'Media',
-    'mls': 'Media',
-    'sports': 'Media',
-    'athletic': 'Media',
-    'coach': 'Media',
-    'journalist': 'Media',
-    'reporter': 'Media',
-    'news': 'Media',
-    'media': 'Media',
-    'entertainment': 'Media',
-    'paramount': 'Media',
-    'comcast': 'Media',
-    'viacom': 'Media',
-}
+# Results are buffered and written in bulk once this many rows are pending
+# or the oldest pending row is this many seconds old.
+WRITE_BATCH_SIZE = int(os.environ.get('ENRICH_WRITE_BATCH_SIZE', 200))
+WRITE_FLUSH_SECONDS = float(os.environ.get('ENRICH_WRITE_FLUSH_SECONDS', 5))
+
+# Pending alumni are streamed from the DB in keyset pages of this size
+# (keep it at or below the API's max-rows setting, 1000 by default).
+FETCH_PAGE_SIZE = int(os.environ.get('ENRICH_FETCH_PAGE_SIZE', 1000))
+
+# Every written-back attempt is journaled locally; ids attempted with the
+# same query variant within ENRICH_RETRY_AFTER_DAYS are skipped.
+ENRICH_JOURNAL_PATH = os.environ.get('ENRICH_JOURNAL_PATH', 'enrichment_journal.sqlite3')
+ENRICH_RETRY_AFTER_DAYS = float(os.environ.get('ENRICH_RETRY_AFTER_DAYS', 90))
+
+# --early-stop: skip the loose retry when the strict search already came back
+# with at least this many LinkedIn profiles, none of them this person.
+EARLY_STOP_PROFILES = int(os.environ.get('ENRICH_EARLY_STOP_PROFILES', 3))
+
+# --refresh re-searches at most this many already-enriched alumni per run
+# (one Serper credit each), stalest / most-incomplete first.
+REFRESH_BUDGET = int(os.environ.get('ENRICH_REFRESH_BUDGET', 500))
+
+# Run metrics (latency percentiles, hit rates, credits, errors). A report is
+# written at the end of the run to ENRICH_METRICS_REPORT (.json or .csv;
+# --metrics=path overrides), and ENRICH_PROMETHEUS_PATH (--prometheus=path)
+# is rewritten every few seconds during the run for a textfile collector.
+ENRICH_METRICS_REPORT = os.environ.get('ENRICH_METRICS_REPORT', '')
+ENRICH_PROMETHEUS_PATH = os.environ.get('ENRICH_PROMETHEUS_PATH', '')
+
+metrics = RunMetrics()
+serper.on_request = metrics.observe_serper
 
 # ==========================================
 # HELPER FUNCTIONS
 # ==========================================
 
-def search_linkedin(name, sport=None, loose=False):
+def build_query(name, sport=None, loose=False):
     """
-    Searches Serper.dev for a person's LinkedIn profile.
+    Serper query for one alumnus.
     loose=True uses a broader query (name + Cornell only, no sport).
-    Returns dict with linkedin_url, role, company, location, industry.
     """
     if loose or not sport:
-        query = f'"{name}" Cornell site:linkedin.com/in'
-    else:
-        query = f'"{name}" Cornell {sport} site:linkedin.com/in'
+        return f'"{name}" Cornell site:linkedin.com/in'
+    return f'"{name}" Cornell {sport} site:linkedin.com/in'
 
-    headers = {'X-API-KEY': SERPER_API_KEY, 'Content-Type': 'application/json'}
-    payload = {'q': query, 'num': 3}
 
+def fetch_search_results(queries):
+    """
+    Raw Serper responses for `queries`, aligned by position. Fresh cache
+    entries are reused; the rest go to Serper in one batch and are cached
+    (misses included). Raises if the Serper request fails.
+    """
+    with profiling.span('cache'):
+        results = [cache.get(q) for q in queries]
+    missing = [i for i, data in enumerate(results) if data is None]
+    if len(missing) < len(queries):
+        metrics.observe_cache_hit(len(queries) - len(missing))
+    if missing:
+        with profiling.span('search'):
+            responses = serper.search_batch([{'q': queries[i], 'num': 3} for i in missing])
+        with profiling.span('cache'):
+            for i, data in zip(missing, responses):
+                data = data or {}
+                cache.put(queries[i], data)
+                results[i] = data
+    return results
+
+
+def search_linkedin(name, sport=None, loose=False):
+    """
+    Searches Serper.dev for a person's LinkedIn profile.
+    loose=True uses a broader query (name + Cornell only, no sport).
+    Returns dict with linkedin_url, role, company, location, industry, or
+    None when nothing matched (or the response couldn't be parsed). Raises
+    SerperError if the search itself failed — that's not a miss.
+    """
+    data = fetch_search_results([build_query(name, sport, loose)])[0]
     try:
-        response = requests.post(
-            'https://google.serper.dev/search',
-            headers=headers,
-            json=payload,
-            timeout=10
-        )
-        response.raise_for_status()
-        return parse_search_results(response.json(), name)
+        with profiling.span('parse'):
+            return parse_search_results(data, name, sport)
     except Exception as e:
+        metrics.record_error('parse')
         safe_err = str(e).encode('ascii', 'replace').decode('ascii')
-        print(f"   Error searching for {name.encode('ascii','replace').decode('ascii')}: {safe_err}")
+        print(f"   Error parsing results for {name.encode('ascii','replace').decode('ascii')}: {safe_err}")
         return None
 
 
-def parse_search_results(data, name):
+def search_linkedin_batch(people, loose=False):
     """
-    Parses Serper search results to extract LinkedIn info.
+    Searches for several alumni in one Serper request.
+    Returns a list of results (dict, or None for no match) aligned with
+    `people`.
+    If the batch response is malformed (doesn't line up with the queries),
+    falls back to one search per person so a single bad response doesn't
+    cost the whole batch. A failed request (SerperError after the client's
+    retries) is raised: retrying it per person would only repeat the
+    failure once per query.
     """
-    organic = data.get('organic', [])
-    
-    if not organic:
-        return None
-    
-    # Find the best LinkedIn result
-    for result in organic:
-        link = result.get('link', '')
-        
-        # Make sure it's a LinkedIn profile URL
-        if 'linkedin.com/in/' not in link:
+    queries = [build_query(p['full_name'], p['sport'], loose) for p in people]
+
+    try:
+        responses = fetch_search_results(queries)
+    except SerperBatchError as e:
+        metrics.record_error('batch_fallback')
+        safe_err = str(e).encode('ascii', 'replace').decode('ascii')
+        print(f"   Batch of {len(people)} failed ({safe_err}) — retrying individually")
+        return [search_linkedin(p['full_name'], p['sport'], loose=loose) for p in people]
+
+    results = []
+    for person, data in zip(people, responses):
+        try:
+            with profiling.span('parse'):
+                results.append(parse_search_results(data or {}, person['full_name'], person['sport']))
+        except Exception:
+            metrics.record_error('parse')
+            results.append(None)
+    return results
+
+
+def confidently_negative(data):
+    """
+    True when a strict search that found no match is unlikely to be rescued
+    by the loose query: the results were already a page of LinkedIn
+    profiles, all someone else's. Dropping the sport only broadens the
+    search further, so a loose "hit" there would be the weakest of matches.
+    """
+    profiles = [r for r in (data or {}).get('organic') or [] if 'linkedin.com/in/' in r.get('link', '')]
+    return len(profiles) >= EARLY_STOP_PROFILES
+
+
+def outcome(result):
+    return 'found' if result and result.get('linkedin_url') else 'not_found'
+
+
+def search_cascade_batch(people, early_stop=False):
+    """
+    Strict-then-loose cascade for a batch of alumni: one batched strict
+    search, then one batched loose search for the misses (deduplicated, as
+    several sports of one person share a loose query). Rows already marked
+    '' (an earlier strict miss) go straight to the loose query. With
+    early_stop, misses whose strict results are confidently negative skip
+    the loose query. Returns [(result, attempts)] aligned with `people`,
+    where attempts lists the (variant, outcome) of every query run plus a
+    final ('cascade', outcome).
+    """
+    results = [None] * len(people)
+    attempts = [[] for _ in people]
+
+    strict = [i for i, p in enumerate(people) if p.get('linkedin_url') != '']
+    if strict:
+        for i, result in zip(strict, search_linkedin_batch([people[i] for i in strict], loose=False)):
+            results[i] = result
+            attempts[i].append(('strict', outcome(result)))
+
+    retry = {}
+    for i, person in enumerate(people):
+        if outcome(results[i]) == 'found':
+            continue
+        if early_stop and attempts[i] and confidently_negative(
+                cache.get(build_query(person['full_name'], person['sport']))):
             continue
-        
-        title = result.get('title', '')
-        snippet = result.get('snippet', '')
-        
-        # Extract info from title (usually "Name - Role at Company")
-        role, company = extract_role_company(title, name)
-        
-        # Try to get location from snippet
-        location = extract_location(snippet)
-        
-        # Determine industry from company
-        industry = determine_industry(company, title, snippet)
-        
-        return {
-            'linkedin_url': link,
-            'role': role,
-            'company': company,
-            'location': location,
-            'industry': industry
-        }
-    
-    return None
-
-
-def extract_role_company(title, name):
+        retry.setdefault(build_query(person['full_name'], person['sport'], loose=True), []).append(i)
+    if retry:
+        groups = list(retry.values())
+        for group, result in zip(groups, search_linkedin_batch([people[g[0]] for g in groups], loose=True)):
+            for i in group:
+                results[i] = result
+                attempts[i].append(('loose', outcome(result)))
+
+    return [(result, steps + [('cascade', outcome(result))]) for result, steps in zip(results, attempts)]
+
+
+# ==========================================
+# MAIN EXECUTION
+# ==========================================
+
+class EnrichmentWriter:
     """
-    Extracts role and company from LinkedIn title.
-    Title format is usually: "Name - Role at Company | LinkedIn"
+    Buffers enrichment results and writes them back in bulk.
+
+    Not-found marks share one payload, so they go out as a single
+    `in_('id', ...)` update per chunk; so does any other payload shared by
+    several ids. Distinct found payloads go through the
+    apply_alumni_enrichment RPC (migration 072) in one call, falling back
+    to per-row updates if that call fails. Counts (and journals, when a
+    journal is given) only rows actually written, so found/not_found/errors
+    stay honest and a failed flush is retried next run. An entry's
+    `attempts` ((variant, outcome) pairs) are what gets journaled for it;
+    by default that is the writer's variant and the entry's outcome.
     """
-    role = None
-    company = None
-    
-    # Remove " | LinkedIn" suffix
-    title = re.sub(r'\s*\|\s*LinkedIn.*$', '', title, flags=re.IGNORECASE)
-    
-    # Remove the person's name from the beginning
-    name_parts = name.lower().split()
-    title_lower = title.lower()
-    
-    # Try to find where the name ends and title begins
-    if ' - ' in title:
-        parts = title.split(' - ', 1)
-        if len(parts) > 1:
-            role_company = parts[1]
-            
-            # Split by " at " or " @ "
-            if ' at ' in role_company.lower():
-                role_parts = re.split(r'\s+at\s+', role_company, flags=re.IGNORECASE)
-                role = role_parts[0].strip()
-                if len(role_parts) > 1:
-                    company = role_parts[1].strip()
-            elif ' @ ' in role_company:
-                role_parts = role_company.split(' @ ')
-                role = role_parts[0].strip()
-                if len(role_parts) > 1:
-                    company = role_parts[1].strip()
+
+    # Keeps in_() filters well under URL length limits
+    ID_CHUNK = 200
+
+    def __init__(self, supabase, journal=None, variant=None,
+                 max_rows=WRITE_BATCH_SIZE, max_age=WRITE_FLUSH_SECONDS):
+        self.supabase = supabase
+        self.journal = journal
+        self.variant = variant
+        self.max_rows = max_rows
+        self.max_age = max_age
+        self.pending = []  # (ids, update, is_found, attempts)
+        self.pending_rows = 0
+        self.oldest = None
+        self.found = self.not_found = self.errors = 0
+
+    def add(self, ids, update, found=True, attempts=None):
+        if not ids:
+            return
+        self.pending.append((list(ids), update, found, tuple(attempts or ())))
+        self.pending_rows += len(ids)
+        if self.oldest is None:
+            self.oldest = time.time()
+        if self.pending_rows >= self.max_rows or time.time() - self.oldest >= self.max_age:
+            self.flush()
+
+    def mark_not_found(self, ids, attempts=None):
+        self.add(ids, {'linkedin_url': ''}, found=False, attempts=attempts)
+
+    def _count(self, ids, found, attempts=()):
+        if found:
+            self.found += len(ids)
+        else:
+            self.not_found += len(ids)
+        if self.journal is not None:
+            for variant, result in attempts or [(self.variant, 'found' if found else 'not_found')]:
+                self.journal.record(ids, variant, result)
+
+    def _execute(self, query):
+        """Runs one DB call, recording its latency (and failure kind) in metrics."""
+        started = time.perf_counter()
+        try:
+            with profiling.span('write-back'):
+                result = query.execute()
+        except Exception as e:
+            kind = 'unique_violation' if '23505' in str(e) else type(e).__name__
+            metrics.observe_db(time.perf_counter() - started, error=kind)
+            raise
+        metrics.observe_db(time.perf_counter() - started)
+        return result
+
+    def _update_in(self, ids, update, found, attempts):
+        for i in range(0, len(ids), self.ID_CHUNK):
+            chunk = ids[i:i + self.ID_CHUNK]
+            try:
+                self._execute(self.supabase.table('alumni').update(update).in_('id', chunk))
+                self._count(chunk, found, attempts)
+            except Exception as e:
+                print(f"  DB error ({len(chunk)} rows): {e}")
+                self.errors += len(chunk)
+
+    def flush(self):
+        if not self.pending:
+            return
+        pending, self.pending = self.pending, []
+        self.pending_rows = 0
+        self.oldest = None
+
+        # Merge entries that write the identical payload
+        by_payload = {}
+        for ids, update, found, attempts in pending:
+            key = (tuple(sorted(update.items())), found, attempts)
+            by_payload.setdefault(key, []).extend(ids)
+
+        singles = []
+        for (items, found, attempts), ids in by_payload.items():
+            update = dict(items)
+            if len(ids) > 1:
+                self._update_in(ids, update, found, attempts)
             else:
-                # Maybe just role, no company
-                role = role_company.strip()
-    
-    # Clean up
-    if role and len(role) > 100:
-        role = role[:100]
-    if company and len(company) > 100:
-        company = company[:100]
-    
-    return role, company
-
-
-def extract_location(snippet):
+                singles.append((ids[0], update, found, attempts))
+
+        if not singles:
+            return
+        try:
+            self._execute(self.supabase.rpc('apply_alumni_enrichment', {
+                'updates': [{'id': row_id, **update} for row_id, update, _, _ in singles],
+            }))
+            for row_id, _, found, attempts in singles:
+                self._count([row_id], found, attempts)
+        except Exception as e:
+            # e.g. migration 072 not applied, or one row tripping the
+            # linkedin_url unique index — isolate failures row by row
+            print(f"  Bulk write of {len(singles)} rows failed ({e}) — writing individually")
+            for row_id, update, found, attempts in singles:
+                try:
+                    self._execute(self.supabase.table('alumni').update(update).eq('id', row_id))
+                    self._count([row_id], found, attempts)
+                except Exception as e2:
+                    if '23505' in str(e2) and update.get('linkedin_url'):
+                        # URL already belongs to another row (a duplicate from
+                        # an earlier run): keep the fields, mark as searched
+                        try:
+                            self._execute(self.supabase.table('alumni').update({**update, 'linkedin_url': ''}).eq('id', row_id))
+                            self._count([row_id], found, attempts)
+                            continue
+                        except Exception as e3:
+                            e2 = e3
+                    print(f"  DB error: {e2}")
+                    self.errors += 1
+
+
+def iter_alumni(supabase, columns, where, page_size=FETCH_PAGE_SIZE):
     """
-    Tries to extract location from the snippet.
+    Streams alumni rows matching `where` (a function adding filters to a
+    query) ordered by graduation_year desc, id — one keyset page at a time,
+    so there is no silent row cap and memory stays bounded. Keyset (not
+    offset) paging stays correct while the run rewrites linkedin_url on
+    rows it has already passed. `columns` must include id and
+    graduation_year.
     """
-    # Common location patterns
-    location_patterns = [
-        r'((?:Greater\s+)?[A-Z][a-z]+(?:\s+[A-Z][a-z]+)?\s*,\s*[A-Z]{2})\s+',  # City, ST
-        r'(New York|San Francisco|Los Angeles|Chicago|Boston|Seattle|Austin|Denver|Miami|Atlanta)',
-    ]
-    
-    for pattern in location_patterns:
-        match = re.search(pattern, snippet)
-        if match:
-            return match.group(1).strip()
-    
-    return None
-
-
-def determine_industry(company, title, snippet):
+    last = None
+    while True:
+        query = where(supabase.table('alumni').select(columns))
+        if last:
+            year, row_id = last
+            query = query.or_(f'graduation_year.lt.{year},and(graduation_year.eq.{year},id.gt.{row_id})')
+        with profiling.span('fetch'):
+            rows = query.order('graduation_year', desc=True).order('id').limit(page_size).execute().data
+        yield from rows
+        if len(rows) < page_size:
+            return
+        last = (rows[-1]['graduation_year'], rows[-1]['id'])
+
+
+def count_alumni(supabase, where):
+    """Exact count of alumni rows matching `where`, without fetching them."""
+    return where(supabase.table('alumni').select('id', count='exact')).limit(1).execute().count or 0
+
+
+def group_by_query(alumni, loose):
     """
-    Determines industry based on company name and context.
+    Groups alumni by the exact query they would generate, so multi-season or
+    multi-sport duplicates of one person are searched once. Returns a list
+    of groups (lists of alumni rows) in first-seen order. loose=None (the
+    cascade) keys each row by the query it starts from: loose for rows
+    already marked '', strict otherwise.
     """
-    if not company:
-        text = f"{title} {snippet}".lower()
-    else:
-        text = company.lower()
-    
-    for keyword, industry in COMPANY_TO_INDUSTRY.items():
-        if keyword in text:
-            return industry
-    
-    return None
+    groups = {}
+    for person in alumni:
+        groups.setdefault(start_query(person, loose), []).append(person)
+    return list(groups.values())
 
 
-# ==========================================
-# MAIN EXECUTION
-# ==========================================
+def start_query(person, loose):
+    """The query group_by_query keys `person` by."""
+    start_loose = person.get('linkedin_url') == '' if loose is None else loose
+    return build_query(person['full_name'], person['sport'], start_loose)
 
-def run_pass(supabase, alumni, loose, pass_name):
-    """Search a list of alumni and update DB. Returns (found, not_found, errors)."""
-    found = not_found = errors = 0
-    start = time.time()
 
-    for i, person in enumerate(alumni):
-        name = person['full_name']
-        sport = person['sport']
-        elapsed = time.time() - start
-        rate = (i + 1) / elapsed if elapsed > 0 else 1
-        eta = (len(alumni) - i - 1) / rate
+def iter_query_batches(alumni, loose, window=FETCH_PAGE_SIZE):
+    """
+    Consumes an alumni stream `window` rows at a time, deduplicates each
+    window by query and yields batches of up to SERPER_BATCH_SIZE groups.
+    A duplicate split across windows comes out as a group of its own;
+    run_pass joins it to the earlier group while that one is in flight, and
+    the search cache answers it after.
+    """
+    alumni = iter(alumni)
+    while True:
+        chunk = list(islice(alumni, window))
+        if not chunk:
+            return
+        groups = group_by_query(chunk, loose)
+        for i in range(0, len(groups), SERPER_BATCH_SIZE):
+            yield groups[i:i + SERPER_BATCH_SIZE]
 
-        safe_name = name.encode('ascii', 'replace').decode('ascii')
-        print(f"[{pass_name} {i+1}/{len(alumni)}] {safe_name} ", end="", flush=True)
 
+def run_pass(supabase, alumni, loose, pass_name, total=None, journal=None,
+             cascade=False, early_stop=False, window=FETCH_PAGE_SIZE, on_result=None):
+    """
+    Search a stream of alumni and update DB. Returns (found, not_found, errors).
+    Alumni sharing a query are searched once and the result is fanned out
+    to all of their ids. Unique queries are packed SERPER_BATCH_SIZE per
+    request and fed to a thread pool (rate-limited by the shared Serper
+    client) as rows arrive, with a bounded number of batches in flight;
+    results are buffered and written back in bulk, with a final flush even
+    if the run is interrupted. With a journal, ids already attempted with
+    this query variant inside the retry window are skipped and successful
+    write-backs are journaled. `total` is only used for progress output.
+    Alumni whose search failed count as errors and are left untouched (no
+    write, no journal entry) for the next run; a SerperError that every
+    request would hit (bad key, no credits) is raised after the final flush.
+
+    cascade=True (`loose` is then ignored) runs search_cascade_batch: each
+    alumnus gets the strict query and, on a miss, the loose one in the same
+    run, and only the final outcome is written back. Its journal variant is
+    'cascade'; the strict and loose attempts are journaled too, so the hit
+    model keeps learning per-variant rates.
+
+    `window` is how many streamed rows are deduplicated at a time (a
+    streaming caller passes a small one so searching starts at once). A
+    later window's alumni whose query is still in flight join that group
+    and share its result instead of searching it again. on_result,
+    if given, is called with (ids, found) for every outcome.
+    """
+    start = time.time()
+    done = 0
+    total_label = f"{total}" if total is not None else "?"
+    # linkedin_url is unique (migration 027): the first row to claim a URL
+    # this run keeps it, later duplicates get the career fields and are
+    # marked searched; the dedup job merges them into the row holding it.
+    claimed_urls = set()
+
+    variant = 'cascade' if cascade else 'loose' if loose else 'strict'
+    stamp = datetime.now(timezone.utc).isoformat()
+    writer = EnrichmentWriter(supabase, journal=journal, variant=variant)
+    if journal is not None:
+        # Checked `window` rows at a time too, so a streaming caller's rows
+        # aren't held back until a full journal chunk has arrived
+        chunk = min(window, journal.CHUNK)
+        alumni = journal.skip_attempted(alumni, variant, chunk)
+        if cascade:
+            # '' rows given the loose query by an earlier two-pass run
+            alumni = journal.skip_attempted(alumni, 'loose', chunk)
+    stages = {'strict': 0, 'loose': 0, 'early_stop': 0}
+    executor = ThreadPoolExecutor(max_workers=MAX_WORKERS)
+    in_flight = {}
+    # query -> its group in an in-flight batch, for joining later duplicates
+    pending = {}
+    group_loose = None if cascade else loose
+
+    def record(future):
+        nonlocal done
+        batch = in_flight.pop(future)
+        for group in batch:
+            del pending[start_query(group[0], group_loose)]
         try:
-            result = search_linkedin(name, sport, loose=loose)
-        except Exception:
-            result = None
+            results = future.result()
+        except Exception as e:
+            if isinstance(e, SerperError) and e.fatal:
+                raise
+            # A failed search is not a miss: nothing is written or journaled,
+            # so these alumni are searched again next run
+            metrics.record_error('search_batch')
+            failed = sum(len(group) for group in batch)
+            writer.errors += failed
+            done += failed
+            safe_err = str(e).encode('ascii', 'replace').decode('ascii')
+            print(f"   Search failed for {failed} alumni ({safe_err}) — left for the next run")
+            metrics.tick()
+            return
+        if not cascade:
+            results = [(result, None) for result in results]
+
+        for group, (result, attempts) in zip(batch, results):
+            ids = [person['id'] for person in group]
+            hit = bool(result and result.get('linkedin_url'))
+            metrics.record_outcome(pass_name, group[0].get('sport'), hit, len(group))
+            if cascade and attempts:
+                steps = dict(attempts[:-1])
+                if hit:
+                    stages['loose' if 'loose' in steps else 'strict'] += len(group)
+                elif 'loose' not in steps:
+                    stages['early_stop'] += len(group)
+                for step, step_outcome in attempts[:-1]:
+                    metrics.record_step_outcome(pass_name, step, step_outcome == 'found', len(group))
+            done += len(group)
+            name = group[0]['full_name']
+            elapsed = time.time() - start
+            rate = done / elapsed if elapsed > 0 else 1
+
+            safe_name = name.encode('ascii', 'replace').decode('ascii')
+            dupes = f" (x{len(group)})" if len(group) > 1 else ""
+            print(f"[{pass_name} {done}/{total_label}] {safe_name}{dupes} ", end="", flush=True)
+
+            if hit:
+                role = (result.get('role') or '')[:30].encode('ascii', 'replace').decode('ascii')
+                company = (result.get('company') or '')[:20].encode('ascii', 'replace').decode('ascii')
+                print(f"-> {role} @ {company}")
+                update = {k: result[k] for k in ENRICH_FIELDS if result.get(k)}
+                update['enriched_at'] = stamp
+                if update['linkedin_url'] in claimed_urls:
+                    writer.add(ids, {**update, 'linkedin_url': ''}, attempts=attempts)
+                else:
+                    claimed_urls.add(update['linkedin_url'])
+                    writer.add(ids[:1], update, attempts=attempts)
+                    writer.add(ids[1:], {**update, 'linkedin_url': ''}, attempts=attempts)
+            else:
+                print("-> Not found")
+                writer.mark_not_found(ids, attempts=attempts)
+
+            if on_result is not None:
+                on_result(ids, hit)
 
-        if result and result.get('linkedin_url'):
-            role = (result.get('role') or '')[:30].encode('ascii', 'replace').decode('ascii')
-            company = (result.get('company') or '')[:20].encode('ascii', 'replace').decode('ascii')
-            print(f"-> {role} @ {company}")
-            update = {k: result[k] for k in ('linkedin_url', 'role', 'company', 'industry', 'location') if result.get(k)}
+            if done // 100 != (done - len(group)) // 100:
+                eta = f"{(total - done) / rate / 60:.1f} min" if total else "?"
+                print(f"\n--- {done}/{total_label} | Found: {writer.found} | Not found: {writer.not_found} | {rate:.1f}/s | ETA: {eta} ---\n")
+        metrics.tick()
+
+    if cascade:
+        def search(people):
+            return search_cascade_batch(people, early_stop)
+    else:
+        def search(people):
+            return search_linkedin_batch(people, loose)
+
+    try:
+        for batch in iter_query_batches(alumni, group_loose, window):
+            fresh = []
+            for group in batch:
+                query = start_query(group[0], group_loose)
+                if query in pending:
+                    pending[query].extend(group)
+                else:
+                    pending[query] = group
+                    fresh.append(group)
+            if not fresh:
+                continue
+            batch = fresh
+            # Backpressure: don't read further ahead than the workers can use
+            while len(in_flight) >= MAX_WORKERS * 2:
+                finished, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    record(future)
+            future = executor.submit(search, [group[0] for group in batch])
+            in_flight[future] = batch
+
+        for future in as_completed(list(in_flight)):
+            record(future)
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+        writer.flush()
+
+    if cascade:
+        print(f"\n{pass_name}: found by strict query {stages['strict']:,}, by loose retry "
+              f"{stages['loose']:,}; loose retry skipped (--early-stop) {stages['early_stop']:,}")
+    profiling.checkpoint(f"pass {pass_name}")
+    return writer.found, writer.not_found, writer.errors
+
+
+def run_refresh(supabase, budget, journal=None, current_year=2026):
+    """
+    Freshness scheduler: re-searches the highest-priority slice of alumni
+    who already have a LinkedIn URL, so role and company don't rot after
+    the first find. Every enriched row is scored with refresh_priority
+    (missing fields first, then staleness weighted toward recent grads);
+    only the top `budget` are kept in a bounded heap and searched. Results
+    go through decide_refresh — fill empty fields, overwrite stale ones,
+    and never trust a hit for a different profile — and every row that
+    got a result is stamped with enriched_at so it rests until stale. A
+    miss is only journaled (variant 'refresh'): its fields and enriched_at
+    stay as they were, and it rests for the journal's retry window instead
+    of topping the heap again next run. Returns (refreshed, unchanged,
+    errors).
+    """
+    now = datetime.now(timezone.utc)
+    stamp = now.isoformat()
+
+    def enriched(q):
+        return q.not_.is_('linkedin_url', 'null').neq('linkedin_url', '')
+
+    columns = 'id, full_name, sport, graduation_year, enriched_at, ' + ', '.join(ENRICH_FIELDS)
+    alumni = iter_alumni(supabase, columns, enriched)
+    if journal is not None:
+        alumni = journal.skip_attempted(alumni, 'refresh')
+
+    # Keep only the top `budget` by priority — memory bounded by the budget
+    heap = []
+    scanned = 0
+    for seq, person in enumerate(alumni):
+        scanned += 1
+        priority = refresh_priority(person, now, current_year)
+        if priority <= 0:
+            continue
+        entry = (priority, -seq, person)
+        if len(heap) < budget:
+            heapq.heappush(heap, entry)
+        elif entry > heap[0]:
+            heapq.heapreplace(heap, entry)
+    selected = [person for _, _, person in sorted(heap, reverse=True)]
+    print(f"Scored {scanned:,} enriched alumni; refreshing top {len(selected):,} (budget {budget:,})")
+
+    writer = EnrichmentWriter(supabase, journal=journal, variant='refresh')
+    refreshed = unchanged = mismatched = missed = 0
+    batches = [selected[i:i + SERPER_BATCH_SIZE] for i in range(0, len(selected), SERPER_BATCH_SIZE)]
+    executor = ThreadPoolExecutor(max_workers=MAX_WORKERS)
+    try:
+        future_to_batch = {executor.submit(search_linkedin_batch, batch, False): batch for batch in batches}
+        for future in as_completed(future_to_batch):
+            batch = future_to_batch[future]
             try:
-                supabase.table('alumni').update(update).eq('id', person['id']).execute()
-                found += 1
+                results = future.result()
             except Exception as e:
-                print(f"  DB error: {e}")
-                errors += 1
-        else:
-            print("-> Not found")
-            try:
-                supabase.table('alumni').update({'linkedin_url': ''}).eq('id', person['id']).execute()
-                not_found += 1
-            except Exception:
-                errors += 1
+                if isinstance(e, SerperError) and e.fatal:
+                    raise
+                metrics.record_error('search_batch')
+                writer.errors += len(batch)
+                continue
+
+            misses = []
+            for person, result in zip(batch, results):
+                metrics.record_outcome('refresh', person.get('sport'), bool(result and result.get('linkedin_url')))
+                if not result or not result.get('linkedin_url'):
+                    misses.append(person['id'])
+                    continue
+                update = decide_refresh(person, result, now)
+                if update is None:
+                    mismatched += 1
+                    update = {}
+                elif update:
+                    refreshed += 1
+                    safe_name = person['full_name'].encode('ascii', 'replace').decode('ascii')
+                    changes = ', '.join(f"{k}={v}" for k, v in update.items()).encode('ascii', 'replace').decode('ascii')
+                    print(f"[refresh] {safe_name} -> {changes[:80]}")
+                else:
+                    unchanged += 1
+                writer.add([person['id']], {**update, 'enriched_at': stamp})
+            missed += len(misses)
+            if misses and journal is not None:
+                journal.record(misses, 'refresh', 'not_found')
+            metrics.tick()
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+        writer.flush()
+
+    print(f"\nRefreshed: {refreshed} | Unchanged: {unchanged} | Different profile (skipped): {mismatched} | "
+          f"Not found: {missed} | Errors: {writer.errors}")
+    return refreshed, unchanged, writer.errors
+
+
+def run_budgeted(supabase, budget, passes, journal=None):
+    """
+    Spends at most `budget` Serper credits on the pending alumni most likely
+    to be found. `passes` is [(pass_name, loose, where), ...] as in main().
+    A HitRateModel is fitted on everyone already searched (plus the
+    journal's strict/loose outcome history), every pending row is scored,
+    and only the top `budget` uncached queries are kept in a bounded heap.
+    Queries with a fresh cache entry cost nothing and always run. Reports
+    expected vs actual yield per credit. Returns [(found, not_found, errors)]
+    per pass.
+    """
+    def searched(q):
+        return q.not_.is_('linkedin_url', 'null')
+
+    model = HitRateModel.fit(
+        iter_alumni(supabase, 'id, full_name, sport, graduation_year, linkedin_url', searched),
+        journal.outcome_rates() if journal is not None else None,
+    )
+    print(f"Hit model fitted on {model.total:,} searched alumni (base hit rate {model.base_rate():.1%})")
+
+    columns = 'id, full_name, sport, graduation_year'
+    free = {name: [] for name, _, _ in passes}
+    heap = []
+    seq = 0
+    for name, loose, where in passes:
+        variant = 'loose' if loose else 'strict'
+        alumni = iter_alumni(supabase, columns, where)
+        if journal is not None:
+            alumni = journal.skip_attempted(alumni, variant)
+        for person in alumni:
+            seq += 1
+            if cache.get(build_query(person['full_name'], person['sport'], loose)) is not None:
+                free[name].append(person)
+                continue
+            entry = (model.probability(person, variant), -seq, name, person)
+            if len(heap) < budget:
+                heapq.heappush(heap, entry)
+            elif entry > heap[0]:
+                heapq.heapreplace(heap, entry)
+
+    ranked = sorted(heap, reverse=True)
+    expected = sum(p for p, _, _, _ in ranked)
+    print(f"Selected {len(ranked):,} queries for {budget:,} credits "
+          f"(+{sum(len(v) for v in free.values()):,} cached, free) — "
+          f"expected {expected:.0f} found, {expected / max(1, len(ranked)):.2f} per credit")
+
+    credits_before = serper.credits
+    results = []
+    for name, loose, _ in passes:
+        chosen = free[name] + [person for _, _, pass_name, person in ranked if pass_name == name]
+        results.append(run_pass(supabase, chosen, loose=loose, pass_name=name,
+                                total=len(chosen), journal=journal))
+
+    credits = serper.credits - credits_before
+    found = sum(f for f, _, _ in results)
+    print(f"\nCredits spent: {credits:,} | Found: {found:,} | "
+          f"Yield: {found / credits if credits else 0:.2f} profiles per credit")
+    return results
+
+
+def run_unbudgeted(supabase, journal, never_searched, not_found_yet, total, early_stop=False):
+    """
+    One strict-then-loose cascade over every pending alumnus. Rows already
+    marked '' are streamed first (they only need the loose query), then the
+    never-searched ones, so this run's misses — written back as '' — are
+    never re-selected. Each stream is in graduation-year order.
+    """
+    columns = 'id, full_name, sport, graduation_year, linkedin_url'
+    alumni = chain(iter_alumni(supabase, columns, not_found_yet),
+                   iter_alumni(supabase, columns, never_searched))
+    return run_pass(supabase, alumni, loose=False, pass_name="C", total=total,
+                    journal=journal, cascade=True, early_stop=early_stop)
 
-        if (i + 1) % 100 == 0:
-            print(f"\n--- {i+1}/{len(alumni)} | Found: {found} | Not found: {not_found} | ETA: {eta/60:.1f} min ---\n")
 
-        time.sleep(DELAY_BETWEEN_CALLS)
+def run_offline(supabase):
+    """
+    Re-derives role, company, location and industry for already-searched
+    alumni from cached search results only — no Serper calls. Lets parser
+    and industry-mapping fixes be re-applied to everyone at zero API cost.
+    Only rows whose values actually change are written, in bulk.
+    """
+    print("=" * 60)
+    print(f"OFFLINE REPARSE from {SERPER_CACHE_PATH} ({len(cache):,} cached queries)")
+    print("=" * 60)
+    def searched(q):
+        return q.not_.is_('linkedin_url', 'null')
+
+    alumni = iter_alumni(supabase, 'id, full_name, sport, graduation_year, ' + ', '.join(ENRICH_FIELDS), searched)
+    print(f"Checking {count_alumni(supabase, searched):,} previously searched alumni")
+
+    writer = EnrichmentWriter(supabase)
+    unchanged = uncached = 0
+    for person in alumni:
+        result = None
+        cached = False
+        # Same order the live passes use: strict first, then loose
+        for loose in (False, True):
+            data = cache.get(build_query(person['full_name'], person['sport'], loose), max_age=None)
+            if data is None:
+                continue
+            cached = True
+            result = parse_search_results(data, person['full_name'], person['sport'])
+            if result:
+                break
+
+        if not cached:
+            uncached += 1
+            continue
 
-    return found, not_found, errors
+        update = {k: result[k] for k in ENRICH_FIELDS if result and result.get(k) and result[k] != person.get(k)}
+        if not update:
+            unchanged += 1
+            continue
+        writer.add([person['id']], update)
+    writer.flush()
+
+    print(f"\nUpdated: {writer.found} | Unchanged: {unchanged} | Not in cache: {uncached} | Errors: {writer.errors}")
+
+
+def arg_value(name, default=None):
+    """Value of a `--name=value` command-line flag, or `default`."""
+    import sys
+    prefix = f'--{name}='
+    for arg in sys.argv[1:]:
+        if arg.startswith(prefix):
+            return arg[len(prefix):]
+    return default
+
+
+def serper_rejected(error):
+    """Explains a run stopped by a SerperError that no retry would fix."""
+    print(f"\nSerper rejected the request ({error}) — stopping. Check SERPER_API_KEY and the "
+          f"account's remaining credits; alumni not yet searched were left untouched.")
+
+
+def report_metrics():
+    """Prints latency percentiles and writes the run report / final textfile."""
+    summary = metrics.summary()
+    for label, key in (("Serper latency", 'serper_latency'), ("DB write latency", 'db_write_latency')):
+        lat = summary[key]
+        if lat['count']:
+            print(f"{label + ':':<18}{lat['count']:,} calls | p50 {lat['p50_ms']} ms | "
+                  f"p90 {lat['p90_ms']} ms | p99 {lat['p99_ms']} ms")
+    if summary['errors']:
+        print("Errors:           " + ', '.join(f"{k}={v}" for k, v in sorted(summary['errors'].items())))
+    report = arg_value('metrics', ENRICH_METRICS_REPORT)
+    if report:
+        metrics.write_report(report)
+        print(f"Metrics report:   {report}")
+    if metrics.prometheus_path:
+        metrics.write_prometheus(metrics.prometheus_path)
 
 
 def main():
@@ -419,35 +833,57 @@ def main():
     supabase = create_client(SUPABASE_URL, SUPABASE_SERVICE_KEY)
     current_year = 2026
 
-    # ── Pass 1: true NULLs — strict query (name + sport + Cornell) ──
-    print("=" * 60)
-    print("PASS 1: Never-searched alumni (true NULL linkedin_url)")
+    if '--offline' in sys.argv:
+        run_offline(supabase)
+        return
+
+    if not SERPER_API_KEY:
+        print("SERPER_API_KEY is not set (use --offline to reparse cached results only).")
+        return
+
+    metrics.prometheus_path = arg_value('prometheus', ENRICH_PROMETHEUS_PATH) or None
+
+    if '--refresh' in sys.argv:
+        budget = int(arg_value('budget', REFRESH_BUDGET))
+        print("=" * 60)
+        print(f"REFRESH: re-enriching the stalest alumni (budget {budget:,} searches)")
+        print("=" * 60)
+        journal = EnrichmentJournal(ENRICH_JOURNAL_PATH, retry_after_days=ENRICH_RETRY_AFTER_DAYS)
+        try:
+            run_refresh(supabase, budget, journal=journal, current_year=current_year)
+        except SerperError as e:
+            serper_rejected(e)
+            sys.exit(1)
+        finally:
+            journal.close()
+            report_metrics()
+        return
+
+    # True NULLs — never searched: strict query (name + sport + Cornell),
+    # then the loose one (name + Cornell only) on a miss
+    def never_searched(q):
+        return q.is_('linkedin_url', 'null').lte('graduation_year', current_year)
+
+    # Empty string — strict query already missed: loose query only
+    def not_found_yet(q):
+        return q.eq('linkedin_url', '').lte('graduation_year', current_year)
+
+    n1 = count_alumni(supabase, never_searched)
+    n2 = count_alumni(supabase, not_found_yet)
+    early_stop = '--early-stop' in sys.argv
     print("=" * 60)
-    res = supabase.table('alumni') \
-        .select('id, full_name, sport, graduation_year') \
-        .is_('linkedin_url', 'null') \
-        .lte('graduation_year', current_year) \
-        .order('graduation_year', desc=True) \
-        .execute()
-    pass1 = res.data
-    print(f"Found {len(pass1)} alumni to search")
-
-    # ── Pass 2: empty string — loose query (name + Cornell only) ──
-    print("\n" + "=" * 60)
-    print("PASS 2: Previously searched but not found — retrying with looser query")
+    print("STRICT -> LOOSE CASCADE: one sweep, final outcome written once")
     print("=" * 60)
-    res2 = supabase.table('alumni') \
-        .select('id, full_name, sport, graduation_year') \
-        .eq('linkedin_url', '') \
-        .lte('graduation_year', current_year) \
-        .order('graduation_year', desc=True) \
-        .execute()
-    pass2 = res2.data
-    print(f"Found {len(pass2)} alumni to retry")
-
-    total = len(pass1) + len(pass2)
-    est = (total * DELAY_BETWEEN_CALLS) / 60
-    print(f"\nTotal to search: {total:,} (~{est:.0f} min / {est/60:.1f} hrs)")
+    print(f"Never searched (strict, then loose on a miss): {n1:,}")
+    print(f"Strict miss already recorded (loose only):      {n2:,}")
+    if early_stop:
+        print(f"--early-stop: no loose retry after {EARLY_STOP_PROFILES}+ non-matching strict profiles")
+
+    total = n1 + n2
+    requests_needed = 2 * math.ceil(n1 / SERPER_BATCH_SIZE) + math.ceil(n2 / SERPER_BATCH_SIZE)
+    est = (requests_needed / SERPER_QPS) / 60
+    print(f"\nTotal to search: {total:,} in at most {requests_needed:,} requests "
+          f"(~{est:.0f} min at {SERPER_QPS:g} req/s, {MAX_WORKERS} workers)")
 
     if '--yes' not in sys.argv:
         confirm = input("\nType 'yes' to start: ")
@@ -455,13 +891,26 @@ def main():
             print("Aborted.")
             return
 
-    f1 = nf1 = e1 = 0
-    if pass1:
-        f1, nf1, e1 = run_pass(supabase, pass1, loose=False, pass_name="P1")
-
-    f2 = nf2 = e2 = 0
-    if pass2:
-        f2, nf2, e2 = run_pass(supabase, pass2, loose=True, pass_name="P2")
+    journal = EnrichmentJournal(ENRICH_JOURNAL_PATH, retry_after_days=ENRICH_RETRY_AFTER_DAYS)
+    budget = arg_value('budget')
+    try:
+        if budget is not None:
+            # Budgeted runs rank strict and loose queries separately, so they
+            # keep the two passes
+            passes = [("P1", False, never_searched), ("P2", True, not_found_yet)]
+            results = run_budgeted(supabase, int(budget), passes, journal=journal)
+            labels = ("Pass 1 (strict):", "Pass 2 (loose):")
+        else:
+            results = [run_unbudgeted(supabase, journal, never_searched, not_found_yet, total, early_stop)]
+            labels = ("Strict -> loose:",)
+    except SerperError as e:
+        serper_rejected(e)
+        report_metrics()
+        sys.exit(1)
+    finally:
+        journal.close()
+    if journal.skipped:
+        print(f"\nSkipped {journal.skipped:,} alumni already attempted within {ENRICH_RETRY_AFTER_DAYS:g} days")
 
     # Final counts
     real = supabase.table('alumni').select('id', count='exact') \
@@ -470,11 +919,16 @@ def main():
     print("\n" + "=" * 60)
     print("DONE")
     print("=" * 60)
-    print(f"Pass 1 (strict):  {f1} found, {nf1} not found, {e1} errors")
-    print(f"Pass 2 (loose):   {f2} found, {nf2} not found, {e2} errors")
-    print(f"Total new URLs:   {f1 + f2}")
+    for label, (found, not_found, errors) in zip(labels, results):
+        print(f"{label:<18}{found} found, {not_found} not found, {errors} errors")
+    new_urls = sum(found for found, _, _ in results)
+    print(f"Total new URLs:   {new_urls}")
+    if serper.credits:
+        print(f"Serper credits:   {serper.credits:,} ({new_urls / serper.credits:.2f} found per credit)")
     print(f"Real LinkedIn URLs in DB now: {real:,}")
+    report_metrics()
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    with profiling.session('linkedin_scrape'):
+        main()
\ No newline at end of file
@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+"""
+Offline load test for linkedin_scrape.run_pass against serper_mock.py.
+
+Starts the mock Serper server in-process, points linkedin_scrape at it
+(SERPER_ENDPOINT) with a throwaway search cache, and pushes a synthetic
+alumni stream — with a share of multi-season duplicates, and of rows an
+earlier strict miss already marked '' — through the real run_pass:
+batching, the worker pool, rate limiting, 429 retries, the cache and the
+bulk writer. Writes land in an in-memory stand-in for the Supabase client
+instead of the database.
+
+It runs twice, each time against a fresh cache: a strict pass
+(run_pass with loose=False) and the strict-then-loose cascade that the
+default run uses. Every cold run must send each unique query to Serper
+exactly once; a second run over the same alumni must be served entirely
+from the cache. --mode runs just one of them.
+
+  python load_test_enrichment.py --alumni 20000 --workers 16 --batch-size 20
+  python load_test_enrichment.py --latency 200 --jitter 100 --qps-limit 5 --qps 5
+  python load_test_enrichment.py --mode cascade --alumni 8000 --workers 16
+"""
+import argparse
+import contextlib
+import io
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from collections import Counter
+
+from serper_mock import add_mock_arguments, mock_from_args, start_server
+
+FIRST = ['Alex', 'Jordan', 'Taylor', 'Morgan', 'Casey', 'Riley', 'Jamie', 'Avery',
+         'Quinn', 'Parker', 'Drew', 'Reese', 'Emerson', 'Rowan', 'Sage', 'Blake']
+LAST = ['Ellery', 'Marsh', 'Okafor', 'Lindqvist', 'Tran', 'Delgado', 'Whitcombe', 'Ashby',
+        'Kowalski', 'Nakamura', 'Brennan', 'Osei', 'Castellano', 'Holt', 'Varga', 'Pryor']
+SPORTS = ["Men's Lacrosse", "Women's Soccer", 'Football', 'Wrestling', "Men's Ice Hockey",
+          "Women's Rowing", 'Track & Field', "Women's Basketball"]
+
+
+def synthetic_alumni(n, dupe_rate, marked_rate=0.0, seed=7):
+    """
+    n rows; roughly dupe_rate of them repeat an earlier person (another
+    season), and marked_rate of the rest are already marked '' (the
+    cascade starts those at the loose query).
+    """
+    rng = random.Random(seed)
+    rows = []
+    for i in range(n):
+        if rows and rng.random() < dupe_rate:
+            base = rng.choice(rows)
+            rows.append({**base, 'id': str(uuid.uuid4())})
+            continue
+        name = f"{rng.choice(FIRST)} {rng.choice(LAST)} {i:05d}"
+        row = {'id': str(uuid.uuid4()), 'full_name': name, 'sport': rng.choice(SPORTS),
+               'graduation_year': rng.randint(1990, 2026)}
+        if rng.random() < marked_rate:
+            row['linkedin_url'] = ''
+        rows.append(row)
+    return rows
+
+
+class _Query:
+    def __init__(self, store, payload=None, rpc=None):
+        self.store = store
+        self.payload = payload
+        self.rpc = rpc
+        self.ids = []
+
+    def update(self, payload):
+        self.payload = payload
+        return self
+
+    def in_(self, column, ids):
+        self.ids = list(ids)
+        return self
+
+    def eq(self, column, value):
+        self.ids = [value]
+        return self
+
+    def execute(self):
+        time.sleep(self.store.write_latency)
+        if self.rpc is not None:
+            for row in self.rpc['updates']:
+                self.store.apply([row['id']], {k: v for k, v in row.items() if k != 'id'})
+        else:
+            self.store.apply(self.ids, self.payload)
+        return self
+
+
+class RecordingSupabase:
+    """Just enough of the supabase client for EnrichmentWriter, kept in memory."""
+
+    def __init__(self, write_latency_ms=0):
+        self.write_latency = write_latency_ms / 1000
+        self.rows = {}
+        self.writes = Counter()
+        self.calls = 0
+        self.lock = threading.Lock()
+
+    def table(self, name):
+        return _Query(self)
+
+    def rpc(self, name, params):
+        return _Query(self, rpc=params)
+
+    def apply(self, ids, payload):
+        with self.lock:
+            self.calls += 1
+            for row_id in ids:
+                self.rows.setdefault(row_id, {}).update(payload)
+                self.writes[row_id] += 1
+
+
+def timed_pass(scrape, store, alumni, cascade, verbose):
+    out = sys.stdout if verbose else io.StringIO()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(out):
+        found, not_found, errors = scrape.run_pass(store, iter(alumni), loose=False,
+                                                   pass_name='LOAD', total=len(alumni),
+                                                   cascade=cascade)
+    return found, not_found, errors, time.perf_counter() - start
+
+
+def load_run(scrape, mock, alumni, cascade, args, cache_path):
+    """Cold then warm run_pass over `alumni` with a fresh cache; returns failures."""
+    from serper_cache import SearchCache
+
+    label = 'cascade' if cascade else 'strict'
+    scrape.cache.close()
+    scrape.cache = SearchCache(cache_path, ttl_days=scrape.SERPER_CACHE_TTL_DAYS)
+    if cascade:
+        # Loose retries add queries on top of these; none may repeat
+        unique_queries = len({scrape.start_query(p, None) for p in alumni})
+    else:
+        unique_queries = len({scrape.build_query(p['full_name'], p['sport']) for p in alumni})
+    print(f"\n[{label}] {unique_queries:,} unique {'starting ' if cascade else ''}queries")
+    failures = []
+    with mock.lock:
+        mock.seen.clear()
+        before = Counter(mock.stats)
+
+    # ── Cold run: every unique query goes to the mock ──
+    store = RecordingSupabase(args.write_latency)
+    found, not_found, errors, elapsed = timed_pass(scrape, store, alumni, cascade, args.verbose)
+    cold = Counter(mock.stats)
+    cold.subtract(before)
+    print(f"Cold:  {len(alumni) / elapsed:,.0f} alumni/s ({elapsed:.1f}s) | found {found:,} | "
+          f"not found {not_found:,} | errors {errors:,} | {cold['requests']:,} requests, "
+          f"{cold['queries']:,} queries, {cold['repeated']:,} repeated, "
+          f"{cold['throttled']:,} throttled (429), {cold['errors']:,} 500s | {store.calls:,} DB calls")
+
+    if found + not_found + errors != len(alumni):
+        failures.append(f"accounted for {found + not_found + errors:,} of {len(alumni):,} alumni")
+    if cold['repeated']:
+        failures.append(f"{cold['repeated']:,} Serper queries sent more than once")
+    if cascade and cold['queries'] < unique_queries:
+        failures.append(f"{cold['queries']:,} Serper queries for {unique_queries:,} unique starting queries")
+    if not cascade and cold['queries'] != unique_queries:
+        failures.append(f"{cold['queries']:,} Serper queries for {unique_queries:,} unique queries")
+    if any(n != 1 for n in store.writes.values()):
+        failures.append(f"{sum(1 for n in store.writes.values() if n != 1):,} rows written more than once")
+    if len(store.writes) != found + not_found:
+        failures.append(f"{len(store.writes):,} rows written for {found + not_found:,} outcomes")
+    urls = [row['linkedin_url'] for row in store.rows.values() if row.get('linkedin_url')]
+    if len(urls) != len(set(urls)):
+        failures.append(f"{len(urls) - len(set(urls)):,} duplicate linkedin_url writes")
+
+    # ── Warm run: the cache should answer everything ──
+    store = RecordingSupabase(args.write_latency)
+    found2, not_found2, errors2, elapsed2 = timed_pass(scrape, store, alumni, cascade, args.verbose)
+    new_queries = mock.stats['queries'] - before['queries'] - cold['queries']
+    print(f"Warm:  {len(alumni) / elapsed2:,.0f} alumni/s ({elapsed2:.1f}s) | found {found2:,} | "
+          f"{new_queries:,} new Serper queries")
+    if new_queries:
+        failures.append(f"warm run sent {new_queries:,} queries past the cache")
+    if found2 != found:
+        failures.append(f"warm run found {found2:,}, cold run {found:,}")
+    return [f"[{label}] {failure}" for failure in failures]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--alumni', type=int, default=5000)
+    parser.add_argument('--dupe-rate', type=float, default=0.1)
+    parser.add_argument('--marked-rate', type=float, default=0.1,
+                        help="share of rows already marked '' by a strict miss")
+    parser.add_argument('--mode', choices=('both', 'strict', 'cascade'), default='both')
+    parser.add_argument('--workers', type=int, default=8)
+    parser.add_argument('--batch-size', type=int, default=10)
+    parser.add_argument('--qps', type=float, default=50, help='client-side Serper QPS (SERPER_QPS)')
+    parser.add_argument('--write-latency', type=float, default=0, help='ms per simulated DB call')
+    parser.add_argument('-v', '--verbose', action='store_true', help='show run_pass output')
+    add_mock_arguments(parser)
+    args = parser.parse_args()
+
+    mock = mock_from_args(args)
+    server, endpoint = start_server(mock)
+    tmp = tempfile.mkdtemp(prefix='serper-load-')
+
+    # linkedin_scrape reads its configuration at import time
+    os.environ.update({
+        'SERPER_ENDPOINT': endpoint,
+        'SERPER_API_KEY': 'mock-key',
+        'SERPER_QPS': str(args.qps),
+        'SERPER_WORKERS': str(args.workers),
+        'SERPER_BATCH_SIZE': str(args.batch_size),
+        'SERPER_CACHE_PATH': os.path.join(tmp, 'serper_cache.sqlite3'),
+    })
+    os.environ.setdefault('SUPABASE_URL', 'http://127.0.0.1:0')
+    os.environ.setdefault('SUPABASE_SERVICE_ROLE_KEY', 'mock')
+    import linkedin_scrape as scrape
+
+    alumni = synthetic_alumni(args.alumni, args.dupe_rate, args.marked_rate)
+    print(f"Load test: {len(alumni):,} alumni, {args.workers} workers, batches of {args.batch_size}, "
+          f"{args.qps:g} req/s → {endpoint}")
+
+    failures = []
+    for cascade in (False, True):
+        if args.mode != 'both' and cascade != (args.mode == 'cascade'):
+            continue
+        cache_path = os.path.join(tmp, f"serper_cache-{'cascade' if cascade else 'strict'}.sqlite3")
+        failures += load_run(scrape, mock, alumni, cascade, args, cache_path)
+
+    lat = scrape.metrics.summary()['serper_latency']
+    print(f"Serper latency: p50 {lat['p50_ms']} ms | p90 {lat['p90_ms']} ms | p99 {lat['p99_ms']} ms")
+
+    server.shutdown()
+    scrape.cache.close()
+    if failures:
+        print("\nFAIL:\n  " + "\n  ".join(failures))
+        sys.exit(1)
+    print("\nOK")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,452 @@
+#!/usr/bin/env python3
+"""
+Streaming scrape -> import -> enrich pipeline.
+
+scraper.py, supabase_import.py and linkedin_scrape.py otherwise run as three
+manual steps joined by a CSV, each waiting for the previous one to finish.
+Here they run at once as stages joined by bounded queues. Rosters are
+scraped newest season first. Each athlete is transformed, checked against
+the suppression list and inserted as soon as a batch fills. Inserted rows go
+straight into the strict-then-loose LinkedIn cascade while scraping goes on.
+A full queue blocks the stage feeding it (backpressure), so memory is
+bounded by the queue sizes and the slowest stage sets the pace.
+
+There are no input() prompts; --confirm (or PIPELINE_CONFIRM) says what may
+be written:
+  dry-run  (default) scrape, transform and filter; no DB writes, no searches
+  append   insert athletes not already in alumni, then enrich them
+  replace  delete every alumni row first (as supabase_import.py does)
+
+  python pipeline.py --confirm=append --start-year=2015 --sports=football,wrestling
+  python pipeline.py --confirm=append --csv=scraped.csv --early-stop --report=pipeline.json
+  python pipeline.py --confirm=append --no-enrich
+
+Per-stage throughput, queue depth and time spent blocked on each queue are
+printed every PIPELINE_REPORT_SECONDS and at the end (--report=path also
+writes them as JSON).
+"""
+import csv
+import json
+import os
+import queue
+import sys
+import threading
+import time
+import traceback
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import linkedin_scrape
+import profiling
+import scraper
+import supabase_import
+from enrichment_journal import EnrichmentJournal
+
+# ==========================================
+# CONFIGURATION
+# ==========================================
+
+# Queue capacities (athlete rows) between scrape -> import and import -> enrich
+SCRAPED_QUEUE_SIZE = int(os.environ.get('PIPELINE_SCRAPED_QUEUE', 2000))
+IMPORTED_QUEUE_SIZE = int(os.environ.get('PIPELINE_IMPORTED_QUEUE', 1000))
+
+# Rows per alumni insert (as supabase_import.py), and the longest a partial
+# batch waits for more athletes before it is inserted anyway
+INSERT_BATCH_SIZE = int(os.environ.get('PIPELINE_INSERT_BATCH', 500))
+INSERT_FLUSH_SECONDS = float(os.environ.get('PIPELINE_INSERT_FLUSH_SECONDS', 5))
+
+PIPELINE_REPORT_SECONDS = float(os.environ.get('PIPELINE_REPORT_SECONDS', 30))
+PIPELINE_CONFIRM = os.environ.get('PIPELINE_CONFIRM', 'dry-run')
+CONFIRM_POLICIES = ('dry-run', 'append', 'replace')
+
+_DONE = object()
+_EMPTY = object()
+
+
+class Aborted(Exception):
+    """Another stage failed or the run was interrupted."""
+
+
+class StageQueue:
+    """
+    Bounded queue between two stages that times how long its producer was
+    blocked (queue full: backpressure) and its consumer starved (queue
+    empty), and tracks the deepest it got.
+    """
+
+    def __init__(self, name, maxsize, stop):
+        self.name = name
+        self.maxsize = maxsize
+        self.q = queue.Queue(maxsize)
+        self.stop = stop
+        self.blocked = 0.0
+        self.starved = 0.0
+        self.high_water = 0
+
+    def put(self, item):
+        start = time.perf_counter()
+        while True:
+            if self.stop.is_set():
+                raise Aborted
+            try:
+                self.q.put(item, timeout=0.2)
+                break
+            except queue.Full:
+                continue
+        self.blocked += time.perf_counter() - start
+        self.high_water = max(self.high_water, self.q.qsize())
+
+    def get(self, timeout=None):
+        """Next item, or _EMPTY if `timeout` seconds pass first."""
+        start = time.perf_counter()
+        try:
+            while True:
+                if self.stop.is_set():
+                    raise Aborted
+                if timeout is not None and time.perf_counter() - start >= timeout:
+                    return _EMPTY
+                try:
+                    return self.q.get(timeout=0.2)
+                except queue.Empty:
+                    continue
+        finally:
+            self.starved += time.perf_counter() - start
+
+    def close(self):
+        self.put(_DONE)
+
+    def __iter__(self):
+        while True:
+            item = self.get()
+            if item is _DONE:
+                return
+            yield item
+
+    def summary(self):
+        return {
+            'capacity': self.maxsize,
+            'depth': self.q.qsize(),
+            'high_water': self.high_water,
+            'producer_blocked_s': round(self.blocked, 1),
+            'consumer_starved_s': round(self.starved, 1),
+        }
+
+
+class Stage:
+    """Counters and timing for one stage; `counts['out']` is its throughput."""
+
+    def __init__(self, name):
+        self.name = name
+        self.counts = Counter()
+        self.started = self.finished = self.first_out = None
+        self.failure = None
+
+    def out(self, n=1):
+        if self.first_out is None:
+            self.first_out = time.time()
+        self.counts['out'] += n
+
+    def summary(self, kickoff):
+        end = self.finished or time.time()
+        active = end - self.started if self.started else 0
+        return {
+            **self.counts,
+            'rate_per_s': round(self.counts['out'] / active, 2) if active > 0 else 0,
+            'active_s': round(active, 1),
+            'first_out_s': round(self.first_out - kickoff, 1) if self.first_out else None,
+            'done': self.finished is not None,
+            **({'failure': self.failure} if self.failure else {}),
+        }
+
+
+# ==========================================
+# STAGES
+# ==========================================
+
+def scrape_stage(stage, out, sports, years, csv_path=None):
+    """
+    Scrapes every (sport, year) roster with scraper.py's workers, newest
+    season first, and emits each athlete once (the scraper's Name/Sport/Year
+    dedup). Only 2x MAX_WORKERS rosters are in flight, so a blocked queue
+    pauses scraping instead of piling results up in memory.
+    """
+    sessions = [scraper.create_session() for _ in range(scraper.MAX_WORKERS)]
+    tasks = iter([(sessions[i % len(sessions)], sport, year)
+                  for i, (year, sport) in enumerate((y, s) for y in sorted(years, reverse=True) for s in sports)])
+    seen = set()
+    csv_file = open(csv_path, 'w', newline='', encoding='utf-8') if csv_path else None
+    csv_writer = None
+    executor = ThreadPoolExecutor(max_workers=scraper.MAX_WORKERS)
+    in_flight = set()
+
+    def collect(finished):
+        nonlocal csv_writer
+        for future in finished:
+            in_flight.discard(future)
+            result = future.result()
+            stage.counts['rosters'] += 1
+            if not result['success']:
+                stage.counts['rosters_missing'] += 1
+                continue
+            for athlete in result['data']:
+                key = (athlete['Name'], athlete['Sport'], athlete['Year'])
+                if key in seen:
+                    stage.counts['duplicates'] += 1
+                    continue
+                seen.add(key)
+                if csv_file is not None:
+                    if csv_writer is None:
+                        csv_writer = csv.DictWriter(csv_file, fieldnames=list(athlete))
+                        csv_writer.writeheader()
+                    csv_writer.writerow(athlete)
+                out.put(athlete)
+                stage.out()
+
+    try:
+        for task in tasks:
+            while len(in_flight) >= scraper.MAX_WORKERS * 2:
+                finished, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                collect(finished)
+            in_flight.add(executor.submit(scraper.scrape_sport_year, task))
+        while in_flight:
+            finished, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            collect(finished)
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+        if csv_file is not None:
+            csv_file.close()
+
+
+def alumni_key(record):
+    return ((record.get('full_name') or '').strip().lower(), record.get('sport'), record.get('graduation_year'))
+
+
+def insert_batch(stage, supabase, batch):
+    """Inserts `batch`, falling back to row by row (as supabase_import.py). Returns inserted rows."""
+    try:
+        with profiling.span('insert'):
+            return supabase.table('alumni').insert(batch).execute().data or []
+    except Exception as e:
+        print(f"   Error inserting batch of {len(batch)}: {e} — inserting one by one")
+        rows = []
+        for record in batch:
+            try:
+                with profiling.span('insert-one'):
+                    rows.extend(supabase.table('alumni').insert(record).execute().data or [])
+            except Exception as e2:
+                print(f"   Failed to insert {record['full_name']}: {e2}")
+                stage.counts['errors'] += 1
+        return rows
+
+
+def import_stage(stage, supabase, inbox, out, policy):
+    """
+    supabase_import.py's transform and suppression filter, one athlete at a
+    time. Athletes already in alumni (same name, sport and graduation year)
+    are skipped unless the table was just emptied (replace). Inserts go out
+    in batches of INSERT_BATCH_SIZE, or sooner when the scraper pauses for
+    INSERT_FLUSH_SECONDS; inserted rows are passed on for enrichment. In a
+    dry run nothing is written and `out` is None.
+    """
+    with profiling.span('suppression'):
+        emails, linkedins, names = supabase_import.fetch_suppression(supabase)
+    existing = set()
+    if policy != 'replace':
+        everyone = linkedin_scrape.iter_alumni(supabase, 'id, full_name, sport, graduation_year', lambda q: q)
+        existing = {alumni_key(row) for row in everyone}
+        print(f"   {len(existing):,} alumni already in the database")
+        profiling.checkpoint('existing alumni loaded')
+
+    batch = []
+    oldest = None
+
+    def flush():
+        nonlocal batch, oldest
+        if not batch:
+            return
+        pending, batch, oldest = batch, [], None
+        if policy == 'dry-run':
+            stage.out(len(pending))
+            return
+        for row in insert_batch(stage, supabase, pending):
+            stage.out()
+            if out is not None:
+                out.put({k: row.get(k) for k in ('id', 'full_name', 'sport', 'graduation_year', 'linkedin_url')})
+
+    while True:
+        athlete = inbox.get(timeout=INSERT_FLUSH_SECONDS if batch else None)
+        if athlete is _DONE:
+            break
+        if athlete is _EMPTY:
+            flush()  # scraper is slow: don't hold a partial batch back
+            continue
+        stage.counts['in'] += 1
+        with profiling.span('transform'):
+            record = supabase_import.prepare_alumni_record(athlete)
+        if record is None:
+            stage.counts['missing_name'] += 1
+            continue
+        with profiling.span('suppression'):
+            suppressed = supabase_import.is_suppressed(record, emails, linkedins, names)
+        if suppressed:
+            stage.counts['suppressed'] += 1
+            continue
+        key = alumni_key(record)
+        if key in existing:
+            stage.counts['already_imported'] += 1
+            continue
+        existing.add(key)
+        batch.append(record)
+        oldest = oldest or time.time()
+        if len(batch) >= INSERT_BATCH_SIZE or time.time() - oldest >= INSERT_FLUSH_SECONDS:
+            flush()
+    flush()
+
+
+def enrich_stage(stage, supabase, inbox, early_stop=False):
+    """
+    linkedin_scrape.py's strict-then-loose cascade over rows as they are
+    inserted, deduplicating SERPER_BATCH_SIZE rows at a time so searching
+    starts with the first insert.
+    """
+    journal = EnrichmentJournal(linkedin_scrape.ENRICH_JOURNAL_PATH,
+                                retry_after_days=linkedin_scrape.ENRICH_RETRY_AFTER_DAYS)
+
+    def rows():
+        for row in inbox:
+            stage.counts['in'] += 1
+            yield row
+
+    def on_result(ids, found):
+        stage.out(len(ids))
+        stage.counts['found' if found else 'not_found'] += len(ids)
+
+    try:
+        _, _, errors = linkedin_scrape.run_pass(
+            supabase, rows(), loose=False, pass_name='PIPE', journal=journal, cascade=True,
+            early_stop=early_stop, window=linkedin_scrape.SERPER_BATCH_SIZE, on_result=on_result)
+        stage.counts['errors'] += errors
+    finally:
+        journal.close()
+
+
+# ==========================================
+# MAIN EXECUTION
+# ==========================================
+
+def run_stage(stage, stop, target, *args, outbox=None):
+    """Thread body: runs one stage, stopping the others if it fails."""
+    stage.started = time.time()
+    try:
+        target(stage, *args)
+    except Aborted:
+        pass
+    except BaseException as e:
+        stage.failure = f"{type(e).__name__}: {e}"
+        traceback.print_exc()
+        stop.set()
+    finally:
+        stage.finished = time.time()
+        if outbox is not None:
+            try:
+                outbox.close()
+            except Aborted:
+                pass
+
+
+def report(stages, queues, kickoff, final=False):
+    summary = {
+        'elapsed_s': round(time.time() - kickoff, 1),
+        'stages': {stage.name: stage.summary(kickoff) for stage in stages},
+        'queues': {q.name: q.summary() for q in queues},
+    }
+    print("\n" + ("=" * 60 if final else "-" * 60))
+    print(f"PIPELINE {'DONE' if final else 'PROGRESS'} after {summary['elapsed_s'] / 60:.1f} min")
+    for name, s in summary['stages'].items():
+        extra = ', '.join(f"{k}={v:,}" for k, v in sorted(s.items())
+                          if k not in ('out', 'rate_per_s', 'active_s', 'first_out_s', 'done', 'failure')
+                          and isinstance(v, int))
+        first = f", first after {s['first_out_s']}s" if s['first_out_s'] is not None else ""
+        state = f" FAILED ({s['failure']})" if s.get('failure') else " done" if s['done'] else ""
+        print(f"  {name:<7} {s.get('out', 0):>8,} out at {s['rate_per_s']:>7}/s{first}{state}"
+              + (f" | {extra}" if extra else ""))
+    for name, q in summary['queues'].items():
+        print(f"  queue {name:<16} depth {q['depth']:,}/{q['capacity']:,} (max {q['high_water']:,}) | "
+              f"producer blocked {q['producer_blocked_s']}s | consumer starved {q['consumer_starved_s']}s")
+    print("=" * 60 if final else "-" * 60)
+    return summary
+
+
+def main():
+    arg_value = linkedin_scrape.arg_value
+    policy = arg_value('confirm', PIPELINE_CONFIRM)
+    if policy not in CONFIRM_POLICIES:
+        print(f"--confirm must be one of: {', '.join(CONFIRM_POLICIES)}")
+        sys.exit(2)
+    start_year = int(arg_value('start-year', scraper.START_YEAR))
+    end_year = int(arg_value('end-year', scraper.END_YEAR))
+    sports = arg_value('sports')
+    sports = sports.split(',') if sports else scraper.TARGET_SPORTS
+    enrich = policy != 'dry-run' and '--no-enrich' not in sys.argv
+    if enrich and not linkedin_scrape.SERPER_API_KEY:
+        print("SERPER_API_KEY is not set — running scrape and import only.")
+        enrich = False
+
+    supabase = linkedin_scrape.create_client(linkedin_scrape.SUPABASE_URL, linkedin_scrape.SUPABASE_SERVICE_KEY)
+    rosters = len(sports) * (end_year - start_year + 1)
+    print("=" * 60)
+    print(f"PIPELINE ({policy}): scrape {len(sports)} sports x {start_year}-{end_year} "
+          f"({rosters:,} rosters) -> import{' -> enrich' if enrich else ''}")
+    print("=" * 60)
+
+    if policy == 'replace':
+        print("Deleting existing alumni data (--confirm=replace)...")
+        supabase.table('alumni').delete().neq('id', '00000000-0000-0000-0000-000000000000').execute()
+
+    stop = threading.Event()
+    scraped = StageQueue('scrape->import', SCRAPED_QUEUE_SIZE, stop)
+    imported = StageQueue('import->enrich', IMPORTED_QUEUE_SIZE, stop) if enrich else None
+    stages = [Stage('scrape'), Stage('import')] + ([Stage('enrich')] if enrich else [])
+    queues = [q for q in (scraped, imported) if q is not None]
+
+    kickoff = time.time()
+    threads = [
+        threading.Thread(target=run_stage, daemon=True, args=(
+            stages[0], stop, scrape_stage, scraped, sports, range(start_year, end_year + 1), arg_value('csv')),
+            kwargs={'outbox': scraped}),
+        threading.Thread(target=run_stage, daemon=True, args=(
+            stages[1], stop, import_stage, supabase, scraped, imported, policy),
+            kwargs={'outbox': imported}),
+    ]
+    if enrich:
+        threads.append(threading.Thread(target=run_stage, daemon=True, args=(
+            stages[2], stop, enrich_stage, supabase, imported, '--early-stop' in sys.argv)))
+    for thread in threads:
+        thread.start()
+
+    try:
+        while any(thread.is_alive() for thread in threads):
+            threads[-1].join(PIPELINE_REPORT_SECONDS)
+            if any(thread.is_alive() for thread in threads):
+                report(stages, queues, kickoff)
+    except KeyboardInterrupt:
+        print("\nInterrupted — stopping stages (pending writes are flushed)...")
+        stop.set()
+        for thread in threads:
+            thread.join()
+
+    summary = report(stages, queues, kickoff, final=True)
+    if enrich:
+        linkedin_scrape.report_metrics()
+    path = arg_value('report')
+    if path:
+        with open(path, 'w') as f:
+            json.dump(summary, f, indent=2)
+        print(f"Pipeline report: {path}")
+    if any(stage.failure for stage in stages):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    with profiling.session('pipeline'):
+        main()
@@ -0,0 +1,312 @@
+#!/usr/bin/env python3
+"""
+Profiling hooks shared by the data scripts (scraper.py, supabase_import.py,
+linkedin_scrape.py, pipeline.py, hermes-bridge.py). Each script runs its
+main() inside profiling.session(name) and marks its stages with
+profiling.span("fetch") etc.; everything is off, and costs one function
+call per span, unless a flag asks for it:
+
+  --profile[=path]    cProfile of the whole run, every thread included,
+                      dumped as a .prof file (pstats / snakeviz) with the
+                      top functions by cumulative time printed
+  --trace-memory      tracemalloc: current/peak memory and the top
+                      allocating lines at each checkpoint
+  --timings[=path]    count, total and p50/p90/max of every named span
+
+With any of them the run also writes a JSON report (to the --timings path,
+or PROFILE_DIR/<script>-<timestamp>.json) holding spans, memory checkpoints
+and the top profiled functions under fixed keys, so two runs diff cleanly:
+
+  python profiling.py profiles/linkedin_scrape-a.json profiles/linkedin_scrape-b.json
+
+All output goes to stderr, so hermes-bridge.py's JSON on stdout is
+untouched. Span totals are summed across threads, so concurrent stages can
+add up to more than the wall time.
+"""
+import cProfile
+import io
+import json
+import os
+import platform
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from datetime import datetime, timezone
+from itertools import islice
+
+# Where .prof files and JSON reports go when no path is given
+PROFILE_DIR = os.environ.get('PROFILE_DIR', 'profiles')
+
+# Functions listed from the profile, and allocating lines per checkpoint
+PROFILE_TOP = 25
+MEMORY_TOP = 10
+
+_NULL = nullcontext()
+_active = None
+
+
+def flag(name):
+    """None if --name is absent, True for a bare --name, else its =value."""
+    for arg in sys.argv[1:]:
+        if arg == f'--{name}':
+            return True
+        if arg.startswith(f'--{name}='):
+            return arg[len(name) + 3:]
+    return None
+
+
+def percentile(sorted_values, pct):
+    """Linear-interpolated percentile of an already sorted list; None if empty."""
+    if not sorted_values:
+        return None
+    k = (len(sorted_values) - 1) * pct / 100
+    lo = int(k)
+    hi = min(lo + 1, len(sorted_values) - 1)
+    return sorted_values[lo] + (sorted_values[hi] - sorted_values[lo]) * (k - lo)
+
+
+def _log(message):
+    print(message, file=sys.stderr, flush=True)
+
+
+class _Span:
+    __slots__ = ('profiler', 'name', 'start')
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc):
+        self.profiler.observe(self.name, time.perf_counter() - self.start)
+
+
+class Profiler:
+    """One run's profile, memory checkpoints and span timings. Thread-safe."""
+
+    def __init__(self, script, profile=None, trace_memory=False, timings=None):
+        self.script = script
+        self.stamp = datetime.now().strftime('%Y%m%d-%H%M%S')
+        self.started = time.time()
+        self.lock = threading.Lock()
+        self.profile_path = self._path(profile, '.prof')
+        self.report_path = self._path(timings, '.json') or self._path(True, '.json')
+        self.timings = timings is not None
+        self.trace_memory = trace_memory
+        self.spans = {}
+        self.checkpoints = []
+        self.profiles = []
+
+    def _path(self, value, suffix):
+        if value is None:
+            return None
+        if value is True:
+            return os.path.join(PROFILE_DIR, f"{self.script}-{self.stamp}{suffix}")
+        return value
+
+    # ── recording ──
+
+    def start(self):
+        if self.trace_memory:
+            tracemalloc.start()
+        if self.profile_path:
+            if sys.version_info < (3, 12):
+                # Before 3.12 a cProfile only sees the thread that enabled
+                # it: give every thread started from now on its own
+                threading.setprofile(self._profile_thread)
+            self._enable_profile()
+
+    def _enable_profile(self):
+        profile = cProfile.Profile()
+        with self.lock:
+            self.profiles.append(profile)
+        profile.enable()
+
+    def _profile_thread(self, *_):
+        sys.setprofile(None)
+        self._enable_profile()
+
+    def span(self, name):
+        return _Span(self, name) if self.timings else _NULL
+
+    def observe(self, name, seconds):
+        with self.lock:
+            self.spans.setdefault(name, []).append(seconds)
+
+    def checkpoint(self, label):
+        if not self.trace_memory:
+            return
+        current, peak = tracemalloc.get_traced_memory()
+        # Grouping by line happens in C; filtering the traces first in
+        # Python (Snapshot.filter_traces) takes seconds on a large heap
+        stats = (stat for stat in tracemalloc.take_snapshot().statistics('lineno')
+                 if stat.traceback[0].filename != tracemalloc.__file__
+                 and not stat.traceback[0].filename.startswith('<frozen'))
+        top = [{
+            'where': f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}",
+            'kb': round(stat.size / 1024, 1),
+            'blocks': stat.count,
+        } for stat in islice(stats, MEMORY_TOP)]
+        entry = {
+            'label': label,
+            'elapsed_s': round(time.time() - self.started, 2),
+            'current_mb': round(current / 2 ** 20, 2),
+            'peak_mb': round(peak / 2 ** 20, 2),
+            'top': top,
+        }
+        with self.lock:
+            self.checkpoints.append(entry)
+        _log(f"[memory] {label}: {entry['current_mb']} MB now, {entry['peak_mb']} MB peak")
+        for row in top:
+            _log(f"[memory]   {row['kb']:>10,.1f} KB {row['blocks']:>8,} blocks  {row['where']}")
+
+    # ── reporting ──
+
+    def _stop_profile(self):
+        if sys.version_info < (3, 12):
+            threading.setprofile(None)
+        with self.lock:
+            profiles = list(self.profiles)
+        stats = None
+        for profile in profiles:
+            profile.disable()
+            try:
+                if stats is None:
+                    stats = pstats.Stats(profile)
+                else:
+                    stats.add(profile)
+            except TypeError:  # a thread that made no calls
+                continue
+        return stats
+
+    def summary(self):
+        wall = time.time() - self.started
+        with self.lock:
+            spans = {name: sorted(values) for name, values in self.spans.items()}
+        return {
+            'script': self.script,
+            'started': datetime.fromtimestamp(self.started, timezone.utc).isoformat(),
+            'argv': sys.argv[1:],
+            'python': platform.python_version(),
+            'wall_s': round(wall, 3),
+            'spans': {name: {
+                'count': len(values),
+                'total_s': round(sum(values), 3),
+                'mean_ms': round(sum(values) / len(values) * 1000, 3),
+                'p50_ms': round(percentile(values, 50) * 1000, 3),
+                'p90_ms': round(percentile(values, 90) * 1000, 3),
+                'max_ms': round(values[-1] * 1000, 3),
+            } for name, values in sorted(spans.items())},
+            'memory': self.checkpoints,
+            'profile': self.profile_path,
+            'profile_top': [],
+        }
+
+    def finish(self):
+        if self.trace_memory:
+            self.checkpoint('end')
+        summary = self.summary()
+        if self.profile_path:
+            stats = self._stop_profile()
+            if stats is not None:
+                os.makedirs(os.path.dirname(self.profile_path) or '.', exist_ok=True)
+                stats.dump_stats(self.profile_path)
+                out = io.StringIO()
+                stats.stream = out
+                stats.sort_stats('cumulative').print_stats(PROFILE_TOP)
+                _log(out.getvalue().rstrip())
+                _log(f"[profile] {self.profile_path}")
+                summary['profile_top'] = [{
+                    'function': f"{filename}:{line}({function})",
+                    'calls': calls,
+                    'tottime_s': round(tottime, 4),
+                    'cumtime_s': round(cumtime, 4),
+                } for (filename, line, function), (_, calls, tottime, cumtime, _) in sorted(
+                    stats.stats.items(), key=lambda item: -item[1][3])[:PROFILE_TOP]]
+        if self.trace_memory:
+            tracemalloc.stop()
+        if summary['spans']:
+            _log(f"\n[timings] {self.script}: {summary['wall_s']:.1f}s wall")
+            _log(f"[timings] {'span':<24}{'count':>9}{'total s':>11}{'mean ms':>11}"
+                 f"{'p50 ms':>10}{'p90 ms':>10}{'max ms':>11}")
+            for name, s in summary['spans'].items():
+                _log(f"[timings] {name:<24}{s['count']:>9,}{s['total_s']:>11.3f}{s['mean_ms']:>11.3f}"
+                     f"{s['p50_ms']:>10.3f}{s['p90_ms']:>10.3f}{s['max_ms']:>11.3f}")
+        os.makedirs(os.path.dirname(self.report_path) or '.', exist_ok=True)
+        with open(self.report_path, 'w') as f:
+            json.dump(summary, f, indent=2)
+        _log(f"[profiling] report: {self.report_path}")
+        return summary
+
+
+def span(name):
+    """Context manager timing one `name` stage; a no-op unless --timings."""
+    if _active is None:
+        return _NULL
+    return _active.span(name)
+
+
+def checkpoint(label):
+    """Logs memory use and the top allocators; a no-op unless --trace-memory."""
+    if _active is not None:
+        _active.checkpoint(label)
+
+
+@contextmanager
+def session(script):
+    """
+    Profiles the enclosed run as configured by the command-line flags, and
+    reports when it ends — however it ends (return, exception, sys.exit,
+    Ctrl-C).
+    """
+    global _active
+    profile, timings = flag('profile'), flag('timings')
+    trace_memory = flag('trace-memory') is not None
+    if profile is None and timings is None and not trace_memory:
+        yield None
+        return
+    profiler = Profiler(script, profile=profile, trace_memory=trace_memory, timings=timings)
+    _active = profiler
+    profiler.start()
+    profiler.checkpoint('start')
+    try:
+        yield profiler
+    finally:
+        _active = None
+        profiler.finish()
+
+
+def compare(old_path, new_path):
+    """Prints span totals, wall time and peak memory of two reports side by side."""
+    with open(old_path) as f:
+        old = json.load(f)
+    with open(new_path) as f:
+        new = json.load(f)
+
+    def change(a, b):
+        return f"{(b - a) / a * 100:+.1f}%" if a else "n/a"
+
+    print(f"{'':<24}{'old':>12}{'new':>12}{'change':>10}")
+    print(f"{'wall s':<24}{old['wall_s']:>12.3f}{new['wall_s']:>12.3f}{change(old['wall_s'], new['wall_s']):>10}")
+    peaks = [max((c['peak_mb'] for c in r['memory']), default=None) for r in (old, new)]
+    if None not in peaks:
+        print(f"{'peak memory MB':<24}{peaks[0]:>12.2f}{peaks[1]:>12.2f}{change(*peaks):>10}")
+    for name in sorted(old['spans'].keys() | new['spans'].keys()):
+        a, b = old['spans'].get(name), new['spans'].get(name)
+        for key, label in (('total_s', 'total s'), ('p50_ms', 'p50 ms')):
+            left = f"{a[key]:>12.3f}" if a else f"{'-':>12}"
+            right = f"{b[key]:>12.3f}" if b else f"{'-':>12}"
+            delta = change(a[key], b[key]) if a and b else ''
+            print(f"{name + ' ' + label:<24}{left}{right}{delta:>10}")
+
+
+if __name__ == '__main__':
+    if len(sys.argv) != 3:
+        print("usage: python profiling.py OLD_REPORT.json NEW_REPORT.json")
+        sys.exit(2)
+    compare(sys.argv[1], sys.argv[2])
@@ -9,6 +9,8 @@ from urllib3.util.retry import Retry
 from concurrent.futures import ThreadPoolExecutor, as_completed
 import threading
 
+import profiling
+
 # ==========================================
 # CONFIGURATION
 # ==========================================
@@ -418,16 +420,16 @@ def scrape_roster(session, sport, year):
     
     for url in possible_urls:
         try:
-            response = session.get(url, timeout=10)
+            with profiling.span('fetch'):
+                response = session.get(url, timeout=10)
             
             if response.status_code == 200:
-                soup = BeautifulSoup(response.text, 'html.parser')
-                
-                # Verify page is valid AND is for the correct year
-                if not is_valid_page(soup, expected_year=year):
-                    continue
-                
-                data = parse_roster(soup, sport, year, url)
+                with profiling.span('parse'):
+                    soup = BeautifulSoup(response.text, 'html.parser')
+                    
+                    # Verify page is valid AND is for the correct year
+                    valid = is_valid_page(soup, expected_year=year)
+                    data = parse_roster(soup, sport, year, url) if valid else None
                 
                 if data:
                     return data, url
@@ -531,6 +533,7 @@ def main():
                 logger.info(f"Progress: {completed}/{len(tasks)} ({completed/len(tasks)*100:.1f}%) - ETA: {remaining/60:.1f} min")
     
     elapsed_time = time.time() - start_time
+    profiling.checkpoint('scraped')
     
     # ==========================================
     # EXPORT RESULTS
@@ -545,21 +548,24 @@ def main():
     logger.info(f"Failed pages: {stats['failed']}")
     
     if master_list:
-        df = pd.DataFrame(master_list)
-        
-        # Clean up duplicates
-        original_count = len(df)
-        df.drop_duplicates(subset=['Name', 'Sport', 'Year'], inplace=True)
-        dupes_removed = original_count - len(df)
+        with profiling.span('transform'):
+            df = pd.DataFrame(master_list)
+            
+            # Clean up duplicates
+            original_count = len(df)
+            df.drop_duplicates(subset=['Name', 'Sport', 'Year'], inplace=True)
+            dupes_removed = original_count - len(df)
         
         if dupes_removed > 0:
             logger.info(f"Duplicates removed: {dupes_removed}")
         
         # Sort by sport, year, name
-        df.sort_values(['Sport', 'Year', 'Name'], inplace=True)
+        with profiling.span('transform'):
+            df.sort_values(['Sport', 'Year', 'Name'], inplace=True)
         
         # Save to CSV
-        df.to_csv(OUTPUT_FILE, index=False)
+        with profiling.span('write'):
+            df.to_csv(OUTPUT_FILE, index=False)
         logger.info(f"Data saved to: {OUTPUT_FILE}")
         
         # Print summary by sport
@@ -571,4 +577,5 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    with profiling.session('scraper'):
+        main()
\ No newline at end of file
@@ -0,0 +1,73 @@
+"""
+Local SQLite cache of raw Serper search results.
+
+linkedin_scrape.py checks here before paying for a query, and --offline
+mode re-parses everything stored here without touching the API. Entries
+are keyed by the normalized query string and keep the full organic result
+list plus the time it was fetched; get() ignores entries older than the
+TTL, get(..., max_age=None) returns them regardless.
+"""
+import json
+import sqlite3
+import threading
+import time
+
+
+def normalize_query(query):
+    """Case- and whitespace-insensitive cache key."""
+    return ' '.join(query.lower().split())
+
+
+class SearchCache:
+    """Thread-safe: one connection guarded by a lock, shared by all workers."""
+
+    def __init__(self, path, ttl_days=30):
+        self.path = str(path)
+        self.ttl = ttl_days * 86400
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(self.path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS search_results (
+                query      TEXT PRIMARY KEY,
+                organic    TEXT NOT NULL,
+                fetched_at REAL NOT NULL
+            )
+        """)
+        self.conn.commit()
+
+    def get(self, query, max_age=...):
+        """
+        Returns the cached Serper response ({'organic': [...]}) or None.
+        max_age defaults to the cache TTL; pass None to accept any age.
+        """
+        if max_age is ...:
+            max_age = self.ttl
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT organic, fetched_at FROM search_results WHERE query = ?",
+                (normalize_query(query),),
+            ).fetchone()
+        if row is None:
+            return None
+        if max_age is not None and time.time() - row[1] > max_age:
+            return None
+        return {'organic': json.loads(row[0])}
+
+    def put(self, query, data):
+        """Stores the organic results of a Serper response (misses included)."""
+        organic = json.dumps(data.get('organic', []))
+        with self.lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO search_results (query, organic, fetched_at) VALUES (?, ?, ?)",
+                (normalize_query(query), organic, time.time()),
+            )
+            self.conn.commit()
+
+    def __len__(self):
+        with self.lock:
+            return self.conn.execute("SELECT COUNT(*) FROM search_results").fetchone()[0]
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
@@ -0,0 +1,170 @@
+"""
+Pooled, rate-limited client for the Serper.dev search API.
+
+Used by linkedin_scrape.py. Each worker thread keeps its own keep-alive
+session, every request first takes a token from a shared bucket sized to
+the Serper plan's QPS, and 429/5xx responses are retried with jittered
+exponential backoff.
+"""
+import random
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+SERPER_ENDPOINT = 'https://google.serper.dev/search'
+
+# Status codes worth retrying — throttling and transient server errors
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket. `rate` tokens are added per second up to
+    `burst`; acquire() blocks until a token is available.
+    """
+
+    def __init__(self, rate, burst=None):
+        self.rate = float(rate)
+        self.capacity = float(burst if burst is not None else max(1, rate))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self, tokens=1):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= tokens:
+                    self.tokens -= tokens
+                    return
+                wait = (tokens - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+class SerperError(Exception):
+    """
+    Raised when a Serper request still fails after all retries. `status` is
+    the HTTP status when Serper answered, None for network failures.
+    """
+
+    def __init__(self, message, status=None):
+        super().__init__(message)
+        self.status = status
+
+    @property
+    def fatal(self):
+        """A 4xx other than 429 (bad key, no credits): every request will fail."""
+        return self.status is not None and 400 <= self.status < 500 and self.status != 429
+
+
+class SerperBatchError(SerperError):
+    """Raised when a batch response doesn't line up with its queries."""
+
+
+class SerperClient:
+    """
+    Serper search client safe to share across a thread pool.
+    search() returns the decoded JSON body or raises SerperError.
+    `credits` counts queries Serper answered (one per query in a batch).
+    `on_request`, if set, is called after every HTTP attempt as
+    on_request(seconds, queries, error) — error is None on success, else
+    'network' or 'http_<status>' — so callers can collect latency metrics.
+    """
+
+    def __init__(self, api_key, qps=5, max_retries=4, backoff=0.5,
+                 timeout=10, endpoint=SERPER_ENDPOINT):
+        self.api_key = api_key
+        self.endpoint = endpoint
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.bucket = TokenBucket(qps)
+        self._local = threading.local()
+        self.credits = 0
+        self._credits_lock = threading.Lock()
+        self.on_request = None
+
+    def _session(self):
+        """One keep-alive session per worker thread (sessions aren't thread-safe)."""
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = requests.Session()
+            session.mount('https://', HTTPAdapter(pool_connections=1, pool_maxsize=1))
+            session.mount('http://', HTTPAdapter(pool_connections=1, pool_maxsize=1))
+            session.headers.update({'X-API-KEY': self.api_key, 'Content-Type': 'application/json'})
+            self._local.session = session
+        return session
+
+    def _sleep_before_retry(self, attempt, response=None):
+        """Full-jitter exponential backoff, honouring Retry-After when sent."""
+        delay = random.uniform(0, self.backoff * (2 ** attempt))
+        if response is not None:
+            retry_after = response.headers.get('Retry-After')
+            if retry_after:
+                try:
+                    delay = max(delay, float(retry_after))
+                except ValueError:
+                    pass
+        time.sleep(delay)
+
+    def _observe(self, started, payload, error=None):
+        if self.on_request is not None:
+            queries = len(payload) if isinstance(payload, list) else 1
+            self.on_request(time.perf_counter() - started, queries, error)
+
+    def search(self, payload):
+        """
+        POST one query object, or a list of them. Serper answers a list with
+        a list of result objects in the same order.
+        """
+        last_error = None
+        for attempt in range(self.max_retries + 1):
+            self.bucket.acquire()
+            started = time.perf_counter()
+            try:
+                response = self._session().post(self.endpoint, json=payload, timeout=self.timeout)
+            except requests.exceptions.RequestException as e:
+                self._observe(started, payload, 'network')
+                last_error = e
+                if attempt < self.max_retries:
+                    self._sleep_before_retry(attempt)
+                continue
+
+            if response.status_code >= 400:
+                self._observe(started, payload, f'http_{response.status_code}')
+            else:
+                self._observe(started, payload)
+
+            if response.status_code in RETRY_STATUSES:
+                last_error = SerperError(f"HTTP {response.status_code}", status=response.status_code)
+                if attempt < self.max_retries:
+                    self._sleep_before_retry(attempt, response)
+                continue
+
+            try:
+                response.raise_for_status()
+            except requests.exceptions.HTTPError as e:
+                # 4xx other than 429 won't get better on retry
+                raise SerperError(str(e), status=response.status_code) from e
+            with self._credits_lock:
+                self.credits += len(payload) if isinstance(payload, list) else 1
+            return response.json()
+
+        raise SerperError(f"gave up after {self.max_retries + 1} attempts: {last_error}")
+
+    def search_batch(self, payloads):
+        """
+        Sends several queries in one request. Returns one result dict per
+        payload, in order; raises SerperBatchError if the response doesn't
+        line up (and SerperError if the request itself fails).
+        """
+        if len(payloads) == 1:
+            return [self.search(payloads[0])]
+        data = self.search(list(payloads))
+        if not isinstance(data, list) or len(data) != len(payloads):
+            raise SerperBatchError(f"batch of {len(payloads)} returned a malformed response")
+        return data
@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the Serper.dev search endpoint.
+
+Answers POST /search like https://google.serper.dev/search — a single
+query object gets one result object, a list gets a list in the same order —
+so linkedin_scrape.py can run end to end without a SERPER_API_KEY. Point it
+here with SERPER_ENDPOINT=http://127.0.0.1:8765/search.
+
+Results come from, in order:
+  - a recorded search cache (--cache serper_cache.sqlite3), by exact query
+  - the parser fixtures (--fixtures), by person name
+  - a synthetic LinkedIn result for --hit-rate of names (deterministic
+    per name), otherwise an empty organic list
+
+Throttling and failures are configurable: --latency/--jitter (ms per
+request), --qps-limit (over the limit returns 429 with Retry-After) and
+--error-rate (random 500s). GET /stats returns request/query/429 counts,
+with 'repeated' counting queries answered more than once.
+
+  python serper_mock.py --port 8765 --latency 150 --qps-limit 5
+"""
+import argparse
+import hashlib
+import json
+import random
+import re
+import sqlite3
+import threading
+import time
+from collections import Counter, deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from serper_cache import normalize_query
+
+FIXTURES = Path(__file__).parent / 'fixtures' / 'serper_linkedin_results.json'
+
+# Strict ('"Name" Cornell Sport site:...') and loose ('"Name" Cornell site:...')
+QUERY_RE = re.compile(r'^"(?P<name>[^"]+)"\s+cornell\s*(?P<sport>.*?)\s*site:linkedin\.com/in$', re.IGNORECASE)
+
+SYNTHETIC_ROLES = [
+    ('Analyst', 'Goldman Sachs'), ('Software Engineer', 'Google'),
+    ('Associate', 'McKinsey & Company'), ('Product Manager', 'Microsoft'),
+    ('Consultant', 'Deloitte'), ('Vice President', 'JPMorgan Chase'),
+]
+SYNTHETIC_LOCATIONS = ['New York, NY', 'San Francisco, CA', 'Boston, MA', 'Chicago, IL']
+
+
+def _stable_fraction(text):
+    """Deterministic value in [0, 1) per text, so reruns see the same hits."""
+    return int(hashlib.sha1(text.lower().encode()).hexdigest()[:8], 16) / 0x100000000
+
+
+def synthetic_result(name, sport, hit_rate):
+    if _stable_fraction(name) >= hit_rate:
+        return {'organic': []}
+    h = int(hashlib.sha1(name.encode()).hexdigest(), 16)
+    role, company = SYNTHETIC_ROLES[h % len(SYNTHETIC_ROLES)]
+    location = SYNTHETIC_LOCATIONS[h // 7 % len(SYNTHETIC_LOCATIONS)]
+    slug = '-'.join(name.lower().split()) + f'-{h % 0xffff:04x}'
+    sport_text = f' · {sport}' if sport else ''
+    return {'organic': [{
+        'position': 1,
+        'title': f'{name} - {role} - {company} | LinkedIn',
+        'link': f'https://www.linkedin.com/in/{slug}',
+        'snippet': f'{location} · {role} at {company} · Cornell University{sport_text} ...',
+    }]}
+
+
+class MockSerper:
+    """Result source, throttle and counters shared by all handler threads."""
+
+    def __init__(self, hit_rate=0.6, latency_ms=0, jitter_ms=0, qps_limit=None,
+                 error_rate=0.0, fixtures=None, cache=None):
+        self.hit_rate = hit_rate
+        self.latency = latency_ms / 1000
+        self.jitter = jitter_ms / 1000
+        self.qps_limit = qps_limit
+        self.error_rate = error_rate
+        self.lock = threading.Lock()
+        self.recent = deque()
+        self.stats = Counter()
+        self.seen = set()
+
+        self.by_name = {}
+        if fixtures:
+            for case in json.loads(Path(fixtures).read_text()):
+                self.by_name[case['name'].lower()] = case['response']
+        self.by_query = {}
+        if cache:
+            conn = sqlite3.connect(cache)
+            for query, organic in conn.execute("SELECT query, organic FROM search_results"):
+                self.by_query[query] = {'organic': json.loads(organic)}
+            conn.close()
+
+    def throttled(self):
+        """Sliding one-second window over accepted requests."""
+        if not self.qps_limit:
+            return False
+        now = time.monotonic()
+        with self.lock:
+            while self.recent and now - self.recent[0] >= 1:
+                self.recent.popleft()
+            if len(self.recent) >= self.qps_limit:
+                return True
+            self.recent.append(now)
+            return False
+
+    def answer(self, query_obj):
+        query = query_obj.get('q', '')
+        recorded = self.by_query.get(normalize_query(query))
+        if recorded is not None:
+            return recorded
+        m = QUERY_RE.match(query.strip())
+        if not m:
+            return {'organic': []}
+        name, sport = m.group('name'), m.group('sport') or None
+        if name.lower() in self.by_name:
+            return self.by_name[name.lower()]
+        return synthetic_result(name, sport, self.hit_rate)
+
+    def count(self, key, n=1):
+        with self.lock:
+            self.stats[key] += n
+
+    def count_queries(self, query_objs):
+        with self.lock:
+            self.stats['queries'] += len(query_objs)
+            for query_obj in query_objs:
+                key = normalize_query(query_obj.get('q', ''))
+                if key in self.seen:
+                    self.stats['repeated'] += 1
+                self.seen.add(key)
+
+
+def make_handler(mock):
+
+    class Handler(BaseHTTPRequestHandler):
+
+        def _send(self, status, body, headers=None):
+            data = json.dumps(body).encode()
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(data)))
+            for key, value in (headers or {}).items():
+                self.send_header(key, value)
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_GET(self):
+            if self.path.rstrip('/') == '/stats':
+                with mock.lock:
+                    self._send(200, dict(mock.stats))
+            else:
+                self._send(404, {'message': 'not found'})
+
+        def do_POST(self):
+            if self.path.rstrip('/') != '/search':
+                self._send(404, {'message': 'not found'})
+                return
+            body = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b'{}')
+            mock.count('requests')
+            if not self.headers.get('X-API-KEY'):
+                mock.count('unauthorized')
+                self._send(403, {'message': 'Unauthorized.'})
+                return
+            if mock.throttled():
+                mock.count('throttled')
+                self._send(429, {'message': 'Too many requests'}, {'Retry-After': '1'})
+                return
+
+            time.sleep(max(0.0, mock.latency + random.uniform(-mock.jitter, mock.jitter)))
+            if mock.error_rate and random.random() < mock.error_rate:
+                mock.count('errors')
+                self._send(500, {'message': 'Internal error'})
+                return
+
+            if isinstance(body, list):
+                mock.count_queries(body)
+                mock.count('batches')
+                self._send(200, [mock.answer(q) for q in body])
+            else:
+                mock.count_queries([body])
+                self._send(200, mock.answer(body))
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+def start_server(mock, host='127.0.0.1', port=0):
+    """Serves `mock` on a background thread; returns (server, endpoint URL)."""
+    server = ThreadingHTTPServer((host, port), make_handler(mock))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f'http://{host}:{server.server_address[1]}/search'
+
+
+def add_mock_arguments(parser):
+    parser.add_argument('--hit-rate', type=float, default=0.6,
+                        help='share of synthetic names that get a profile')
+    parser.add_argument('--latency', type=float, default=0, help='ms added to every request')
+    parser.add_argument('--jitter', type=float, default=0, help='± ms of random latency')
+    parser.add_argument('--qps-limit', type=float, default=None,
+                        help='requests/s before answering 429')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='share of requests answered 500')
+    parser.add_argument('--fixtures', default=None,
+                        help=f'replay parser fixtures by name (e.g. {FIXTURES.name})')
+    parser.add_argument('--cache', default=None, help='replay a search cache by query')
+
+
+def mock_from_args(args):
+    return MockSerper(hit_rate=args.hit_rate, latency_ms=args.latency, jitter_ms=args.jitter,
+                      qps_limit=args.qps_limit, error_rate=args.error_rate,
+                      fixtures=args.fixtures, cache=args.cache)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    add_mock_arguments(parser)
+    args = parser.parse_args()
+
+    mock = mock_from_args(args)
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(mock))
+    server.daemon_threads = True
+    print(f"Mock Serper on http://{args.host}:{args.port}/search "
+          f"({len(mock.by_query):,} recorded queries, {len(mock.by_name):,} fixtures, "
+          f"synthetic hit rate {args.hit_rate:.0%})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    print(json.dumps(dict(mock.stats)))
+
+
+if __name__ == '__main__':
+    main()
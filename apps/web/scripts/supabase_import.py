@@ -3,6 +3,8 @@ from supabase import create_client
 import os
 from datetime import datetime
 
+import profiling
+
 # ==========================================
 # CONFIGURATION
 # ==========================================
@@ -180,27 +182,32 @@ def main():
     
     # 2. Read CSV
     print(f"\n2. Reading CSV: {CSV_FILE}")
-    df = pd.read_csv(CSV_FILE)
+    with profiling.span('read'):
+        df = pd.read_csv(CSV_FILE)
     print(f"   Found {len(df)} rows")
+    profiling.checkpoint('read')
     
     # 3. Transform data
     print("\n3. Transforming data...")
     records = []
     skipped = 0
     
-    for _, row in df.iterrows():
-        record = prepare_alumni_record(row)
-        if record:
-            records.append(record)
-        else:
-            skipped += 1
+    with profiling.span('transform'):
+        for _, row in df.iterrows():
+            record = prepare_alumni_record(row)
+            if record:
+                records.append(record)
+            else:
+                skipped += 1
     
     print(f"   Prepared {len(records)} records ({skipped} skipped due to missing name)")
+    profiling.checkpoint('transformed')
 
     # 3.5 Drop anyone on the do-not-reimport list
-    emails, linkedins, names = fetch_suppression(supabase)
-    before = len(records)
-    records = [r for r in records if not is_suppressed(r, emails, linkedins, names)]
+    with profiling.span('suppression'):
+        emails, linkedins, names = fetch_suppression(supabase)
+        before = len(records)
+        records = [r for r in records if not is_suppressed(r, emails, linkedins, names)]
     if before != len(records):
         print(f"   Skipped {before - len(records)} suppressed records (removal requests)")
 
@@ -224,7 +231,8 @@ def main():
     print("\n5. Deleting existing alumni data...")
     try:
         # Delete all records from alumni table
-        result = supabase.table('alumni').delete().neq('id', '00000000-0000-0000-0000-000000000000').execute()
+        with profiling.span('delete'):
+            result = supabase.table('alumni').delete().neq('id', '00000000-0000-0000-0000-000000000000').execute()
         print(f"   Deleted existing records")
     except Exception as e:
         print(f"   Error deleting: {e}")
@@ -239,7 +247,8 @@ def main():
     for i in range(0, len(records), batch_size):
         batch = records[i:i+batch_size]
         try:
-            result = supabase.table('alumni').insert(batch).execute()
+            with profiling.span('insert'):
+                result = supabase.table('alumni').insert(batch).execute()
             inserted += len(batch)
             print(f"   Inserted {inserted}/{len(records)} records...")
         except Exception as e:
@@ -248,11 +257,14 @@ def main():
             # Try inserting one by one to find problematic records
             for record in batch:
                 try:
-                    supabase.table('alumni').insert(record).execute()
+                    with profiling.span('insert-one'):
+                        supabase.table('alumni').insert(record).execute()
                     inserted += 1
                 except Exception as e2:
                     print(f"   Failed to insert {record['full_name']}: {e2}")
     
+    profiling.checkpoint('inserted')
+
     # 8. Summary
     print("\n" + "="*50)
     print("IMPORT COMPLETE")
@@ -269,4 +281,5 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    with profiling.session('supabase_import'):
+        main()
\ No newline at end of file
@@ -0,0 +1,38 @@
+-- 072: Bulk write-back for the LinkedIn enrichment script.
+--
+-- scripts/linkedin_scrape.py used to issue one UPDATE per alumnus, which on
+-- long runs cost as much wall-clock as the searches themselves. It now
+-- buffers results and applies them through this function, one call per few
+-- hundred rows. Deliberately an UPDATE, not an upsert: a row deleted after a
+-- removal request mid-run must never be re-inserted by a late write-back.
+--
+-- Each element of `updates` is {id, linkedin_url?, role?, company?,
+-- industry?, location?}. Missing/null keys leave the column untouched, which
+-- matches the script's old per-row behaviour (only write what was found —
+-- in particular, a roster hometown in `location` is kept when the search
+-- found none). Returns the number of rows updated.
+
+CREATE OR REPLACE FUNCTION public.apply_alumni_enrichment(updates jsonb)
+RETURNS integer
+LANGUAGE plpgsql
+AS $$
+DECLARE
+  n integer;
+BEGIN
+  UPDATE public.alumni a
+     SET linkedin_url = COALESCE(u.linkedin_url, a.linkedin_url),
+         role         = COALESCE(u.role, a.role),
+         company      = COALESCE(u.company, a.company),
+         industry     = COALESCE(u.industry, a.industry),
+         location     = COALESCE(u.location, a.location)
+    FROM jsonb_to_recordset(updates)
+         AS u(id uuid, linkedin_url text, role text, company text, industry text, location text)
+   WHERE a.id = u.id;
+  GET DIAGNOSTICS n = ROW_COUNT;
+  RETURN n;
+END;
+$$;
+
+-- Service-role only: the enrichment script runs with the service key.
+REVOKE EXECUTE ON FUNCTION public.apply_alumni_enrichment(jsonb) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION public.apply_alumni_enrichment(jsonb) TO service_role;
@@ -0,0 +1,33 @@
+-- 073: Let the bulk enrichment write-back stamp freshness.
+--
+-- scripts/linkedin_scrape.py now stamps enriched_at (migration 060) on every
+-- row it finds or refreshes, so its --refresh scheduler and the
+-- /api/cron/enrich-alumni route both see LinkedIn-scraped rows as fresh.
+-- apply_alumni_enrichment (migration 072) gains the column; as before, a
+-- missing/null key leaves the column untouched.
+
+CREATE OR REPLACE FUNCTION public.apply_alumni_enrichment(updates jsonb)
+RETURNS integer
+LANGUAGE plpgsql
+AS $$
+DECLARE
+  n integer;
+BEGIN
+  UPDATE public.alumni a
+     SET linkedin_url = COALESCE(u.linkedin_url, a.linkedin_url),
+         role         = COALESCE(u.role, a.role),
+         company      = COALESCE(u.company, a.company),
+         industry     = COALESCE(u.industry, a.industry),
+         location     = COALESCE(u.location, a.location),
+         enriched_at  = COALESCE(u.enriched_at, a.enriched_at)
+    FROM jsonb_to_recordset(updates)
+         AS u(id uuid, linkedin_url text, role text, company text, industry text,
+              location text, enriched_at timestamptz)
+   WHERE a.id = u.id;
+  GET DIAGNOSTICS n = ROW_COUNT;
+  RETURN n;
+END;
+$$;
+
+REVOKE EXECUTE ON FUNCTION public.apply_alumni_enrichment(jsonb) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION public.apply_alumni_enrichment(jsonb) TO service_role;